@@ -0,0 +1,61 @@
+# Benchmark for fitness-ordering selectors
+# Compares sorting with cmp callbacks to selecting on fitness keys
+# Usage: python selectors.py [population size ...]
+# $Revision: 1.1 $
+
+from genetics.challenge import Challenge
+from genetics.organism import Organism
+from genetics.selectors.fitness import FitnessSelector
+from genetics.selectors.sampled.ranking import LinearRankingSelector
+import random, sys, time
+
+
+SIZES = [100, 1000, 10000, 100000, 1000000]
+
+
+# Step 1: organisms whose fitness is a random number, decoded through the
+#         usual memoized Organism.decode
+class RandomFitnessOrganism(Organism):
+    def __init__(self, *args, **kwargs):
+        self.value = random.random()
+        super(RandomFitnessOrganism, self).__init__(*args, **kwargs)
+        
+    def fitness(self):
+        return self.value
+    
+    phenotypes = {Challenge: fitness}
+    
+challenge = Challenge()
+
+
+# Step 2: time a function
+def timed(function, *args):
+    start = time.time()
+    function(*args)
+    return time.time() - start
+
+
+# Step 3: the way selectors used to order organisms
+def cmp_select(selector, n, organisms):
+    organisms = list(organisms)
+    organisms.sort(cmp=selector.cmp_fitness)
+    return organisms[:n]
+
+
+if __name__ == '__main__':
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    fitness_selector = FitnessSelector(challenge)
+    ranking_selector = LinearRankingSelector(challenge)
+    
+    print '%10s %14s %14s %14s' % ('size', 'cmp sort', 'fitness top', 'ranking')
+    for size in sizes:
+        organisms = [RandomFitnessOrganism() for i in xrange(size)] #@UnusedVariable
+        
+        # decode once so that every column measures ordering, not decoding
+        fitness_selector.fitness_keys(organisms)
+        
+        n = max(1, size / 10)
+        print '%10d %13.4fs %13.4fs %13.4fs' % (size,
+            timed(cmp_select, fitness_selector, n, organisms),
+            timed(fitness_selector.select, n, organisms),
+            timed(ranking_selector.select, n, organisms))
@@ -1,6 +1,6 @@
 # Demo program to solve the job shop scheduling problem
 # See Chapter 3 of Eiben & Smith: "Introduction to Evolutionary Computing"
-# $Revision: 1.3 $
+# $Revision: 1.4 $
 
 from genetics.challenge import Challenge
 from genetics.chromosomes.permutation import PermutationChromosome
@@ -8,6 +8,7 @@ from genetics.organism import Organism
 from genetics.population import Population
 from genetics.selectors.fitness import FitnessSelector
 from genetics.selectors.randomized import RandomSelector
+from genetics.util.structures import Codebook
 import random, time
 
 
@@ -66,15 +67,24 @@ class ScheduleChallenge(Challenge):
     def fitness(self, organism):
         # fitness is time taken negated
         return -Challenge.fitness(self, organism)
+    
+    def prepare(self):
+        # for each job, the (machine number, time) choices of each operation
+        number = dict((machine, i) for i, machine in enumerate(machines))
+        return [[[(number[m], op.time(m)) for m in op.machines] 
+                 for op in job.operations] for job in jobs]
 
 challenge = ScheduleChallenge()
 
 
-# Step 5: Represent a schedule of jobs
+# Step 5: Represent a schedule of jobs.  The schedule holds codes for the
+#         jobs, so crossover works on integers instead of Job objects.
 class ScheduleChromosome(PermutationChromosome):
+    codebook = Codebook(jobs)
+    
     def __init__(self, schedule=None, *args, **kwargs):
         if not schedule:
-            schedule = list(jobs)
+            schedule = range(len(jobs))
             random.shuffle(schedule)
             
         super(ScheduleChromosome, self).__init__(schedule, *args, **kwargs)
@@ -84,23 +94,22 @@ class ScheduleChromosome(PermutationChromosome):
     
     
 # Step 6: Create organisms that can evaluate how much time a schedule takes
+#         from the operation times the challenge prepared
 class Scheduler(Organism):
     def time(self):
-        for m in machines:
-            m.reset()
-        
+        busy_until = [0] * NUM_MACHINES
         end_time = 0
         
+        operation_times = challenge.artifacts()
         for job in self.schedule.alleles:
-            for operation in job.operations:
+            for choices in operation_times[job]:
         
                 # find the earliest available machine to run it on
-                operation.machines.sort()
-                machine = operation.machines[0]
-                machine.schedule(operation)
+                machine, time = min(choices, key=lambda (m, t): busy_until[m])
+                busy_until[machine] += time
                 
-                if machine.busy_until > end_time:
-                    end_time = machine.busy_until
+                if busy_until[machine] > end_time:
+                    end_time = busy_until[machine]
         
         return end_time
     
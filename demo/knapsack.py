@@ -1,12 +1,11 @@
 # Demo program to solve the knapsack problem
 # See Chapter 2 of Eiben & Smith: "Introduction to Evolutionary Computing"
-# Note that this version uses a permutation instead of a bit string
-# $Revision: 1.6 $
+# $Revision: 1.7 $
 from genetics.selectors.age import AgeSelector
 from genetics.selectors.sampled.ranking import ExponentialRankingSelector
 
 from genetics.challenge import Challenge
-from genetics.chromosomes.permutation import PermutationChromosome
+from genetics.chromosomes.subset import SubsetChromosome
 from genetics.organism import Organism
 from genetics.population import Population
 from sets import Set
@@ -27,24 +26,36 @@ for i in xrange(NUM_ITEMS):
         if (cost, value) not in items:
             items.add((cost, value))
             break
+items = list(items)
 
 
 # Step 2: Define a knapsack challenge
 challenge = Challenge()
 
 
-# Step 3: Define a knapsack representation
-# TODO: this could become more efficient by using a set chromosome
-class Knapsack(PermutationChromosome):
-    def __init__(self, knapsack=None, items=items, *args, **kwargs):
-        if not knapsack:
-            knapsack = list(items)
-            random.shuffle(knapsack)
+# Step 3: Define a knapsack representation as a subset of the items.
+#         The subset keeps track of its total cost and value.
+class Knapsack(SubsetChromosome):
+    size   = NUM_ITEMS
+    costs  = [cost  for cost, value in items] #@UnusedVariable
+    values = [value for cost, value in items] #@UnusedVariable
+    
+    def __init__(self, knapsack=None, *args, **kwargs):
+        if knapsack is None:
+            # start with a random item or two
+            knapsack = random.sample(xrange(NUM_ITEMS), random.randint(1, 2))
             
         super(Knapsack, self).__init__(knapsack, *args, **kwargs)
-        
-    mutate    = PermutationChromosome.mutate_swap
-    crossover = PermutationChromosome.crossover_pmx
+    
+    def mutate(self):
+        if random.random() < 0.5:
+            return self.mutate_swap()
+        elif self.cost <= KNAPSACK:
+            return self.mutate_add()
+        else:
+            return self.mutate_remove()
+    
+    crossover = SubsetChromosome.crossover_intersection
     
     
 # Step 4: Create organisms that have a Knapsack
@@ -54,18 +65,12 @@ class KnapsackSolver(Organism):
         super(KnapsackSolver, self).__init__(*args, **kwargs)
         
     def value(self):
-        # the value of all items from the start that will fit into the knapsack
-        total_cost = total_value = 0
-        
-        for cost, value in self.knapsack.alleles:
-            if total_cost + cost > self.max_cost:
-                break
-            
-            total_cost += cost            
-            total_value += value
-        
-        self.cost = total_cost
-        return total_value
+        # the value of the items in the knapsack if they fit, or
+        # how far they are over the limit (negated) if they do not
+        self.cost = self.knapsack.cost
+        if self.cost > self.max_cost:
+            return self.max_cost - self.cost
+        return self.knapsack.value
 
     genotype   = {'knapsack': Knapsack}
     phenotypes = {challenge:  value   }
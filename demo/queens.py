@@ -47,6 +47,17 @@ class BoardPermutation(PermutationChromosome):
     
     
 # Step 3: Create organisms to solve the QueensChallenge
+def attacks(board, i, qi, j, qj):
+    # count the diagonal conflicts of queens in columns qi and qj of rows 
+    # i < j, with the other rows as on the board
+    pairs = int(abs(qj - qi) == j - i)
+    for k in xrange(len(board)):
+        if k != i and k != j:
+            pairs += (abs(board[k] - qi) == abs(k - i)) + \
+                     (abs(board[k] - qj) == abs(k - j))
+    return pairs
+
+
 class BoardSolver(Organism):
     def conflicts(self):
         pairs = 0
@@ -62,8 +73,18 @@ class BoardSolver(Organism):
    
         return pairs
     
+    def conflicts_delta(self, parent_conflicts, move):
+        # only the conflicts of the two swapped queens change
+        name, kind, i, j = move #@UnusedVariable
+        board = self.board.alleles
+        return parent_conflicts - attacks(board, i, board[j], j, board[i]) \
+                                + attacks(board, i, board[i], j, board[j])
+    
     genotype   = {'board':   BoardPermutation}
     phenotypes = {challenge: conflicts}
+    
+    # children mutated from a decoded parent only recount two queens
+    delta_phenotypes = {challenge: conflicts_delta}
 
 
 # Step 4: Population numbers
@@ -1,5 +1,5 @@
 # Demo program to solve TSP
-# $Revision: 1.2 $
+# $Revision: 1.3 $
 
 from genetics.selectors.randomized import RandomSelector
 from Tkinter import Button, Canvas, Tk, mainloop
@@ -8,13 +8,13 @@ from genetics.challenge import Challenge
 from genetics.population import Population
 from genetics.organism import Organism
 from genetics.selectors.sampled.ranking import ExponentialRankingSelector
-from sets import Set
-import math, random
+from genetics.util.structures import Codebook
+import numpy, random
 
 
 SALES_FORCE = 50
 PIXELS = 500
-CITIES = Set()
+CITIES = Codebook()
 
 
 # Step 1: define a challenge that minimizes route distance
@@ -22,15 +22,24 @@ class RouteChallenge(Challenge):
     def fitness(self, organism):
         # fitness is length of the route negated
         return -Challenge.fitness(self, organism)
+    
+    def prepare(self):
+        # distances between each pair of cities, by city code
+        cities = numpy.array(CITIES.decode(range(len(CITIES))), dtype=float)
+        offsets = cities[:, numpy.newaxis, :] - cities[numpy.newaxis, :, :]
+        return numpy.sqrt((offsets ** 2).sum(axis=2))
 
 challenge = RouteChallenge()
 
 
-# Step 2: a route chromosome represents a series of cities to visit
+# Step 2: a route chromosome represents a series of cities to visit.
+#         the route holds codes for the (x, y) tuples of the cities.
 class RouteChromosome(PermutationChromosome):
+    codebook = CITIES
+    
     def __init__(self, route=None, *args, **kwargs):
         if not route:
-            route = list(CITIES)
+            route = range(len(CITIES))
             random.shuffle(route)
             
         super(RouteChromosome, self).__init__(route, *args, **kwargs)
@@ -43,18 +52,41 @@ class RouteChromosome(PermutationChromosome):
     
 
 # Step 3: a salesperson has a route and can measure its travel distance
+#         with the distances the challenge prepared
 class Salesperson(Organism):
     def distance(self):
-        d = 0
-        for i in xrange(self.route.size):
-            (x1,y1), (x2, y2) = self.route.alleles[i-1], self.route.alleles[i]
-            d += math.sqrt(((x2-x1) ** 2) + ((y2-y1) ** 2))
+        route = numpy.array(self.route.alleles)
+        return challenge.artifacts()[route, numpy.roll(route, 1)].sum()
     
-        return d
+    def distance_delta(self, parent_distance, move):
+        # moving one city only changes the legs next to where it was and is
+        name, kind, source, destination = move #@UnusedVariable
+        leg = challenge.artifacts()
+        cities = self.route.alleles
+        size = len(cities)
+        
+        def parent(i):
+            # the city at position i of the parent route: the cities between
+            # source and destination are shifted by one in this route
+            i %= size
+            if source < i <= destination:
+                return cities[i-1]
+            if destination <= i < source:
+                return cities[i+1]
+            return cities[i]
+        
+        before, city, after = parent(source-1), cities[destination], parent(source+1)
+        d = parent_distance - leg[before, city] - leg[city, after] + leg[before, after]
+        
+        before, after = cities[destination-1], cities[(destination+1) % size]
+        return d - leg[before, after] + leg[before, city] + leg[city, after]
     
     genotype   = {'route': RouteChromosome}
     phenotypes = {RouteChallenge: distance}
     
+    # children mutated from a decoded parent only measure the changed legs
+    delta_phenotypes = {RouteChallenge: distance_delta}
+    
 
 # Step 4: decide on selection operators for the population
 class SalesForce(Population):
@@ -119,7 +151,7 @@ class MapFrame(Tk):
                     self.sales_force.cycle()
                 
                     if best is not last_best:
-                        self.graph.update(best.route.alleles)
+                        self.graph.update(best.route.decode())
                         last_best = best
         
             except AttributeError:
@@ -129,8 +161,10 @@ class MapFrame(Tk):
         if len(CITIES) < 2: 
             print 'Click in the map to generate more cities'
         else:
+            # the cities may have changed since the distances were prepared
+            challenge.discard_artifacts()
             self.sales_force = SalesForce(Salesperson)
-            self.graph.update(self.sales_force.best(challenge).route.alleles)
+            self.graph.update(self.sales_force.best(challenge).route.decode())
                     
     def expand(self):
         for i in range(10): #@UnusedVariable
@@ -17,6 +17,8 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 #
 # $Revision: 1.1 $
+from genetics.util.cache import Cache
+from genetics.util.decorators import cached
 
 
 class Challenge(object):
@@ -24,7 +26,37 @@ class Challenge(object):
     A challenge must implement:
         fitness(self, organism): decodes the phenotype for this challenge 
         into a (comparable) fitness rating
+        
+    A challenge may also implement:
+        prepare(self): builds lookup tables that decoders share, such as a
+        distance matrix, once per challenge (see artifacts)
+        
+        fitness_batch(self, organisms): rates a whole list of organisms at
+        once, such as with one array expression or one simulator call
+        
+        canonical(self, organism): returns a cheap, hashable key that is 
+        equal for organisms with the same phenotype, such as the sorted 
+        tuple of the items a packing decoder would choose
+        
+    Phenotypes are then decoded once per canonical key and shared by every
+    organism with that key, for the canonical_cache_size most recently used
+    keys.
+    
+    If shared_phenotypes is set to a genetics.util.shared.SharedCache before
+    worker processes are started, numeric phenotypes are also shared between
+    the workers by genome (see Organism.genome_key).  If phenotype_store is
+    set to a genetics.util.store.PhenotypeStore, phenotypes are kept on disk
+    for later runs.
+    
+    Large read-only data that fitness is measured against belongs in dataset,
+    a genetics.util.dataset.Dataset.  Its arrays are memory mapped, so worker
+    processes share them instead of each loading a copy.
     '''
+    canonical_cache_size = 10000
+    shared_phenotypes    = None
+    phenotype_store      = None
+    dataset              = None
+    
     def fitness(self, organism):
         '''
         Converts the phenotype for this challenge into a fitness rating, the
@@ -35,6 +67,81 @@ class Challenge(object):
         return organism.decode(self)
     
     
+    def fitness_batch(self, organisms):
+        '''
+        Returns a list of the fitness of each organism, in the same order.
+        Selectors and populations ask for the fitness of whole generations 
+        through this.  By default, the organisms of each type that has a 
+        batch decoder for this challenge are decoded in one call (see 
+        Organism.decode_batch) before fitness() is called on each organism.
+        
+        @param organisms: a list of organisms
+        '''
+        organisms = list(organisms)
+        self._decode_batch(organisms)
+        
+        fitness = self.fitness
+        return [fitness(organism) for organism in organisms]
+    
+    
+    def _decode_batch(self, organisms):
+        '''
+        Internal method: decodes the organisms of each type that has a batch
+        decoder for this challenge in one call per type.  The others are 
+        left to be decoded one at a time.
+        
+        @param organisms: a list of organisms
+        '''
+        types = {}
+        for organism in organisms:
+            types.setdefault(type(organism), []).append(organism)
+        
+        for organism_type, group in types.items():
+            if organism_type.batch_decoder(self) is not None:
+                organism_type.decode_batch(self, group)
+    
+    
+    def prepare(self):
+        '''
+        Builds and returns the artifacts of the challenge: expensive lookup
+        tables that do not depend on any organism.  Decoders get them from
+        artifacts() instead of computing them on every evaluation.  By 
+        default there are none.
+        '''
+        return None
+    
+    
+    @cached('_artifacts')
+    def artifacts(self):
+        '''
+        Returns the artifacts built by prepare(), which is only called the
+        first time.  Worker processes that are forked after this, or that
+        are sent a pickled challenge, get the artifacts without building
+        them again.
+        '''
+        return self.prepare()
+    
+    
+    def discard_artifacts(self):
+        '''
+        Drops the artifacts, so that they are prepared again the next time
+        they are needed, such as after the data they are built from changes.
+        '''
+        self.__dict__.pop('_artifacts', None)
+    
+    
+    def __getstate__(self):
+        '''
+        Returns the state to pickle, such as when the challenge is sent to a
+        worker process.  Artifacts are sent along, but phenotype caches and 
+        stores belong to the process that made them and are left out.
+        '''
+        state = self.__dict__.copy()
+        for name in ('_canonical_phenotypes', 'shared_phenotypes', 'phenotype_store'):
+            state.pop(name, None)
+        return state
+    
+    
     def solved(self, organism): #@UnusedVariable
         '''
         Determines if an organism has found an optimal solution to the
@@ -45,6 +152,25 @@ class Challenge(object):
         return False
     
     
+    def canonical(self, organism): #@UnusedVariable
+        '''
+        Returns a hashable key that is equal for organisms that decode to the
+        same phenotype, or None if organisms cannot be compared this way.  By
+        default this returns None.
+        
+        @param organism: The organism to find the key of
+        '''
+        return None
+    
+    
+    @cached('_canonical_phenotypes')
+    def canonical_phenotypes(self):
+        '''
+        Returns the cache of phenotypes by canonical key
+        '''
+        return Cache('canonical_phenotypes', size=self.canonical_cache_size)
+    
+    
     def cmp(self, organism1, organism2):
         '''
         Calls fitness() on the organisms and compares them.  For use sorting in 
@@ -53,4 +179,46 @@ class Challenge(object):
         @param organism1: an organism to compare
         @param organism2: an organism to compare
         '''
-        return cmp(self.fitness(organism2), self.fitness(organism1))
\ No newline at end of file
+        return cmp(self.fitness(organism2), self.fitness(organism1))
+
+
+class MultiObjectiveChallenge(Challenge):
+    '''
+    A multi-objective challenge must implement:
+        objectives(self, organism): returns a sequence of objective values, 
+        each of them the higher the better
+    
+    Organisms are compared by Pareto dominance on their objectives (see 
+    genetics.selectors.nsga.NSGASelector) instead of by a single fitness.
+    '''
+    def objectives(self, organism):
+        '''
+        Converts the phenotype for this challenge into a sequence of objective
+        values.  By default this returns the decoded phenotype.
+        
+        @param organism: The organism to evaluate
+        '''
+        return organism.decode(self)
+    
+    
+    def objectives_batch(self, organisms):
+        '''
+        Returns a list of the objectives of each organism, in the same order,
+        decoding the organisms in batches like fitness_batch.
+        
+        @param organisms: a list of organisms
+        '''
+        organisms = list(organisms)
+        self._decode_batch(organisms)
+        
+        objectives = self.objectives
+        return [objectives(organism) for organism in organisms]
+    
+    
+    def fitness(self, organism):
+        '''
+        Returns the objectives as a tuple, which compares lexicographically.
+        
+        @param organism: The organism to test the fitness of
+        '''
+        return tuple(self.objectives(organism))
\ No newline at end of file
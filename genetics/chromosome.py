@@ -31,7 +31,15 @@ class Chromosome(object):
         def __cmp__(self, other): ...
         def mutate(self): ...
         def crossover(self, other): ...
+    
+    Chromosomes that are used to recognize repeated genomes must implement:
+        def content_key(self): ...
+    
+    Chromosomes made from their parent by a small, known change record it in
+    move (see genetics.chromosomes.tuple.TupleChromosome).
     '''
+    move = None # the change that made this chromosome from its parent
+    
     @virtual
     def __init__(self, *args, **kwargs):
         '''
@@ -65,4 +73,13 @@ class Chromosome(object):
         
         @param other: chromosome to compare against
         '''
+        pass
+        
+    
+    @virtual
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for chromosomes with the same 
+        alleles.
+        '''
         pass
\ No newline at end of file
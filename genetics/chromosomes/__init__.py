@@ -27,11 +27,16 @@ Chromosomes library:
     - genetics.chromosomes.float.FloatChromosome
     - genetics.chromosomes.integer.IntegerChromosome
     - genetics.chromosomes.permutation.PermutationChromosome
+    - genetics.chromosomes.subset.SubsetChromosome
+    - genetics.chromosomes.subset.SparseSubsetChromosome
+    - genetics.chromosomes.tree.TreeChromosome
     - genetics.chromosomes.tuple.TupleChromosome
+    - genetics.chromosomes.vector.IntegerVectorChromosome
+    - genetics.chromosomes.vector.CategoricalVectorChromosome
+
+Subset, tree and vector chromosomes require NumPy.
     
 TODO: add these chromosomes ->
-    - tree for GP
-    - set
     - float tuples for ES & EP
     
 Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
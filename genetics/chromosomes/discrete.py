@@ -29,7 +29,10 @@ class DiscreteChromosome(Chromosome):
     This chromosome represents alleles from a finite set of discrete values
     
     Class/Instance Level Variables:
-        -values: a Set of possible allele values
+        - values: a Set of possible allele values
+        - codebook: a genetics.util.structures.Codebook of possible allele
+          values, used instead of values.  If it is set, allele holds the 
+          integer code of the allele.  (default = None)
     
     Variation Invariants:
         - all chromosome values are in the values set
@@ -37,7 +40,8 @@ class DiscreteChromosome(Chromosome):
     Mutation Methods:
         - mutate_reset()
     '''
-    values = Set()
+    values   = Set()
+    codebook = None
     
     
     def __init__(self, allele, invariant=False, *args, **kwargs):
@@ -49,7 +53,14 @@ class DiscreteChromosome(Chromosome):
         '''
         self.allele = allele
         
-        if not invariant and allele not in self.values:            
+        if invariant:
+            return
+        
+        if self.codebook is not None:
+            if not 0 <= allele < len(self.codebook):
+                raise ValueError('%s is not an accepted allele code' % allele)
+        
+        elif allele not in self.values:            
             raise ValueError('%s is not an accepted allele value' % allele)
     
     
@@ -63,6 +74,14 @@ class DiscreteChromosome(Chromosome):
         return cmp(self.allele, other.allele)
     
     
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for chromosomes with the same
+        alleles
+        '''
+        return self.allele
+    
+    
     def __repr__(self):
         '''
         String representation of a discrete chromosome
@@ -70,9 +89,36 @@ class DiscreteChromosome(Chromosome):
         return '%s: allele=%s' % (type(self), self.allele)
     
     
+    @classmethod
+    def from_value(cls, value, *args, **kwargs):
+        '''
+        Creates a new chromosome from an allele value, encoding it with the
+        codebook if the class has one.
+        
+        @param value: an allele value
+        '''
+        if cls.codebook is not None:
+            value = cls.codebook.code(value)
+        return cls(value, *args, **kwargs)
+    
+    
+    def decode(self):
+        '''
+        Returns the allele value, decoded with the codebook if the class 
+        has one.
+        '''
+        if self.codebook is None:
+            return self.allele
+        return self.codebook.allele(self.allele)
+    
+    
     def mutate_reset(self):
         '''
-        Creates a new discrete chromosome randomly from the values set
+        Creates a new discrete chromosome randomly from the values set, or
+        from the codes in the codebook
         '''
+        if self.codebook is not None:
+            return type(self)(random.randrange(len(self.codebook)), invariant=True)
+        
         # TODO: performance test this
         return type(self)(allele=random.choice(tuple(self.values)))   
\ No newline at end of file
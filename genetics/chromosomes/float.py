@@ -73,6 +73,14 @@ class FloatChromosome(Chromosome):
         return cmp(self.allele, other.allele)
     
     
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for chromosomes with the same
+        alleles
+        '''
+        return self.allele
+    
+    
     def __repr__(self):
         '''
         String representation of a float chromosome
@@ -65,6 +65,14 @@ class IntegerChromosome(Chromosome):
         return cmp(self.allele, other.allele)
     
     
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for chromosomes with the same
+        alleles
+        '''
+        return self.allele
+    
+    
     def __repr__(self):
         '''
         String representation of an integer chromosome
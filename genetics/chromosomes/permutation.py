@@ -25,6 +25,25 @@ from sets import Set
 import random
 
 
+class _Index(dict):
+    '''
+    Internal class: table of allele => index that returns -1 for alleles
+    that are not in the permutation
+    '''
+    def __missing__(self, key): #@UnusedVariable
+        return -1
+    
+    
+class _EdgeTable(dict):
+    '''
+    Internal class: table of allele => adjacent alleles that returns an 
+    empty list for alleles that are not in the permutation
+    '''
+    def __missing__(self, key): #@UnusedVariable
+        return []
+
+
+
 class PermutationChromosome(TupleChromosome):
     '''
     This chromosome represents a permutation of any type of items as a tuple.
@@ -50,6 +69,9 @@ class PermutationChromosome(TupleChromosome):
     Not Inherited from TupleChromosome:
         - crossover_one_point(other)
         - crossover_uniform(other)
+        
+    If the class has a codebook, the internal tables used by crossover are
+    lists indexed by allele code instead of dicts.
     '''
     def __init__(self, alleles, invariant=False, *args, **kwargs):
         '''
@@ -143,7 +165,7 @@ class PermutationChromosome(TupleChromosome):
             for i in xrange(self.size): #@UnusedVariable
                 
                 # if there is no current item, choose one randomly
-                if not current:
+                if current is None:
                     current = random.choice(tuple(unseen))
                     
                 # add the current element to the child and mark it as seen
@@ -151,15 +173,15 @@ class PermutationChromosome(TupleChromosome):
                 unseen.remove(current)                
                 
                 # choose next element:
-                double = [x for x in our_edges.get(current, []) if x in unseen]
+                double = [x for x in our_edges[current] if x in unseen]
                 if double:
                     # first try edges found in both permutations...
                     current = random.choice(double)
                     
                 else:
                     # ...then try edges found only once...
-                    single = [x for x in my_edges.get(current, [])  if x in unseen] + \
-                             [x for x in his_edges.get(current, []) if x in unseen]
+                    single = [x for x in my_edges[current]  if x in unseen] + \
+                             [x for x in his_edges[current] if x in unseen]
                     if single:
                         current = random.choice(single)
                     else:
@@ -223,9 +245,9 @@ class PermutationChromosome(TupleChromosome):
                 seen.add(i)
                 
                 # move to the index of other.alleles[i] in self.alleles
-                if other.alleles[i] not in self_hash:
-                    break
                 i = self_hash[other.alleles[i]]
+                if i < 0:
+                    break
                 
             # save this cycle
             if cycle:
@@ -250,9 +272,14 @@ class PermutationChromosome(TupleChromosome):
     @cached('__index_by_value')
     def _index_by_value(self):
         '''
-        Internal method: returns a cached table of allele => index
+        Internal method: returns a cached table of allele => index.  Looking
+        up an allele that is not in the permutation returns -1.
         '''
-        index_by_value = {}
+        if self.codebook is None:
+            index_by_value = _Index()
+        else:
+            index_by_value = [-1] * len(self.codebook)
+            
         for i in xrange(self.size):
             index_by_value[self.alleles[i]] = i
         return index_by_value
@@ -263,16 +290,17 @@ class PermutationChromosome(TupleChromosome):
         '''
         Internal method: constructs an edge table from two permutations
         Structure:
-            allele -> (Set(edges in one permutation), Set(edges in both))
+            allele -> [adjacent alleles]
         '''
-        edges = {} 
+        edges = self._new_edge_table()
         for i in xrange(self.size):
             first, second = self.alleles[i], self.alleles[i-1]
             
-            if first not in edges:
-                edges[first]  = []
-            if second not in edges:
-                edges[second] = []
+            if self.codebook is None:
+                if first not in edges:
+                    edges[first]  = []
+                if second not in edges:
+                    edges[second] = []
             
             edges[first].append(second)
             edges[second].append(first)
@@ -286,20 +314,35 @@ class PermutationChromosome(TupleChromosome):
             
         @param other: another PermutationChromosome instance
         '''
-        edges = {}
-        other_edges = other._edge_table()
+        edges = self._new_edge_table()
+        my_edges, other_edges = self._edge_table(), other._edge_table()
         
-        for allele, adjacents in self._edge_table().items():
+        if self.codebook is None:
+            my_edges = my_edges.iteritems()
+        else:
+            my_edges = enumerate(my_edges)
+        
+        for allele, adjacents in my_edges:
             for adjacent in adjacents:
                 
-                if allele in other_edges and adjacent in other_edges[allele]:
-                    if allele not in edges:
+                if adjacent in other_edges[allele]:
+                    if self.codebook is None and allele not in edges:
                         edges[allele] = []
                     edges[allele].append(adjacent)
                     
         return edges
     
     
+    def _new_edge_table(self):
+        '''
+        Internal method: returns an empty edge table.  Alleles that are not 
+        in the table have no adjacent alleles.
+        '''
+        if self.codebook is None:
+            return _EdgeTable()
+        return [[] for i in xrange(len(self.codebook))] #@UnusedVariable
+    
+    
     def _build_pmx_permutation(self, perm1, perm2, first, second):
         '''
         Internal method: builds tuples for crossover_pmx based on indices
@@ -313,11 +356,11 @@ class PermutationChromosome(TupleChromosome):
         # tuple2 this eleminates the last step: copying remaining alleles 
         # from tuple2
         tuple1, tuple2 = perm1.alleles, perm2.alleles
+        perm1_hash = perm1._index_by_value()
         perm2_hash = perm2._index_by_value()
         
         section  = list(tuple1[first:second+1]) # copy this section into the child
         child    = list(tuple2[:first]) + section + list(tuple2[second+1:])
-        copied   = Set(section)
         occupied = Set(xrange(first, second+1))
 
         # for each element in the corresponding segment of other,
@@ -325,21 +368,21 @@ class PermutationChromosome(TupleChromosome):
         for i in xrange(first, second+1):
             
             allele = tuple2[i]
-            if allele not in copied:
+            if not first <= perm1_hash[allele] <= second:
                 # start off at the index of self.alleles[i] in other
                 j = i
                 
-                while tuple1[j] in perm2_hash:
+                while True:
                     # and get the element copied in its place from self
                     j = perm2_hash[tuple1[j]]
+                    if j < 0:
+                        break
                     
                     if j not in occupied:
                         # put i into the position of j in other...
                         child[j] = allele
                         occupied.add(j)
                         break
-                    
-                copied.add(allele)
         
         return child
         
@@ -355,15 +398,18 @@ class PermutationChromosome(TupleChromosome):
         '''
         # middle is the block from tuple1 we put in the same position
         # of the child.  queue has the items from tuple2 in the order
-        # we can use them: [items after second + items through second]
+        # we can use them: [items after second + items through second].
+        # each queued item is seen once, so an item is already in the
+        # child only if it came from the block of tuple1.
         middle = list(perm1.alleles[first:second+1])
         queue  = Queue(perm2.alleles[second+1:] + perm2.alleles[:second+1])
+        perm1_hash = perm1._index_by_value()
         
         # this fills out the end of the new list w/ items from the queue
         for i in xrange(self.size - second - 1): #@UnusedVariable
             while not queue.empty():
                 end_item = queue.dequeue()
-                if end_item not in middle:
+                if not first <= perm1_hash[end_item] <= second:
                     middle.append(end_item)
                     break
         
@@ -372,7 +418,7 @@ class PermutationChromosome(TupleChromosome):
         for i in xrange(first): #@UnusedVariable
             while not queue.empty():
                 start_item = queue.dequeue()
-                if start_item not in middle:
+                if not first <= perm1_hash[start_item] <= second:
                     start.append(start_item)
                     break
 
@@ -0,0 +1,428 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.organism import Chromosome
+from genetics.util.decorators import cached, comparable
+from genetics.util.randomness import numpy_random
+import numpy, random
+
+
+class SubsetChromosome(Chromosome):
+    '''
+    This chromosome represents a subset of the items 0 ... size-1 as a
+    bitmap.  It keeps running totals of the cost and value of its members,
+    so mutations update them in constant time and feasibility checks do not
+    need to look at every member.  For picking a few items out of very many,
+    see SparseSubsetChromosome.
+    
+    Class/Instance Level Variables:
+        - size:   number of items to choose from
+        - costs:  a sequence with the cost of each item  (default = None: 0)
+        - values: a sequence with the value of each item (default = None: 0)
+    
+    Instance Variables:
+        - count: number of members
+        - cost:  total cost of the members
+        - value: total value of the members
+    
+    Variation Invariants:
+        - members are always items 0 ... size-1
+    
+    Mutation Methods:
+        - mutate_add()
+        - mutate_remove()
+        - mutate_swap()
+        
+    Recombination Methods:
+        - crossover_intersection(other)
+    '''
+    size   = 0
+    costs  = None
+    values = None
+    
+    
+    def __init__(self, members=(), invariant=False, cost=None, value=None, 
+                 count=None, *args, **kwargs):
+        '''
+        Initializes the subset from a sequence of member items.  Raises a 
+        ValueError if an item is not between 0 and size-1.
+        
+        @param members: a sequence of items
+        @param invariant=False: used by the variation operators to pass in
+              a new bitmap instead of a sequence of items.  Not intended
+              for use by external code!
+        @param cost: total cost of the members, if already known
+        @param value: total value of the members, if already known
+        @param count: number of members, if already known
+        '''
+        if invariant:
+            bitmap = members
+        else:
+            members = numpy.array(members, dtype=numpy.intp, ndmin=1)
+            if ((members < 0) | (members >= self.size)).any():
+                raise ValueError('items must be between 0 and %s: %s' % \
+                    (self.size - 1, members))
+            
+            bitmap = numpy.zeros(self.size, dtype=bool)
+            bitmap[members] = True
+        
+        bitmap.flags.writeable = False
+        self.bitmap = bitmap
+        if count is None:
+            count = int(bitmap.sum())
+        self.count = count
+        
+        costs, values = self._weights()
+        if cost is None:
+            cost = float(numpy.dot(costs, bitmap))
+        if value is None:
+            value = float(numpy.dot(values, bitmap))
+        self.cost, self.value = cost, value
+    
+    
+    @comparable
+    def __cmp__(self, other):
+        '''
+        Compares two subsets by their members
+        
+        @param other: another subset chromosome of the same type
+        '''
+        return cmp(sorted(self.members()), sorted(other.members()))
+    
+    
+    @cached('_content_key')
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for subsets with the same 
+        members
+        '''
+        return self.bitmap.tobytes()
+    
+    
+    def __contains__(self, item):
+        '''
+        Determines if an item is a member of the subset
+        
+        @param item: an item between 0 and size-1
+        '''
+        return bool(self.bitmap[item])
+    
+    
+    def __repr__(self):
+        '''
+        String representation of a subset chromosome
+        '''
+        return '%s: count=%s, cost=%s, value=%s' % \
+            (type(self), self.count, self.cost, self.value)
+    
+    
+    def members(self):
+        '''
+        Returns a list of the items in the subset
+        '''
+        return numpy.flatnonzero(self.bitmap).tolist()
+    
+    
+    def mutate_add(self):
+        '''
+        Creates a new subset with one random item added to it
+        
+        Example:
+            {1 4 7}  ->  {1 (3) 4 7}
+        '''
+        if self.count >= self.size:
+            return self._changed()
+        return self._changed(add=self._random_nonmember())
+    
+    
+    def mutate_remove(self):
+        '''
+        Creates a new subset with one random member removed from it
+        
+        Example:
+            {1 (4) 7}  ->  {1 7}
+        '''
+        if self.count <= 0:
+            return self._changed()
+        return self._changed(remove=self._random_member())
+    
+    
+    def mutate_swap(self):
+        '''
+        Creates a new subset with one random member replaced by an item
+        that was not a member
+        
+        Example:
+            {1 (4) 7}  ->  {1 (5) 7}
+        '''
+        if self.count <= 0 or self.count >= self.size:
+            return self._changed()
+        return self._changed(self._random_nonmember(), self._random_member())
+    
+    
+    @comparable
+    def crossover_intersection(self, other):
+        '''
+        Intersection Crossover
+        
+        Both children inherit every item that is in both parents.  Items in
+        only one parent go to one child or the other at random, so the
+        children partition the symmetric difference of the parents.
+        
+        Example:
+            parents  => {1 2 5 8},  {1 3 5 9}
+            children => {1 5 2 9},  {1 5 3 8}
+        
+        @param other: another subset chromosome of the same type
+        '''
+        if self.size != other.size:
+            raise ValueError('%s and %s are not of the same size' % (self, other))
+        
+        common = self.bitmap & other.bitmap
+        differ = self.bitmap ^ other.bitmap
+        mask   = numpy_random().random_sample(self.size) < 0.5
+        
+        child1 = common | (differ & mask)
+        child2 = common | (differ & ~mask)
+        return type(self)(child1, invariant=True), type(self)(child2, invariant=True)
+    
+    
+    @classmethod
+    def _weights(cls):
+        '''
+        Internal method: returns arrays of the costs and values of each item.
+        These are built the first time they are needed and stored on the class.
+        '''
+        try:
+            return cls.__dict__['_weights_table']
+        
+        except KeyError:
+            weights = []
+            for sequence in cls.costs, cls.values:
+                if sequence is None:
+                    weights.append(numpy.zeros(cls.size))
+                elif len(sequence) != cls.size:
+                    raise ValueError('%s weights expected, got %s' % \
+                        (cls.size, len(sequence)))
+                else:
+                    weights.append(numpy.array(sequence, dtype=float))
+            
+            table = tuple(weights)
+            setattr(cls, '_weights_table', table)
+            return table
+    
+    
+    def _random_member(self):
+        '''
+        Internal method: returns a random member.  Rejection sampling takes
+        a constant number of tries while at least half the items are members.
+        '''
+        if self.count * 2 >= self.size:
+            while True:
+                item = random.randrange(self.size)
+                if self.bitmap[item]:
+                    return item
+        return random.choice(self.members())
+    
+    
+    def _random_nonmember(self):
+        '''
+        Internal method: returns a random item that is not a member
+        '''
+        if self.count * 2 <= self.size:
+            while True:
+                item = random.randrange(self.size)
+                if not self.bitmap[item]:
+                    return item
+        return random.choice(numpy.flatnonzero(~self.bitmap).tolist())
+    
+    
+    def _changed(self, add=None, remove=None):
+        '''
+        Internal method: returns a new subset with one item added and one
+        removed, updating the cost, value and count incrementally.  Bitmaps
+        are read-only, so a child that is not changed shares the bitmap of
+        its parent; otherwise the bitmap is copied, which is O(size).
+        
+        @param add: item to add, or None
+        @param remove: member to remove, or None
+        '''
+        if add is None and remove is None:
+            return type(self)(self.bitmap, invariant=True, cost=self.cost,
+                              value=self.value, count=self.count)
+        
+        bitmap = self.bitmap.copy()
+        cost, value = self._delta(add, remove)
+        count = self.count
+        if add is not None:
+            bitmap[add] = True
+            count += 1
+        if remove is not None:
+            bitmap[remove] = False
+            count -= 1
+        return type(self)(bitmap, invariant=True, cost=cost, value=value,
+                          count=count)
+    
+    
+    def _delta(self, add, remove):
+        '''
+        Internal method: returns the cost and value of the subset after adding
+        and removing an item
+        
+        @param add: item to add, or None
+        @param remove: member to remove, or None
+        '''
+        costs, values = self._weights()
+        cost, value = self.cost, self.value
+        if add is not None:
+            cost  += costs[add]
+            value += values[add]
+        if remove is not None:
+            cost  -= costs[remove]
+            value -= values[remove]
+        return float(cost), float(value)
+    
+    
+    
+class SparseSubsetChromosome(SubsetChromosome):
+    '''
+    This chromosome represents a subset of the items 0 ... size-1 as a set
+    of member items.  Memory and work per child depend on the number of 
+    members rather than on size, so it is suited to picking a few items out
+    of millions.  See SubsetChromosome for class variables and operators.
+    '''
+    def __init__(self, members=(), invariant=False, cost=None, value=None,
+                 count=None, *args, **kwargs):
+        '''
+        Initializes the subset from a sequence of member items.  Raises a 
+        ValueError if an item is not between 0 and size-1.
+        
+        @param members: a sequence of items
+        @param invariant=False: used by the variation operators to pass in
+              a new frozenset of valid items.  Not intended for use by
+              external code!
+        @param cost: total cost of the members, if already known
+        @param value: total value of the members, if already known
+        @param count: unused, the count of a frozenset is O(1)
+        '''
+        if not invariant:
+            members = frozenset([int(item) for item in members])
+            for item in members:
+                if item < 0 or item >= self.size:
+                    raise ValueError('items must be between 0 and %s: %s' % \
+                        (self.size - 1, item))
+        
+        self.items = members
+        self.count = len(members)
+        
+        if cost is None or value is None:
+            costs, values = self._weights()
+            index = numpy.fromiter(members, dtype=numpy.intp, count=self.count)
+            cost  = float(costs.take(index).sum())
+            value = float(values.take(index).sum())
+        self.cost, self.value = cost, value
+        
+        
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for subsets with the same 
+        members
+        '''
+        return self.items
+    
+    
+    def __contains__(self, item):
+        '''
+        Determines if an item is a member of the subset
+        
+        @param item: an item between 0 and size-1
+        '''
+        return item in self.items
+    
+    
+    @cached('_members')
+    def members(self):
+        '''
+        Returns a list of the items in the subset
+        '''
+        return list(self.items)
+    
+    
+    @comparable
+    def crossover_intersection(self, other):
+        '''
+        Intersection Crossover.  See SubsetChromosome.crossover_intersection.
+        
+        @param other: another SparseSubsetChromosome of the same type
+        '''
+        if self.size != other.size:
+            raise ValueError('%s and %s are not of the same size' % (self, other))
+        
+        child1, child2 = set(self.items & other.items), set(self.items & other.items)
+        for item in self.items ^ other.items:
+            if random.random() < 0.5:
+                child1.add(item)
+            else:
+                child2.add(item)
+        
+        return type(self)(frozenset(child1), invariant=True), \
+               type(self)(frozenset(child2), invariant=True)
+    
+    
+    def _random_member(self):
+        '''
+        Internal method: returns a random member
+        '''
+        return random.choice(self.members())
+    
+    
+    def _random_nonmember(self):
+        '''
+        Internal method: returns a random item that is not a member
+        '''
+        if self.count * 2 <= self.size:
+            while True:
+                item = random.randrange(self.size)
+                if item not in self.items:
+                    return item
+        return random.choice(list(frozenset(xrange(self.size)) - self.items))
+    
+    
+    def _changed(self, add=None, remove=None):
+        '''
+        Internal method: returns a new subset with one item added and one
+        removed, updating the cost and value totals incrementally.  Item
+        sets are frozen, so a child that is not changed shares the items of
+        its parent.
+        
+        @param add: item to add, or None
+        @param remove: member to remove, or None
+        '''
+        if add is None and remove is None:
+            return type(self)(self.items, invariant=True, cost=self.cost,
+                              value=self.value)
+        
+        items = set(self.items)
+        cost, value = self._delta(add, remove)
+        if add is not None:
+            items.add(add)
+        if remove is not None:
+            items.remove(remove)
+        return type(self)(frozenset(items), invariant=True, cost=cost, value=value)
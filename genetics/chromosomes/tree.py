@@ -0,0 +1,441 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.organism import Chromosome
+from genetics.util.decorators import cached, comparable
+import numpy, random
+
+
+def protected_divide(x, y):
+    '''
+    Divides x by y, returning 1.0 wherever y is 0.  Works on numbers and 
+    NumPy arrays alike.
+    
+    @param x: numerator
+    @param y: denominator
+    '''
+    x, y = numpy.asarray(x, dtype=float), numpy.asarray(y, dtype=float)
+    zero = (y == 0)
+    return numpy.where(zero, 1.0, x / numpy.where(zero, 1.0, y))
+    
+    
+    
+class TreeChromosome(Chromosome):
+    '''
+    This chromosome represents an expression tree for genetic programming.
+    Trees are nested tuples, so they are immutable and children share every
+    subtree that variation did not touch:
+        
+        function node: (name, child, ...)
+        variable:      'x'
+        constant:      1.5
+    
+    A tree is compiled once into a Python code object.  Since the default 
+    functions are NumPy ufuncs, evaluating it against arrays of variable 
+    values computes the expression over a whole dataset at once.  See 
+    SubtreeCache for sharing subexpression outputs between trees.
+    
+    Class/Instance Level Variables:
+        - functions: {name: (arity, function), ...}.  Names must be valid
+          Python identifiers that are not also variable names.
+        - terminals: a sequence of variable names
+        - constants: (lower, upper) bounds for random constants, or None
+        - depth:     depth of new random trees (default = 4)
+        - max_depth: depth limit for trees made by variation (default = 8)
+    
+    Variation Invariants:
+        - trees contain only the functions, variables and constants above
+        - new trees are no deeper than max_depth
+    
+    Mutation Methods:
+        - mutate_point()
+        - mutate_subtree()
+        
+    Recombination Methods:
+        - crossover_subtree(other)
+    '''
+    functions = {
+        'add': (2, numpy.add),
+        'sub': (2, numpy.subtract),
+        'mul': (2, numpy.multiply),
+        'div': (2, protected_divide),
+    }
+    terminals = ('x',)
+    constants = (-1.0, 1.0)
+    depth     = 4
+    max_depth = 8
+    
+    # number of times crossover looks for points that respect max_depth
+    _crossover_tries = 8
+    
+    
+    def __init__(self, tree=None, *args, **kwargs):
+        '''
+        Initializes the chromosome from a nested tuple.  If no tree is given,
+        a random one is grown up to self.depth.
+        
+        @param tree: an expression tree
+        '''
+        if tree is None:
+            tree = self._grow(self.depth)
+        self.tree = tree
+        
+        
+    @comparable
+    def __cmp__(self, other):
+        '''
+        Compares two trees structurally
+        
+        @param other: another TreeChromosome instance
+        '''
+        return cmp(self.tree, other.tree)
+    
+    
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for chromosomes with the same
+        alleles
+        '''
+        return self.tree
+    
+    
+    def __repr__(self):
+        '''
+        String representation of a tree chromosome
+        '''
+        return '%s: %s' % (type(self), self.source())
+    
+    
+    @cached('_source')
+    def source(self):
+        '''
+        Returns the tree as a Python expression:  add(x, mul(x, 0.5))
+        '''
+        return self._source(self.tree)
+    
+    
+    @cached('_code')
+    def code(self):
+        '''
+        Returns the tree compiled into a Python code object
+        '''
+        return compile(self.source(), '<%s>' % type(self).__name__, 'eval')
+    
+    
+    def evaluate(self, variables=None, **kwargs):
+        '''
+        Evaluates the compiled tree.  Variables may be numbers or NumPy 
+        arrays holding a value for each record in a dataset:
+        
+            tree.evaluate(x=3.0)
+            tree.evaluate({'x': numpy.linspace(0, 1, 1000)})
+        
+        @param variables: {variable name: value, ...}
+        '''
+        if variables is None:
+            variables = kwargs
+        return eval(self.code(), self._namespace(), variables)
+    
+    
+    @cached('_nodes')
+    def nodes(self):
+        '''
+        Returns the number of nodes in the tree
+        '''
+        return len(self._paths())
+    
+    
+    def mutate_point(self):
+        '''
+        Creates a new tree with one random node replaced by a node of the
+        same kind: a function with the same arity, or another terminal.
+        
+        Example:
+            add(x, mul(x, 0.5))  ->  add(x, (sub)(x, 0.5))
+        '''
+        path = random.choice(self._paths())
+        node = self._subtree(self.tree, path)
+        
+        if isinstance(node, tuple):
+            arity = len(node) - 1
+            names = [name for name, (n, f) in self.functions.items() #@UnusedVariable
+                     if n == arity]
+            new_node = (random.choice(names),) + node[1:]
+        else:
+            new_node = self._terminal()
+            
+        return type(self)(self._replace(self.tree, path, new_node))
+        
+        
+    def mutate_subtree(self):
+        '''
+        Creates a new tree with a random subtree replaced by a new random one
+        
+        Example:
+            add(x, (mul(x, 0.5)))  ->  add(x, (div(0.2, x)))
+        '''
+        path = random.choice(self._paths())
+        depth = min(self.depth, self.max_depth - len(path))
+        return type(self)(self._replace(self.tree, path, self._grow(depth)))
+    
+    
+    @comparable
+    def crossover_subtree(self, other):
+        '''
+        Subtree Crossover
+        J.R. Koza.  "Genetic Programming."  MIT Press, 1992.
+        
+        Swaps a random subtree of each parent.  If no pair of subtrees can be
+        found that keeps both children within max_depth, the children are 
+        copies of their parents.
+        
+        Example:
+            parents  => add(x, [mul(x, 0.5)]),  sub({x}, 1.0)
+            children => add(x, {x}),  sub([mul(x, 0.5)], 1.0)
+            
+        @param other: another TreeChromosome instance
+        '''
+        for i in xrange(self._crossover_tries): #@UnusedVariable
+            path1 = random.choice(self._paths())
+            path2 = random.choice(other._paths())
+            
+            subtree1 = self._subtree(self.tree, path1)
+            subtree2 = self._subtree(other.tree, path2)
+            
+            if len(path1) + self._depth(subtree2) <= self.max_depth and \
+               len(path2) + self._depth(subtree1) <= self.max_depth:
+                return type(self)(self._replace(self.tree, path1, subtree2)), \
+                       type(self)(self._replace(other.tree, path2, subtree1))
+        
+        return type(self)(self.tree), type(self)(other.tree)
+    
+    
+    @classmethod
+    def _namespace(cls):
+        '''
+        Internal method: returns the globals for evaluating compiled trees.  
+        This is built the first time it is needed and stored on the class.
+        '''
+        try:
+            return cls.__dict__['_namespace_table']
+        
+        except KeyError:
+            namespace = {'__builtins__': {}}
+            for name, (arity, function) in cls.functions.items(): #@UnusedVariable
+                namespace[name] = function
+            setattr(cls, '_namespace_table', namespace)
+            return namespace
+    
+    
+    @classmethod
+    def _grow(cls, depth):
+        '''
+        Internal method: returns a random tree no deeper than depth using
+        the grow method
+        
+        @param depth: maximum depth of the tree
+        '''
+        names = cls.functions.keys()
+        if depth <= 1 or random.random() * (len(names) + len(cls.terminals)) \
+            < len(cls.terminals):
+            return cls._terminal()
+        
+        name = random.choice(names)
+        return (name,) + tuple([cls._grow(depth - 1) 
+                                for i in xrange(cls.functions[name][0])]) #@UnusedVariable
+    
+    
+    @classmethod
+    def _terminal(cls):
+        '''
+        Internal method: returns a random variable name or constant
+        '''
+        if cls.constants and random.randrange(len(cls.terminals) + 1) == 0:
+            return random.uniform(*cls.constants)
+        return random.choice(cls.terminals)
+    
+    
+    def _source(self, node):
+        '''
+        Internal method: returns the Python expression for a node
+        
+        @param node: a subtree
+        '''
+        if isinstance(node, tuple):
+            return '%s(%s)' % (node[0], ', '.join([self._source(child) 
+                                                  for child in node[1:]]))
+        elif isinstance(node, basestring):
+            return node
+        else:
+            return repr(node)
+    
+    
+    def _depth(self, node):
+        '''
+        Internal method: returns the depth of a subtree
+        
+        @param node: a subtree
+        '''
+        if isinstance(node, tuple):
+            return 1 + max([self._depth(child) for child in node[1:]])
+        return 1
+        
+        
+    @cached('_node_paths')
+    def _paths(self):
+        '''
+        Internal method: returns a list of the paths to every node in the 
+        tree, in preorder.  A path is a tuple of indices into nested tuples.
+        '''
+        paths, stack = [], [((), self.tree)]
+        while stack:
+            path, node = stack.pop()
+            paths.append(path)
+            if isinstance(node, tuple):
+                for i in xrange(len(node) - 1, 0, -1):
+                    stack.append((path + (i,), node[i]))
+        return paths
+    
+    
+    def _subtree(self, node, path):
+        '''
+        Internal method: returns the subtree at the end of a path
+        
+        @param node: the tree to start from
+        @param path: a tuple of indices
+        '''
+        for i in path:
+            node = node[i]
+        return node
+    
+    
+    def _replace(self, node, path, subtree):
+        '''
+        Internal method: returns a copy of a tree with the subtree at the end
+        of path replaced.  Only the nodes along the path are copied.
+        
+        @param node: the tree to start from
+        @param path: a tuple of indices
+        @param subtree: the new subtree
+        '''
+        if not path:
+            return subtree
+        i = path[0]
+        return node[:i] + (self._replace(node[i], path[1:], subtree),) + node[i+1:]
+    
+    
+    
+class SubtreeCache(object):
+    '''
+    Evaluates trees against a fixed set of variable values, computing the 
+    output of each distinct subtree only once.  Subtrees are identified by
+    their structure, so a subexpression that appears in many organisms is
+    evaluated once.  Subtree objects shared between parents and children 
+    are recognized without walking them again.
+    
+    The cache holds an output for every distinct subtree it has seen.  Call
+    clear() once per generation to limit it to the current population.
+    
+        cache = SubtreeCache(MyTree, {'x': xs, 'y': ys})
+        errors = abs(cache.evaluate(organism.expression) - targets)
+    '''
+    def __init__(self, type, variables):
+        '''
+        Creates a new cache
+        
+        @param type: a class that inherits from TreeChromosome
+        @param variables: {variable name: value or array of values, ...}
+        '''
+        self.type      = type
+        self.variables = variables
+        self.hits      = 0
+        self.misses    = 0
+        self.clear()
+        
+        
+    def __len__(self):
+        '''
+        Returns the number of distinct subtrees in the cache
+        '''
+        return len(self._outputs)
+    
+    
+    def clear(self):
+        '''
+        Removes all subtree outputs from the cache
+        '''
+        self._keys    = {} # structural key   -> subtree id
+        self._outputs = [] # subtree id       -> output
+        self._seen    = {} # id(subtree)      -> (subtree, subtree id)
+        
+        
+    def evaluate(self, chromosome):
+        '''
+        Returns the output of a tree
+        
+        @param chromosome: a TreeChromosome instance
+        '''
+        return self._outputs[self._evaluate(chromosome.tree)]
+    
+    
+    def _evaluate(self, node):
+        '''
+        Internal method: evaluates a subtree and returns its id
+        
+        @param node: a subtree
+        '''
+        # subtrees shared by reference have already been evaluated
+        try:
+            return self._seen[id(node)][1]
+        except KeyError:
+            pass
+        
+        # the structural key of a function node is made from the ids of its
+        # children, so it can be hashed without walking the whole subtree
+        if isinstance(node, tuple):
+            children = [self._evaluate(child) for child in node[1:]]
+            key = (node[0],) + tuple(children)
+        else:
+            children = None
+            key = (type(node), node)
+        
+        try:
+            index = self._keys[key]
+            self.hits += 1
+            
+        except KeyError:
+            if children is None:
+                if isinstance(node, basestring):
+                    output = self.variables[node]
+                else:
+                    output = node
+            else:
+                function = self.type.functions[node[0]][1]
+                output = function(*[self._outputs[child] for child in children])
+            
+            index = len(self._outputs)
+            self._outputs.append(output)
+            self._keys[key] = index
+            self.misses += 1
+        
+        if children is not None:
+            # hold a reference to node so that its id is not reused
+            self._seen[id(node)] = (node, index)
+        return index
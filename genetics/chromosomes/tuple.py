@@ -19,7 +19,7 @@
 # $Revision: 1.11 $
 
 from genetics.organism import Chromosome
-from genetics.util.decorators import comparable, tuple_crossover
+from genetics.util.decorators import cached, comparable, tuple_crossover
 import random
 
 
@@ -29,6 +29,10 @@ class TupleChromosome(Chromosome):
     is of fixed length and all mutations and recombinations yield tuples
     chromosomes of the same length, and composed of the same alleles.
     
+    Class/Instance Level Variables:
+        - codebook: a genetics.util.structures.Codebook.  If it is set, 
+          alleles holds the integer codes of the alleles.  (default = None)
+    
     Variation Invariant:
         - new tuples are the same size as their parents
 
@@ -41,7 +45,19 @@ class TupleChromosome(Chromosome):
     Recombination Methods:
         - crossover_one_point(other)
         - crossover_uniform(other)
+        
+    Children of mutate_swap, mutate_insert and mutate_invert record the move
+    that made them from their parent, so decoders can update the parent's 
+    phenotype instead of decoding the child from scratch:
+        - ('swap', i, j):   the alleles at i and j were exchanged
+        - ('insert', i, j): the allele at i was moved to j, and the alleles 
+                            in between shifted over by one
+        - ('invert', i, j): the alleles from i to j were reversed
+    The move of other chromosomes is None.
     '''
+    codebook = None
+    
+    
     def __init__(self, alleles, invariant=False, *args, **kwargs):
         '''
         Initializes the permutation based on a tuple passed in, or based on a
@@ -57,6 +73,30 @@ class TupleChromosome(Chromosome):
             self.alleles = (alleles,)
             
         self.size = len(self.alleles)
+        
+    
+    @classmethod
+    def from_values(cls, values, *args, **kwargs):
+        '''
+        Creates a new chromosome from a sequence of alleles, encoding them
+        with the codebook if the class has one.
+        
+        @param values: a sequence of alleles
+        '''
+        if cls.codebook is not None:
+            values = cls.codebook.encode(values)
+        return cls(values, *args, **kwargs)
+    
+    
+    @cached('_decoded_alleles')
+    def decode(self):
+        '''
+        Returns the alleles as a tuple, decoded with the codebook if the 
+        class has one.
+        '''
+        if self.codebook is None:
+            return self.alleles
+        return self.codebook.decode(self.alleles)
             
 
     @comparable
@@ -69,6 +109,14 @@ class TupleChromosome(Chromosome):
         return cmp(self.alleles, other.alleles)
     
     
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for chromosomes with the same
+        alleles
+        '''
+        return self.alleles
+    
+    
     def __repr__(self):
         '''
         String representation of a tuple chromosome
@@ -83,7 +131,7 @@ class TupleChromosome(Chromosome):
         Example:
             0 1 2 (3) 4 5 (6) 7 8 9  ->  0 1 2 (6) 4 5 (3) 7 8 9
         '''
-        return type(self)(self._random_swap(), invariant=True)
+        return self._moved(*self._random_swap())
     
     
     def mutate_insert(self):
@@ -94,7 +142,7 @@ class TupleChromosome(Chromosome):
             0 1 2 (3) 4 5 (6) 7 8 9  ->  0 1 2 (3 6) 4 5 7 8 9  or
             0 1 2 (3) 4 5 (6) 7 8 9  ->  0 1 2 4 5 (3 6) 7 8 9
         '''
-        return type(self)(self._random_insert(), invariant=True)
+        return self._moved(*self._random_insert())
             
             
     def mutate_scramble(self):
@@ -114,7 +162,7 @@ class TupleChromosome(Chromosome):
         Example:
             0 1 2 (3 4 5 6) 7 8 9  ->  0 1 2 (6 5 4 3) 7 8 9    
         '''
-        return type(self)(self._random_invert(), invariant=True)
+        return self._moved(*self._random_invert())
 
 
     @tuple_crossover
@@ -189,9 +237,22 @@ class TupleChromosome(Chromosome):
         return tuple(indices)
         
     
+    def _moved(self, alleles, move):
+        '''
+        Internal method: returns a new chromosome with the alleles and the 
+        move that made them
+        
+        @param alleles: alleles of the new chromosome
+        @param move: the move from these alleles, or None
+        '''
+        child = type(self)(alleles, invariant=True)
+        child.move = move
+        return child
+    
+    
     def _random_swap(self):
         '''
-        Internal method: returns a tuple with two alleles swapped
+        Internal method: returns a tuple with two alleles swapped, and the move
         '''
         new_alleles = list(self.alleles)
         
@@ -199,14 +260,15 @@ class TupleChromosome(Chromosome):
             # find two random elements to switch
             a, b = self._random_indices()            
             new_alleles[a], new_alleles[b] = new_alleles[b], new_alleles[a]
-            return new_alleles
+            return new_alleles, ('swap', a, b)
 
-        return self.alleles
+        return self.alleles, None
         
     
     def _random_insert(self):
         '''
-        Internal method: returns a tuple with two random alleles adjacent
+        Internal method: returns a tuple with two random alleles adjacent,
+        and the move
         '''
         if self.size > 2:
             first, second = self._random_indices()            
@@ -218,12 +280,14 @@ class TupleChromosome(Chromosome):
             
             if random.random() < 0.5:
                 # sometimes we move the second one to the first
-                return before + insert + between + after
+                return before + insert + between + after, \
+                    ('insert', second, first + 1)
             else:
                 # and other times we move the first to the second
-                return before + between + insert + after
+                return before + between + insert + after, \
+                    ('insert', first, second - 1)
             
-        return self.alleles
+        return self.alleles, None
         
         
     def _random_scramble(self):
@@ -245,7 +309,8 @@ class TupleChromosome(Chromosome):
     
     def _random_invert(self):
         '''
-        Internal method: returns a tuple with a random chunk reversed
+        Internal method: returns a tuple with a random chunk reversed, and the
+        move
         '''
         if self.size > 1:
             first, second = self._random_indices()
@@ -255,6 +320,6 @@ class TupleChromosome(Chromosome):
             after  = self.alleles[second+1:]
             
             middle.reverse()
-            return before + tuple(middle) + after
+            return before + tuple(middle) + after, ('invert', first, second)
         
-        return self.alleles
\ No newline at end of file
+        return self.alleles, None
\ No newline at end of file
@@ -0,0 +1,404 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.organism import Chromosome
+from genetics.util.decorators import cached, comparable, tuple_crossover
+from genetics.util.randomness import numpy_random
+import numpy, random
+
+
+class VectorChromosome(Chromosome):
+    '''
+    This is a base class for chromosomes that store a fixed length vector of
+    numeric alleles in a NumPy array.  The array is read-only, so fitness 
+    functions can use chromosome.alleles directly without copying it.  All
+    variation operators work on the whole vector at once.
+    
+    Class/Instance Level Variables:
+        - dtype: NumPy data type of the alleles
+        - rate:  probability of mutating each gene (default = 1 / size)
+    
+    Variation Invariant:
+        - new vectors are the same size as their parents
+        
+    Recombination Methods:
+        - crossover_one_point(other)
+        - crossover_two_point(other)
+        - crossover_uniform(other)
+    '''
+    dtype = None
+    rate  = None
+    
+    
+    def __init__(self, alleles, invariant=False, *args, **kwargs):
+        '''
+        Initializes the vector based on a sequence passed in.  If alleles is
+        already an array of the correct type it is used without copying.
+        
+        @param alleles: a sequence or array of alleles
+        @param invariant=False: used by the variation operators to indicate
+              that alleles is a new array that nothing else refers to
+        '''
+        if invariant:
+            alleles = numpy.asarray(alleles, dtype=self.dtype)
+        else:
+            alleles = numpy.array(alleles, dtype=self.dtype, ndmin=1)
+            
+        if alleles.ndim != 1:
+            raise ValueError('alleles must be one-dimensional: %s' % alleles)
+            
+        # organisms are immutable, so their alleles should be too
+        alleles.flags.writeable = False
+        self.alleles = alleles
+        self.size    = len(alleles)
+        
+        
+    @comparable
+    def __cmp__(self, other):
+        '''
+        Compares two vectors
+        
+        @param other: another VectorChromosome instance
+        '''
+        return cmp(self.alleles.tolist(), other.alleles.tolist())
+    
+    
+    @cached('_content_key')
+    def content_key(self):
+        '''
+        Returns a hashable value that is equal for chromosomes with the same
+        alleles
+        '''
+        return self.alleles.tobytes()
+    
+    
+    def __repr__(self):
+        '''
+        String representation of a vector chromosome
+        '''
+        return '%s: size=%s, alleles=%s' % (type(self), self.size, self.alleles)
+
+
+    @tuple_crossover
+    def crossover_one_point(self, other):
+        '''
+        One-Point Crossover
+        
+        Returns two child vectors made from sections randomly
+        cut out of each parent.  See TupleChromosome.crossover_one_point.
+        
+        Bias: positional
+        
+        @param other: another VectorChromosome instance
+        '''
+        i = random.randrange(self.size)
+        child1 = numpy.concatenate((self.alleles[:i], other.alleles[i:]))
+        child2 = numpy.concatenate((other.alleles[:i], self.alleles[i:]))
+        return type(self)(child1, invariant=True), type(self)(child2, invariant=True)
+    
+    
+    @tuple_crossover
+    def crossover_two_point(self, other):
+        '''
+        Two-Point Crossover
+        
+        Returns two child vectors that swap a random middle section
+        between their parents.
+        
+        Bias: positional
+        
+        Example:
+            parents  => 0 1 [2 3 4] 5 6,  a b {c d e} f g
+            children => 0 1 {c d e} 5 6,  a b [2 3 4] f g
+        
+        @param other: another VectorChromosome instance
+        '''
+        first, second = sorted(random.sample(xrange(self.size + 1), 2))
+        child1, child2 = self.alleles.copy(), other.alleles.copy()
+        child1[first:second] = other.alleles[first:second]
+        child2[first:second] = self.alleles[first:second]
+        return type(self)(child1, invariant=True), type(self)(child2, invariant=True)
+    
+    
+    @tuple_crossover
+    def crossover_uniform(self, other):
+        '''
+        Uniform Crossover
+        
+        Each gene is randomly placed into the same position in one of 
+        the children.  See TupleChromosome.crossover_uniform.
+        
+        Bias: distributional
+        
+        @param other: another VectorChromosome instance
+        '''
+        mask = numpy_random().random_sample(self.size) < 0.5
+        child1 = numpy.where(mask, self.alleles, other.alleles)
+        child2 = numpy.where(mask, other.alleles, self.alleles)
+        return type(self)(child1, invariant=True), type(self)(child2, invariant=True)
+    
+    
+    def _mutation_mask(self):
+        '''
+        Internal method: returns a boolean array of the genes to mutate.  Each
+        gene is chosen with probability self.rate, and at least one gene is 
+        always chosen.
+        '''
+        rate = self.rate
+        if rate is None:
+            rate = 1.0 / self.size
+            
+        mask = numpy_random().random_sample(self.size) < rate
+        if not mask.any():
+            mask[random.randrange(self.size)] = True
+        return mask
+    
+    
+    
+class IntegerVectorChromosome(VectorChromosome):
+    '''
+    This chromosome represents a vector of integer-valued alleles with 
+    optional bounds for each gene.
+    
+    Class/Instance Level Variables:
+        - lower_bound: lowest value of each gene, a number or a 
+          sequence with one value per gene (default = None: unbounded)
+        - upper_bound: highest value of each gene, a number or a 
+          sequence with one value per gene (default = None: unbounded)
+          
+        - creep_lower: lower bound for creep variance (default = -1)
+        - creep_upper: upper bound for creep variance (default =  1)
+        
+        - rate: probability of mutating each gene (default = 1 / size)
+    
+    Variation Invariants:
+        - new vectors are the same size as their parents
+        - all genes are within their lower and upper bounds
+    
+    Mutation Methods:
+        - mutate_creep()
+        - mutate_reset()
+        
+    Recombination Methods:
+        - crossover_one_point(other)
+        - crossover_two_point(other)
+        - crossover_uniform(other)
+    '''
+    dtype = numpy.int64
+    
+    lower_bound = None
+    upper_bound = None
+    creep_lower = -1
+    creep_upper =  1
+    
+    
+    def __init__(self, alleles, invariant=False, *args, **kwargs):
+        '''
+        Initializes the vector based on a sequence passed in.  Raises a 
+        ValueError if any allele is outside of its bounds.
+        
+        @param alleles: a sequence or array of integers
+        @param invariant=False: used by the variation operators to skip
+              bounds checking, since they guarantee it.  Not intended for
+              use by external code!
+        '''
+        super(IntegerVectorChromosome, self).__init__(alleles, invariant)
+        
+        if self.creep_lower > self.creep_upper:
+            raise ValueError('creep_lower (%s) > creep_upper (%s)' % \
+                (self.creep_lower, self.creep_upper))
+        
+        if not invariant:
+            if self.lower_bound is not None and \
+                (self.alleles < self.lower_bound).any():
+                raise ValueError('%s is below lower_bound %s' % \
+                    (self.alleles, self.lower_bound))
+                
+            if self.upper_bound is not None and \
+                (self.alleles > self.upper_bound).any():
+                raise ValueError('%s is above upper_bound %s' % \
+                    (self.alleles, self.upper_bound))
+            
+            
+    def mutate_creep(self):
+        '''
+        Creates a new integer vector by adding a creep value randomly chosen
+        from the creep bounds to each mutated gene.  Genes are then clipped
+        to their lower and upper bounds.
+        '''
+        mask  = self._mutation_mask()
+        creep = numpy_random().randint(self.creep_lower, self.creep_upper + 1, 
+            self.size)
+        new_alleles = self.alleles + creep * mask
+        
+        if self.lower_bound is not None or self.upper_bound is not None:
+            numpy.clip(new_alleles, self.lower_bound, self.upper_bound, 
+                out=new_alleles)
+            
+        return type(self)(new_alleles, invariant=True)
+    
+    
+    def mutate_reset(self):
+        '''
+        Creates a new integer vector with each mutated gene set to a random
+        value between its lower and upper bounds.  Requires both bounds.
+        '''
+        if self.lower_bound is None or self.upper_bound is None:
+            raise ValueError('mutate_reset requires lower_bound and upper_bound')
+        
+        # draw uniformly from [lower, upper] for each gene at once
+        mask  = self._mutation_mask()
+        span  = numpy.subtract(self.upper_bound, self.lower_bound) + 1
+        reset = numpy.add(self.lower_bound,
+            (numpy_random().random_sample(self.size) * span).astype(self.dtype))
+        return type(self)(numpy.where(mask, reset, self.alleles), invariant=True)
+    
+    
+    
+class CategoricalVectorChromosome(VectorChromosome):
+    '''
+    This chromosome represents a vector of categorical alleles.  Each gene 
+    has its own sequence of possible values.  The values are encoded once
+    per class as small integer codes, and alleles holds the codes.  Values
+    are only looked up when decode() is called.
+    
+    Class/Instance Level Variables:
+        - values: a sequence containing one sequence of possible values 
+          for each gene, e.g. (('a', 'b'), ('x', 'y', 'z'))
+        
+        - rate: probability of mutating each gene (default = 1 / size)
+    
+    Variation Invariants:
+        - new vectors are the same size as their parents
+        - each gene is a valid code for that gene's values
+    
+    Mutation Methods:
+        - mutate_reset()
+        
+    Recombination Methods:
+        - crossover_one_point(other)
+        - crossover_two_point(other)
+        - crossover_uniform(other)
+    '''
+    values = ()
+    
+    
+    def __init__(self, alleles, invariant=False, *args, **kwargs):
+        '''
+        Initializes the vector from a sequence of integer codes.  Raises a 
+        ValueError if a code is not valid for its gene.  Use from_values to
+        create a chromosome from values instead of codes.
+        
+        @param alleles: a sequence or array of codes
+        @param invariant=False: used by the variation operators to skip
+              code checking, since they guarantee it.  Not intended for
+              use by external code!
+        '''
+        super(CategoricalVectorChromosome, self).__init__(alleles, invariant)
+        
+        if not invariant:
+            cardinality = self._categories()['cardinality']
+            if self.size != len(cardinality):
+                raise ValueError('%s genes expected, got %s' % \
+                    (len(cardinality), self.size))
+            if (self.alleles < 0).any() or (self.alleles >= cardinality).any():
+                raise ValueError('%s are not accepted codes' % self.alleles)
+        
+    
+    @property
+    def dtype(self):
+        '''
+        The smallest integer type that can hold a code for every gene
+        '''
+        return self._categories()['dtype']
+    
+    
+    @classmethod
+    def from_values(cls, values):
+        '''
+        Creates a new chromosome by encoding a sequence of values.  Raises a
+        ValueError if a value is not in the values for its gene.
+        
+        @param values: a sequence of values, one per gene
+        '''
+        codes = cls._categories()['codes']
+        if len(values) != len(codes):
+            raise ValueError('%s genes expected, got %s' % \
+                (len(codes), len(values)))
+        try:
+            return cls([table[value] for table, value in zip(codes, values)],
+                invariant=True)
+        except KeyError, e:
+            raise ValueError('%s is not an accepted allele value' % e)
+    
+    
+    @cached('_decoded_values')
+    def decode(self):
+        '''
+        Returns a tuple of the values that the codes in alleles stand for
+        '''
+        values = self._categories()['values']
+        return tuple([table[code] for table, code in 
+                      zip(values, self.alleles.tolist())])
+        
+    
+    def mutate_reset(self):
+        '''
+        Creates a new vector with each mutated gene set to a random code
+        '''
+        cardinality = self._categories()['cardinality']
+        mask  = self._mutation_mask()
+        reset = (numpy_random().random_sample(self.size) * cardinality).astype(
+            self.dtype)
+        return type(self)(numpy.where(mask, reset, self.alleles), invariant=True)
+    
+    
+    @classmethod
+    def _categories(cls):
+        '''
+        Internal method: returns the encoding tables for cls.values.  These
+        are built the first time they are needed and stored on the class.
+        Structure:
+            {'values': (values for each gene), 'codes': [{value: code}, ...],
+             'cardinality': array of value counts, 'dtype': code type}
+        '''
+        try:
+            return cls.__dict__['_categories_table']
+        
+        except KeyError:
+            values = tuple([tuple(gene) for gene in cls.values])
+            codes  = [dict([(value, code) for code, value in enumerate(gene)])
+                      for gene in values]
+            
+            for gene, table in zip(values, codes):
+                if not gene:
+                    raise ValueError('each gene must have at least one value')
+                if len(gene) != len(table):
+                    raise ValueError('values must be unique: %s' % (gene,))
+            
+            largest = max([len(gene) for gene in values] or [1])
+            for dtype in (numpy.uint8, numpy.uint16, numpy.int32):
+                if largest <= numpy.iinfo(dtype).max + 1:
+                    break
+                
+            table = {'values': values, 'codes': codes, 'dtype': dtype,
+                     'cardinality': numpy.array([len(gene) for gene in values])}
+            setattr(cls, '_categories_table', table)
+            return table
@@ -18,8 +18,12 @@
 #
 # $Revision: 1.11 $
 
+from genetics.challenge import Challenge
 from genetics.chromosome import Chromosome
-from genetics.util.decorators import comparable, memoize, synchronized, virtual
+from genetics.util.cache import memo_cache
+from genetics.util.decorators import (cached, comparable, memoize, 
+    synchronized, virtual)
+import random, weakref
 
 
 class Organism(object):
@@ -28,14 +32,70 @@ class Organism(object):
         genotype = {name: chromosome, ...}
     and a mapping from challenges to phenotype decoder functions 
         phenotypes = {challenge class: function, ...}
-    based on those genotypes.
+    based on those genotypes.  Decoders that are faster on a whole list of 
+    organisms at once can be given as well (see decode_batch):
+        batch_phenotypes = {challenge class: function(organisms), ...}
+    and so can decoders that update the phenotype of a parent for the move 
+    that mutated it into the organism:
+        delta_phenotypes = {challenge class: function(self, parent_phenotype, move), ...}
+    
+    When mutate() changes a single chromosome and the chromosome records its
+    move, such as ('swap', i, j) for a tuple chromosome, the child's move is
+    the name of the chromosome followed by that move, ('route', 'swap', i, j).
+    decode uses the delta decoder instead of the full one if the child has a
+    move and its parent is still around and already decoded for the 
+    challenge.
     
     Note that an organism should be immutable.  New organisms are created by 
     mutation and recombination.  This means that the phenotype for an organism
     should not change as long as the environment remains the same.
+    
+    Mutation and crossover vary each chromosome with a probability set by
+        mutation_rates  = {name: probability, ...}
+        crossover_rates = {name: probability, ...}
+    Chromosomes without a rate are always varied.  Chromosomes that are not
+    varied are shared with the parent instead of being copied, so decoders
+    can cache work that depends on only one chromosome on that chromosome
+    (see genetics.util.decorators.chromosome_cached).
+    
+    If lineage is set to a genetics.util.lineage.LineageRecorder, the parents
+    of each organism created by mutate() and crossover() are recorded in it.
+    
+    If pure_phenotypes is set, phenotypes are shared between organisms with
+    the same genome (see genome_key), so a child that repeats an earlier 
+    genome is not decoded again.  Only set it if every decoder is a pure
+    function of the genotype: a decoder that is skipped cannot set anything
+    on the organism, and state outside of the chromosomes is not part of 
+    the genome key.  Phenotypes are kept in the genome_cache of the 
+    population the organism lives in (see Population.genome_cache_size), or
+    else in the genome_cache of the class, which can be set to a 
+    genetics.util.cache.GenomeCache.  Challenges can also share phenotypes
+    between different genomes (see Challenge.canonical).
+    
+    Each organism is stamped with the generation of its population that it
+    was born into (see join).  Populations advance their own generation once
+    per cycle, so the age of an organism is computed from its stamp instead
+    of being incremented.  An organism outside of a population stays in
+    generation 1.
     '''    
     genotype   = {}
     phenotypes = {}
+    lineage    = None
+    
+    batch_phenotypes = {} # decoders of lists of organisms, by challenge
+    delta_phenotypes = {} # decoders from the parent's phenotype, by challenge
+    
+    move    = None # (chromosome name,) + the move that mutated the parent
+    _parent = None # weak reference to the parent of a move
+    
+    born        = 1    # the generation of its population it was born into
+    _population = None # weak reference to the population it lives in
+    
+    pure_phenotypes = False # do phenotypes depend only on the genome?
+    genome_cache    = None  # phenotypes by (challenge, genome key)
+    
+    mutation_rates  = {}
+    crossover_rates = {}
 
     # Keep track of the ID for each organism instance
     id = 0
@@ -91,9 +151,45 @@ class Organism(object):
         
         # set the id of this organism for its class.  organisms are 1-indexed
         self.id = self.__next_id__()
-
-        # store the age of the organism
-        self.age = 1
+        
+        
+    @property
+    def age(self):
+        '''
+        The number of generations the organism has been alive, starting at 1
+        '''
+        return self._generation() - self.born + 1
+    
+    
+    @age.setter
+    def age(self, age):
+        '''
+        Sets the age of the organism by moving its birth generation
+        '''
+        self.born = self._generation() - age + 1
+        
+        
+    def join(self, population):
+        '''
+        Moves the organism into a population, keeping its age.  The age of
+        an organism then follows the generation of that population.
+        
+        @param population: a Population instance
+        '''
+        age = self.age
+        self._population = weakref.ref(population)
+        self.age = age
+        
+        
+    def _generation(self):
+        '''
+        Internal method: returns the current generation of the population of
+        the organism, or 1 if it is not in a population
+        '''
+        population = self._population and self._population()
+        if population is None:
+            return 1
+        return population.generation
 
 
     @virtual
@@ -113,7 +209,18 @@ class Organism(object):
         return '%s: %s' % (type(self), self.id)
         
     
-    @memoize('_decoded_phenotypes')
+    @cached('_genome_key')
+    def genome_key(self):
+        '''
+        Returns a hashable value that is equal for organisms of the same type
+        with the same alleles in each chromosome, for recognizing repeated 
+        genomes.  Requires content_key() on every chromosome.
+        '''
+        return (type(self),) + tuple([self.__dict__[name].content_key() 
+                                      for name in sorted(self.genotype)])
+    
+    
+    @memoize('_decoded_phenotypes', weak=True)
     def decode(self, challenge, *args, **kwargs):
         '''
         Decodes the organisms genotype into a phenotype for a given problem.  
@@ -122,14 +229,11 @@ class Organism(object):
         problem.
         
         Decoders for an organism can be specified by either Challenge instances 
-        or classes, but are cached by instance.
+        or classes, but are cached by instance.  The cache holds challenges by
+        weak reference, so phenotypes go away with their challenges.
         
         @param challenge: the challenge instance to decode against
         '''
-        # see if the phenotype for this problem has already been decoded
-        if challenge in self._decoded_phenotypes:
-            return self._decoded_phenotypes[challenge]
-
         # do we have a method for decoding this phenotype?
         challenge_class, decoder = type(challenge), None
         
@@ -141,23 +245,194 @@ class Organism(object):
             raise NotImplementedError('%s has no decoder for %s' % \
                 (type(self), challenge))
         
-        # cache the decoded phenotype
-        phenotype = decoder(self, *args, **kwargs)
-        self._decoded_phenotypes[challenge] = phenotype
+        # look for an organism with the same genome or canonical key
+        shared = self._shared_caches(challenge)
+        found  = shared and self._find_shared(shared)
+        if found:
+            return found[0]
+        
+        # memoize caches the decoded phenotype on this organism
+        found = self.move is not None and self._delta(challenge)
+        if found:
+            phenotype = found[0]
+        else:
+            phenotype = decoder(self, *args, **kwargs)
+        for cache, key in shared:
+            cache[key] = phenotype
         return phenotype
     
+    
+    @classmethod
+    def batch_decoder(cls, challenge):
+        '''
+        Returns the function that decodes lists of organisms of this type for
+        a challenge, or None if there is none
+        
+        @param challenge: the challenge instance to decode against
+        '''
+        if challenge in cls.batch_phenotypes:
+            return cls.batch_phenotypes[challenge]
+        return cls.batch_phenotypes.get(type(challenge))
+    
+    
+    @classmethod
+    def decode_batch(cls, challenge, organisms):
+        '''
+        Decodes a list of organisms of this type and returns their phenotypes
+        in the same order.  Organisms that have been decoded before, or whose
+        phenotypes are found in the shared caches (see decode), are left out
+        and the rest are passed to the batch decoder for the challenge in one
+        call.  The batch decoder returns a list of phenotypes in the order of
+        the organisms it was given.  Without a batch decoder, each organism 
+        is decoded on its own.
+        
+        @param challenge: the challenge instance to decode against
+        @param organisms: a list of organisms of this type
+        '''
+        decoder = cls.batch_decoder(challenge)
+        if decoder is not None:
+            pending, caches = [], []
+            for organism in organisms:
+                decoded = organism.__dict__.get('_decoded_phenotypes')
+                if decoded is not None and challenge in decoded:
+                    continue
+                
+                shared = organism._shared_caches(challenge)
+                found  = organism._find_shared(shared) or organism._delta(challenge)
+                if found is not None:
+                    organism._remember(challenge, found[0])
+                else:
+                    pending.append(organism)
+                    caches.append(shared)
+            
+            if pending:
+                for organism, shared, phenotype in \
+                    zip(pending, caches, decoder(pending)):
+                    for cache, key in shared:
+                        cache[key] = phenotype
+                    organism._remember(challenge, phenotype)
+        
+        return [organism.decode(challenge) for organism in organisms]
+    
+    
+    def _shared_caches(self, challenge):
+        '''
+        Internal method: returns a list of (cache, key) for each cache that
+        shares phenotypes between organisms for a challenge
+        
+        @param challenge: the challenge instance to decode against
+        '''
+        shared = []
+        if self.pure_phenotypes:
+            population   = self._population and self._population()
+            genome_cache = getattr(population, 'genome_cache', None)
+            if genome_cache is None:
+                genome_cache = self.genome_cache
+            if genome_cache is not None:
+                shared.append((genome_cache, (challenge, self.genome_key())))
+        
+        # decoders may be keyed by challenge classes, which have no keys
+        if isinstance(challenge, Challenge) and \
+            type(challenge).canonical.im_func is not Challenge.canonical.im_func:
+            canonical = challenge.canonical(self)
+            if canonical is not None:
+                shared.append((challenge.canonical_phenotypes(), canonical))
+        
+        if challenge.shared_phenotypes is not None:
+            shared.append((challenge.shared_phenotypes, self.genome_key()))
+        
+        if challenge.phenotype_store is not None:
+            shared.append((challenge.phenotype_store, self.genome_key()))
+        
+        return shared
+    
+    
+    def _find_shared(self, shared):
+        '''
+        Internal method: returns a tuple with the phenotype from the first
+        shared cache that has it, or None.  The phenotype is copied into the
+        caches before that one.
+        
+        @param shared: list of (cache, key) from _shared_caches
+        '''
+        for i, (cache, key) in enumerate(shared):
+            try:
+                phenotype = cache[key]
+            
+            except KeyError:
+                continue
+            
+            for cache, key in shared[:i]:
+                cache[key] = phenotype
+            return (phenotype,)
+        
+        return None
+    
+    
+    def _delta(self, challenge):
+        '''
+        Internal method: returns a tuple with the phenotype computed from the
+        parent's by the move that made this organism, or None if there is no
+        move, no delta decoder for the challenge, or no decoded parent
+        
+        @param challenge: the challenge instance to decode against
+        '''
+        if self.move is None:
+            return None
+        
+        if challenge in self.delta_phenotypes:
+            delta = self.delta_phenotypes[challenge]
+        else:
+            delta = self.delta_phenotypes.get(type(challenge))
+        
+        parent = self._parent()
+        if delta is None or parent is None:
+            return None
+        
+        decoded = parent.__dict__.get('_decoded_phenotypes')
+        if decoded is None or challenge not in decoded:
+            return None
+        return (delta(self, decoded.get(challenge), self.move),)
+    
+    
+    def _remember(self, challenge, phenotype):
+        '''
+        Internal method: stores a phenotype in the cache used by decode
+        
+        @param challenge: the challenge instance the phenotype is for
+        @param phenotype: the decoded phenotype
+        '''
+        if '_decoded_phenotypes' not in self.__dict__:
+            self.__dict__['_decoded_phenotypes'] = memo_cache('_decoded_phenotypes', 
+                                                              weak=True)
+        self.__dict__['_decoded_phenotypes'][challenge] = phenotype
+    
 
     def mutate(self):
         '''
         Returns a mutation of the current organism by calling mutate() on each 
-        chromosome.  If a class that inherits from Organism changes the 
-        signature of __init__, then it will also need to override mutate.
+        chromosome chosen by mutation_rates.  The child shares the other 
+        chromosomes with its parent.  If a class that inherits from Organism 
+        changes the signature of __init__, then it will also need to override 
+        mutate.
         '''
         new_genotype = {}
         for name in self.genotype:
+            new_genotype[name] = self.__dict__[name]
+        varied = self._varied(self.mutation_rates)
+        for name in varied:
             new_genotype[name] = self.__dict__[name].mutate()
             
-        return type(self)(genotype=new_genotype)
+        child = type(self)(genotype=new_genotype)
+        if len(varied) == 1:
+            name = varied[0]
+            if new_genotype[name].move is not None and \
+                new_genotype[name] is not self.__dict__[name]:
+                child.move    = (name,) + new_genotype[name].move
+                child._parent = weakref.ref(self)
+        if self.lineage is not None:
+            self.lineage.record(child, (self,), self.lineage.MUTATION)
+        return child
 
     
     @comparable
@@ -165,16 +440,41 @@ class Organism(object):
         '''
         Returns a tuple containing two children that are recombined from their
         parents.  These children are not the same as their parents and each 
-        chromosome is subjected to a crossover.
+        chromosome chosen by crossover_rates is subjected to a crossover.
         
         @param other: a second parent
         '''
         child1, child2 = {}, {}
         
-        # for now child 1 will take the first chromosomes and 
-        # child 2 will take the second
+        # child 1 shares the chromosomes of the first parent that are not
+        # recombined and child 2 shares those of the second
         for name in self.genotype:
+            child1[name], child2[name] = self.__dict__[name], other.__dict__[name]
+        for name in self._varied(self.crossover_rates):
             child1[name], child2[name] = self.__dict__[name].crossover(
                other.__dict__[name])
 
-        return type(self)(genotype=child1), type(self)(genotype=child2)    
\ No newline at end of file
+        children = type(self)(genotype=child1), type(self)(genotype=child2)
+        if self.lineage is not None:
+            for child in children:
+                self.lineage.record(child, (self, other), self.lineage.CROSSOVER)
+        return children    
+    
+    
+    def _varied(self, rates):
+        '''
+        Internal method: returns a list of the names of the chromosomes to 
+        vary.  Each chromosome is chosen with the probability in rates, or 
+        always if it has none.  If no chromosome is chosen, one is chosen at 
+        random so that children differ from their parents.
+        
+        @param rates: {name: probability, ...}
+        '''
+        if not rates:
+            return self.genotype.keys()
+        
+        names = [name for name in self.genotype 
+                 if random.random() < rates.get(name, 1.0)]
+        if not names and self.genotype:
+            names = [random.choice(self.genotype.keys())]
+        return names
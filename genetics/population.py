@@ -19,8 +19,11 @@
 # $Revision: 1.3 $
 
 from genetics.selectors.fitness import FitnessSelector
+from genetics.util.cache import Cache, GenomeCache
 from genetics.util.decorators import synchronized
-import random, sys
+from genetics.util.mating import MatingPlan
+from genetics.util.structures import FitnessIndex, HallOfFame
+import heapq, random, sys
 
 
 class Population(object):
@@ -39,9 +42,54 @@ class Population(object):
         
         # Only required for crossover with mutation variance (default)
         mutation = 0.5 # Mutation rate
+        
+        # Optional: keep the organisms ordered by fitness for a challenge
+        ranked_by = challenge
+        
+        # Optional: remember the 10 best distinct organisms ever seen
+        archived_by  = challenge
+        archive_size = 10
+        elites       = 2 # archived organisms to put back among survivors
+        
+        # Optional: share phenotypes between organisms with the same genome
+        genome_cache_size = 10000
+
+    If ranked_by is set, population.index is a FitnessIndex of the organisms
+    that is updated with each generation's children and dropped organisms.
+    best() reads from it instead of sorting, and a survivor selector that is
+    a FitnessSelector (not a subclass) for the same challenge just truncates
+    it.  Other survivor selectors select as usual, and the organisms they
+    drop are removed from the index.
+    
+    If archived_by is set, population.archive is a HallOfFame of every 
+    organism the population has had, so survivor selectors cannot lose the
+    best of them.  Each generation, up to elites of the best archived 
+    organisms that are missing from the survivors replace the least fit 
+    survivors, and solve() returns the best archived organism.
+    
+    If genome_cache_size is set, population.genome_cache is a GenomeCache 
+    of that many phenotypes for each challenge, keyed by genome, which its
+    organisms share (see Organism.pure_phenotypes).  The organism class 
+    must set pure_phenotypes, or a ValueError is raised.  Its hit rate is 
+    population.genome_cache.statistics.hit_rate().
+    
+    The challenges of the selectors, ranked_by and archived_by that have a
+    phenotype_store load the stored phenotypes of each generation at once.
+    The index and the archive rate each generation's children at once (see 
+    Challenge.fitness_batch).
 
     population.sort() sorts the organism list.  This is a link to the
     sort method, so it accepts the normal arguments.
+    
+    population.generation counts the cycles of the population, starting at
+    1, and is the clock organisms age by: the initial organisms and each 
+    generation's children join the population (see Organism.join), so 
+    children are stamped with the generation they are born into.  Each 
+    population keeps its own clock, and population.age reads the same one.
+    
+    If the organism class has a lineage recorder, the initial organisms are
+    recorded in it and each child is stamped with the generation it joins,
+    by the same clock.
     '''
     size     =   0 # population size (assumed constant)
     mutation = 0.0 # mutation rate
@@ -49,6 +97,11 @@ class Population(object):
     mating_pool_selector = None # Selector instance for the mating pool
     mating_pool_size     =    0 # size of the mating pool
     survivor_selector    = None # Selector instance for the next generation
+    ranked_by            = None # Challenge instance to index organisms by
+    archived_by          = None # Challenge instance to archive organisms by
+    archive_size         =    0 # number of organisms in the archive
+    elites               =    0 # archived organisms put back each generation
+    genome_cache_size    =    0 # phenotypes to share between equal genomes
     
    
     def __init__(self, type, organisms=None):
@@ -70,6 +123,13 @@ class Population(object):
         if not self.survivor_selector:
             raise ValueError('a survivor_selector is required')
         
+        self.genome_cache = None
+        if self.genome_cache_size > 0:
+            if not type.pure_phenotypes:
+                raise ValueError('genome_cache_size requires %s to have '
+                                 'pure_phenotypes' % type)
+            self.genome_cache = GenomeCache('genome_cache', self.genome_cache_size)
+        
         # a population generates its first generation on instantiation
         if organisms:
             if len(organisms) != self.size:
@@ -78,7 +138,27 @@ class Population(object):
             organisms = [type() for i in xrange(self.size)] #@UnusedVariable
         
         self.organisms = organisms
-        self.age       = 1
+        self.type      = type
+        self.generation = 1
+        self.index      = None
+        self.archive    = None
+        
+        for organism in organisms:
+            organism.join(self)
+        self._prefetch(organisms)
+        
+        if self.ranked_by is not None:
+            self.index = FitnessIndex(self.ranked_by.fitness)
+            self.index.extend(organisms, self.ranked_by.fitness_batch(organisms))
+        
+        if self.archived_by is not None:
+            self.archive = HallOfFame(self.archived_by.fitness, self.archive_size)
+            self.archive.extend(organisms, self.archived_by.fitness_batch(organisms))
+        
+        if type.lineage is not None:
+            type.lineage.generation = self.generation
+            for organism in organisms:
+                type.lineage.record(organism)
         
         # sorting a population means sorting its list or organisms
         self.sort = self.organisms.sort
@@ -110,13 +190,23 @@ class Population(object):
         return (organism for organism in self.organisms)
     
     
-    _fitness_selectors = {}
+    @property
+    def age(self):
+        '''
+        The number of generations of the population, starting at 1.  This 
+        is the same clock as generation.
+        '''
+        return self.generation
+    
+    
+    # selectors refer to their challenges, so this is bounded instead of weak
+    _fitness_selectors = Cache('fitness_selectors', size=16)
     def best(self, challenge, n=1, organisms=None):
         '''
         Returns either the most fit item for a given challenge or a list of the 
         most fit n items (set by the variable n).  Internally this sorts the 
-        list of organisms.  Raises an IndexError if there are not enough 
-        organisms to select from.
+        list of organisms, unless the population is ranked_by the challenge.
+        Raises an IndexError if there are not enough organisms to select from.
         
         The challenge argument must be an instance of Challenge.
          
@@ -130,9 +220,19 @@ class Population(object):
         if not organisms:
             organisms = self.organisms
         
-        if challenge not in self._fitness_selectors:
-            self._fitness_selectors[challenge] = FitnessSelector(challenge)
-        top = self._fitness_selectors[challenge].select(n, organisms)
+        if organisms is self.organisms and self.index is not None \
+            and challenge is self.ranked_by:
+            # the index is already in order
+            top = self.index.best(n)
+            if len(top) < n:
+                raise IndexError('not enough organisms to select from')
+        
+        else:
+            selector = self._fitness_selectors.get(challenge)
+            if selector is None:
+                selector = FitnessSelector(challenge)
+                self._fitness_selectors[challenge] = selector
+            top = selector.select(n, organisms)
         
         if n == 1:
             return top[0]
@@ -162,16 +262,48 @@ class Population(object):
         children to the population, and removes the least fit members.  
         Population size is kept constant.
         '''
-        # increment the age of each organism
-        for org in self.organisms: #@UnusedVariable - TODO: file bug in PyDev
-            org.age += 1            
+        # age every organism at once by advancing the generation
+        self.generation += 1
+        
+        # children are born into the next generation
+        if self.type.lineage is not None:
+            self.type.lineage.generation = self.generation
         
+        parents = len(self.organisms)
         self.vary()
+        children = self.organisms[parents:]
+        for child in children:
+            child.join(self)
+        self._prefetch(children)
+        
+        if self.archive is not None:
+            self.archive.extend(children, self.archived_by.fitness_batch(children))
+        
+        if self.index is None:
+            # select the next generation
+            self.organisms = self.survivor_selector.select(
+               self.size, population=self.organisms)
+            
+        else:
+            self.index.extend(children, self.ranked_by.fitness_batch(children))
+            
+            # subclasses such as SharingSelector rank by other keys
+            if type(self.survivor_selector) is FitnessSelector and \
+                self.survivor_selector.challenge is self.ranked_by:
+                # truncation selection on the index does not need a sort
+                self.index.truncate(self.size)
+                self.organisms = self.index.best(self.size)
+                
+            else:
+                # select the next generation, which may repeat organisms, and
+                # drop the others from the index
+                self.organisms = self.survivor_selector.select(
+                   self.size, population=self.organisms)
+                self.index.retain(self.organisms)
+        
+        if self.archive is not None and self.elites > 0:
+            self._reinject()
         
-        # select the next generation
-        self.organisms = self.survivor_selector.select(
-           self.size, population=self.organisms)
-        self.age += 1
         
         
     @synchronized
@@ -187,11 +319,13 @@ class Population(object):
         @param iterations: maximum number of iterations to try
         '''
         best = None
-        self.age = 1
         for i in xrange(iterations - 1): #@UnusedVariable
-            best = self.best(challenge)
+            if self.archive and challenge is self.archived_by:
+                best = self.archive.best(1)[0]
+            else:
+                best = self.best(challenge)
             
-            #print '>>> population age:', self.age, "\tid:", best.id, \
+            #print '>>> population generation:', self.generation, "\tid:", best.id, \
             #    "\tdecoded:", best.decode(challenge)
             
             if challenge.solved(best):
@@ -202,6 +336,51 @@ class Population(object):
         return best
 
 
+    def _prefetch(self, organisms):
+        '''
+        Internal method: loads the stored phenotypes of new organisms for
+        every challenge of the population that has a phenotype store
+        
+        @param organisms: the new organisms
+        '''
+        challenges = [self.ranked_by, self.archived_by,
+                      getattr(self.mating_pool_selector, 'challenge', None),
+                      getattr(self.survivor_selector, 'challenge', None)]
+        stores = []
+        for challenge in challenges:
+            store = getattr(challenge, 'phenotype_store', None)
+            if store is not None and store not in stores:
+                stores.append(store)
+        
+        for store in stores:
+            store.prefetch(organisms)
+
+
+    def _reinject(self):
+        '''
+        Internal method: replaces the least fit survivors with the best 
+        archived organisms whose genomes are missing from the population, as
+        long as the archived organisms are more fit.
+        '''
+        present = set([org.genome_key() for org in self.organisms])
+        missing = [org for org in self.archive.best(self.elites) 
+                   if org.genome_key() not in present]
+        if not missing:
+            return
+        
+        fitness = self.archived_by.fitness
+        worst = heapq.nsmallest(len(missing), xrange(len(self.organisms)), 
+                                key=lambda i: fitness(self.organisms[i]))
+        for i, elite in zip(worst, missing):
+            if fitness(elite) <= fitness(self.organisms[i]):
+                break
+            
+            if self.index is not None:
+                self.index.remove(self.organisms[i])
+                self.index.add(elite)
+            self.organisms[i] = elite
+
+
     def vary(self):
         '''
         Default variation operator: uses crossover on pairs of parents
@@ -220,25 +399,12 @@ class Population(object):
            self.mating_pool_size, population=self.organisms)
         
         # randomly mate from the parents and add children to the population
-        while parents:
-            # get a first parent
-            parent1_index = random.randrange(len(parents))
-            
-            parent1       = parents[parent1_index]
-            del parents[parent1_index]
-            
-            if parents:
-                # get a second parent
-                parent2_index = random.randrange(len(parents))
-                parent2       = parents[parent2_index]
-                del parents[parent2_index]
-                
-                for child in parent1.crossover(parent2):
-                    # figure out if we need to mutate the offspring
-                    if random.random() < self.mutation:
-                        self.organisms.append(child.mutate())
-                    else:
-                        self.organisms.append(child)    
+        for parent1, parent2, mutations in MatingPlan(parents, self.mutation):
+            for child, mutate in zip(parent1.crossover(parent2), mutations):
+                if mutate:
+                    self.organisms.append(child.mutate())
+                else:
+                    self.organisms.append(child)    
 
     
     def vary_mutate(self):
@@ -263,17 +429,5 @@ class Population(object):
            self.mating_pool_size, population=self.organisms)
         
         # randomly mate from the parents and add children to the population
-        while parents:
-            # get a first parent
-            parent1_index = random.randrange(len(parents))
-            
-            parent1       = parents[parent1_index]
-            del parents[parent1_index]
-            
-            if parents:
-                # get a second parent
-                parent2_index = random.randrange(len(parents))
-                parent2       = parents[parent2_index]
-                del parents[parent2_index]
-                
-                self.organisms.extend(parent1.crossover(parent2))
\ No newline at end of file
+        for parent1, parent2, mutations in MatingPlan(parents): #@UnusedVariable
+            self.organisms.extend(parent1.crossover(parent2))
\ No newline at end of file
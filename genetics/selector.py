@@ -45,9 +45,36 @@ class Selector(object):
         pass
          
     
+    def fitness_keys(self, population):
+        '''
+        Returns a list of the fitness of each organism, in the same order as 
+        the population.  Selectors should sort and compare these keys instead
+        of calling challenge.fitness inside comparisons.  The whole population
+        is rated at once (see Challenge.fitness_batch).
+        
+        @param population: a Population instance or a list of organisms
+        '''
+        return self.challenge.fitness_batch(list(population))
+    
+    
+    def rank(self, population):
+        '''
+        Returns a list of the organisms in the population sorted by 
+        descending fitness.  Fitness is computed once per organism.
+        
+        @param population: a Population instance or a list of organisms
+        '''
+        organisms = list(population)
+        keys  = self.fitness_keys(organisms)
+        order = sorted(xrange(len(organisms)), key=keys.__getitem__, reverse=True)
+        return [organisms[i] for i in order]
+         
+    
     def cmp_fitness(self, x, y):
         '''
-        Compares two organisms by descending fitness
+        Compares two organisms by descending fitness.  Prefer fitness_keys or
+        rank for sorting, since this calls challenge.fitness twice per 
+        comparison.
         
         @param x: an organism
         @param y: an organism of the same type
@@ -28,6 +28,9 @@ Selection library:
     - genetics.selectors.sampled.ranking.ExponentialRankingSelector
     - genetics.selectors.age.AgeSelector
     - genetics.selectors.fitness.FitnessSelector
+    - genetics.selectors.niching.SharingSelector
+    - genetics.selectors.nsga.NSGASelector
     - genetics.selectors.randomized.RandomSelector
     - genetics.selectors.tournament.TournamentSelector    
+    - genetics.selectors.tournament.FitnessTournamentSelector
 '''
\ No newline at end of file
@@ -27,13 +27,28 @@ class AgeSelector(Selector):
     '''
     def select(self, n, population):
         '''
-        Selects the n youngest organisms from self.population.
+        Selects the n youngest organisms from self.population.  Organisms
+        are put in buckets by age, and the buckets are emptied from the 
+        youngest back until n organisms are found.  Organisms of the same 
+        age keep their order in the population.
         
         @param n: number of organisms to select
         @param population: a Population instance or a list of organisms
         '''
-        def cmp_age(x, y):
-            return cmp(x.age, y.age)
+        if n < 1 or not len(population):
+            return []
         
-        population.sort(cmp=cmp_age)
-        return population[:n]
\ No newline at end of file
+        ages     = [organism.age for organism in population]
+        youngest = min(ages)
+        buckets  = {}
+        for organism, age in zip(population, ages):
+            buckets.setdefault(age - youngest, []).append(organism)
+        
+        selected, remaining, offset = [], len(population), 0
+        while len(selected) < n and remaining:
+            bucket = buckets.pop(offset, [])
+            selected.extend(bucket)
+            remaining -= len(bucket)
+            offset += 1
+        
+        return selected[:n]
\ No newline at end of file
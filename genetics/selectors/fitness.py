@@ -19,6 +19,7 @@
 # $Revision: 1.4 $
 
 from genetics.selector import Selector
+import heapq
 
 
 class FitnessSelector(Selector):
@@ -27,10 +28,14 @@ class FitnessSelector(Selector):
     '''
     def select(self, n, population):
         '''
-        Selects the n most fit organisms from the population
+        Selects the n most fit organisms from the population, ordered by 
+        descending fitness.  Fitness is computed once per organism and only
+        the top n are sorted.
         
         @param n: number of organisms to select
         @param population: a Population instance or a list of organisms
         '''
-        population.sort(cmp=self.cmp_fitness)
-        return population[:n]
\ No newline at end of file
+        organisms = list(population)
+        keys = self.fitness_keys(organisms)
+        top  = heapq.nlargest(n, xrange(len(organisms)), key=keys.__getitem__)
+        return [organisms[i] for i in top]
\ No newline at end of file
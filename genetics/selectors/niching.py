@@ -0,0 +1,110 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.selectors.fitness import FitnessSelector
+import numpy, random
+
+
+class SharingSelector(FitnessSelector):
+    '''
+    Fitness Sharing Selector
+    Divides the fitness of each organism by the number of organisms in its
+    niche, so that crowded peaks of the fitness landscape are worth less and
+    the population spreads over several of them.  Fitness must not be
+    negative.
+
+    Organisms within the niche radius share with each other:
+        share(d) = 1 - (d / radius) ** alpha
+    The niche count of an organism is estimated from its distances to a
+    random sample of the population instead of to every organism, so the
+    cost is linear in the population size.  If no radius is given, it is
+    the distance within which a tenth of the sampled pairs fall.
+
+    Shared fitness is used in place of fitness everywhere the selector uses
+    fitness_keys, so the most fit n organisms by shared fitness are selected.
+    '''
+    def __init__(self, challenge, distance, radius=None, alpha=1.0, sample=32):
+        '''
+        Creates a new fitness sharing selector
+
+        @param challenge: the challenge instance for fitness evaluation
+        @param distance: a genetics.util.distance.Distance instance
+        @param radius: niche radius, or None to estimate it from the sample
+        @param alpha: shape of the sharing function
+        @param sample: number of organisms to estimate niche counts from
+        '''
+        self.distance = distance
+        self.radius   = radius
+        self.alpha    = alpha
+        self.sample   = sample
+        super(SharingSelector, self).__init__(challenge)
+
+
+    def fitness_keys(self, population):
+        '''
+        Returns a list of the shared fitness of each organism, in the same
+        order as the population.
+
+        @param population: a Population instance or a list of organisms
+        '''
+        organisms = list(population)
+        fitness   = super(SharingSelector, self).fitness_keys(organisms)
+        if not organisms:
+            return fitness
+        return (numpy.array(fitness, dtype=float) / self.niche_counts(organisms)).tolist()
+
+
+    def niche_counts(self, population):
+        '''
+        Returns an array with the estimated niche count of each organism:
+        1 for itself plus its share with the other organisms, scaled up from
+        the sample.
+
+        @param population: a Population instance or a list of organisms
+        '''
+        rows   = self.distance.rows(population)
+        size   = len(rows)
+        sample = random.sample(xrange(size), min(self.sample, size))
+
+        distances = numpy.asarray(self.distance.between(rows, rows[sample]), dtype=float)
+        radius    = self.radius or self.sampled_radius(distances)
+
+        share = numpy.maximum(1.0 - (distances / radius) ** self.alpha, 0.0)
+
+        # leave out each sampled organism's share with itself
+        share[sample, numpy.arange(len(sample))] = 0.0
+        others = numpy.empty(size)
+        others.fill(len(sample))
+        others[sample] -= 1
+
+        return 1.0 + share.sum(axis=1) * (size - 1.0) / numpy.maximum(others, 1)
+
+
+    def sampled_radius(self, distances):
+        '''
+        Returns the distance within which a tenth of the sampled pairs of
+        different organisms fall, or 1.0 if they are all the same.
+
+        @param distances: distances from the population to the sample
+        '''
+        distances = distances[distances > 0]
+        if not len(distances):
+            return 1.0
+        return numpy.percentile(distances, 10)
@@ -0,0 +1,95 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.selector import Selector
+from genetics.util.pareto import crowding_distance, non_dominated_sort
+from genetics.util.randomness import numpy_random
+import numpy
+
+
+class NSGASelector(Selector):
+    '''
+    NSGA-II Selector
+    Selects organisms by the Pareto front they are in on the objectives of a
+    MultiObjectiveChallenge, and prefers organisms in less crowded parts of
+    a front.
+
+    As a survivor selector, this keeps the best fronts and fills the rest of
+    the population from the least crowded organisms of the next front.  As a
+    mating pool selector, set a tournament size to pick parents by crowded
+    tournaments instead.
+    '''
+    def __init__(self, challenge, tournament=0):
+        '''
+        Creates a new NSGA-II selector
+
+        @param challenge: the MultiObjectiveChallenge instance for evaluation
+        @param tournament: the tournament size, or 0 for truncation
+        '''
+        self.tournament = tournament
+        super(NSGASelector, self).__init__(challenge)
+
+
+    def select(self, n, population):
+        '''
+        Selects n organisms from the population, either the first n in
+        crowded order or the winners of n tournaments.
+
+        @param n: number of organisms to select
+        @param population: a Population instance or a list of organisms
+        '''
+        if n < 1:
+            return []
+
+        order = self.crowded_order(population)
+        if self.tournament:
+            # the contestant that comes first in crowded order wins
+            position = numpy.empty(len(order), dtype=int)
+            position[order] = numpy.arange(len(order))
+            contestants = numpy_random().randint(0, len(order), (n, self.tournament))
+            order = order[position[contestants].min(axis=1)]
+
+        return [population[i] for i in order[:n].tolist()]
+
+
+    def objectives(self, population):
+        '''
+        Returns an (organisms x objectives) array of the objective values of
+        each organism, in the same order as the population, rated at once
+        (see MultiObjectiveChallenge.objectives_batch).
+
+        @param population: a Population instance or a list of organisms
+        '''
+        return numpy.array(self.challenge.objectives_batch(list(population)), 
+                           dtype=float)
+
+
+    def crowded_order(self, population):
+        '''
+        Returns an array of population indices sorted by front, and by
+        descending crowding distance within each front.  Ties keep the order
+        of the population.
+
+        @param population: a Population instance or a list of organisms
+        '''
+        objectives = self.objectives(population)
+        fronts     = non_dominated_sort(objectives)
+        distance   = crowding_distance(objectives, fronts)
+        return numpy.lexsort((-distance, fronts))
@@ -19,7 +19,7 @@
 # $Revision: 1.2 $
 
 from genetics.selectors.sampled.sampling import SamplingSelector
-from genetics.util.stats import FitnessStatistics
+import numpy
 
 
 class FitnessProportionalSelector(SamplingSelector):
@@ -43,22 +43,22 @@ class FitnessProportionalSelector(SamplingSelector):
         D.E. Goldberg.  "Genetic Algorithms in Search, Optimization, and 
         Machine Learning."
         
-        Returns a list of scaled fitness values:
+        Returns an array of scaled fitness values:
             [max(fitness - (mean - constant * standard deviation) / sum, 0), ...]
+        or an empty list if they cannot be scaled.
         
         The sigma constant (self.pressure) is set to 2.0 by default.
         
         @param population: a Population instance or a list of organisms                
         '''
-        stats  = FitnessStatistics(population, self.challenge)
-        mean   = stats.mean()
-        dev    = stats.stddev()
-        scaled = [max(0.0, self.challenge.fitness(org) - (mean - self.pressure * dev)) \
-                  for org in population]
-        total  = sum(scaled)
+        fitness = numpy.array(self.fitness_keys(population), dtype=float)
+        if not len(fitness):
+            return []
         
-        try:
-            return [fitness / total for fitness in scaled]
+        base   = fitness.mean() - self.pressure * fitness.std()
+        scaled = numpy.maximum(fitness - base, 0.0)
+        total  = scaled.sum()
         
-        except ZeroDivisionError:
-            return []
\ No newline at end of file
+        if total <= 0:
+            return []
+        return scaled / total
\ No newline at end of file
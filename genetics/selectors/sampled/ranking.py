@@ -19,15 +19,21 @@
 # $Revision: 1.4 $
 
 from genetics.selectors.sampled.sampling import SamplingSelector
+from genetics.util.cache import Cache
 from genetics.util.decorators import virtual
-import math
+import numpy
 
 
 class RankingSelector(SamplingSelector):
     '''
     Rank-based Selector
     J.E. Baker.  "Reducing bias and inefficiency in selection algorithms."
+    
+    Probabilities are cached for the most recent cache_size population sizes
+    and pressures.
     '''   
+    cache_size = 16
+    
     def __init__(self, challenge, pressure=None):
         '''
         Constructs a ranked selector
@@ -35,18 +41,21 @@ class RankingSelector(SamplingSelector):
         @param challenge: the challenge instance for fitness evaluation
         @param pressure: selection pressure constant
         '''
-        self._cache = {} # scaling depends on pressure and size, so it can be cached
+        # scaling depends on pressure and size, so it can be cached
+        self._cache = Cache('ranking_pressures', self.cache_size)
+        self._cumulative = Cache('ranking_cumulative', self.cache_size)
         super(RankingSelector, self).__init__(challenge, pressure)
     
 
     def select(self, n, population):
         '''
-        TODO: Selects n organisms...  SUS...
+        Ranks the population by descending fitness and then selects n 
+        organisms by stochastic universal sampling of their rank probabilities.
 
+        @param n: number of organisms to select
         @param population: a Population instance or a list of organisms                
         '''
-        population.sort(cmp=self.cmp_fitness)
-        return super(RankingSelector, self).select(n, population)
+        return super(RankingSelector, self).select(n, self.rank(population))
     
     
     def scale(self, population=[]):
@@ -58,18 +67,37 @@ class RankingSelector(SamplingSelector):
         '''
         # get the probability for this pressure.  cache it by size & pressure
         size = len(population)
-        if self.pressure not in self._cache:
-            self._cache[self.pressure] = {}
-        if size not in self._cache[self.pressure]:
-            self._cache[self.pressure][size] = self.selection_probabilities(population)
-        return self._cache[self.pressure][size]
+        probabilities = self._cache.get(self.pressure)
+        if probabilities is None:
+            probabilities = Cache('ranking_probabilities', self.cache_size)
+            self._cache[self.pressure] = probabilities
+        
+        scaled = probabilities.get(size)
+        if scaled is None:
+            scaled = self.selection_probabilities(population)
+            probabilities[size] = scaled
+        return scaled
+    
+    
+    def cumulative(self, population):
+        '''
+        Caches the cumulative probabilities by pressure and size, too.
+
+        @param population: a Population instance or a list of organisms                
+        '''
+        key = (self.pressure, len(population))
+        cumulative = self._cumulative.get(key)
+        if cumulative is None:
+            cumulative = super(RankingSelector, self).cumulative(population)
+            self._cumulative[key] = cumulative
+        return cumulative
     
 
     @virtual
     def selection_probabilities(self, population=[]): #@UnusedVariable
         '''
         Determines the selection probability for each
-        organism. Returns a list of those probabilities.
+        organism. Returns an array of those probabilities.
 
         @param population: a Population instance or a list of organisms                
         '''
@@ -99,10 +127,13 @@ class LinearRankingSelector(RankingSelector):
 
         @param population: a Population instance or a list of organisms                
         '''
-        # create a list for this pressure & population size
-        size  = len(population)
-        return [((2.0-self.pressure) / size) + ((2.0*i)*(self.pressure-1.0) / (size * (size-1.0)))
-                for i in xrange(1, size + 1)]
+        # create an array for this pressure & population size
+        size = len(population)
+        if size == 1:
+            return numpy.ones(1)
+        
+        i = numpy.arange(1, size + 1)
+        return ((2.0-self.pressure) / size) + ((2.0*i)*(self.pressure-1.0) / (size * (size-1.0)))
 
     
 
@@ -128,6 +159,6 @@ class ExponentialRankingSelector(RankingSelector):
 
         @param population: a Population instance or a list of organisms                
         '''        
-        # create a list for this pressure & population size
-        return [(1 - (math.e ** -i)) / self.pressure 
-                 for i in xrange(1, len(population)+1)]
\ No newline at end of file
+        # create an array for this pressure & population size
+        i = numpy.arange(1, len(population) + 1)
+        return (1 - numpy.exp(-i)) / self.pressure
\ No newline at end of file
@@ -21,7 +21,7 @@
 from genetics.selector import Selector
 from genetics.selectors.randomized import RandomSelector
 from genetics.util.decorators import virtual
-import random
+import numpy, random
 
 
 class SamplingSelector(Selector):
@@ -53,46 +53,46 @@ class SamplingSelector(Selector):
         roulette turn.  Note that this makes it possible to select
         a single organism multiple times.
         
+        All n arms are placed on the cumulative selection probabilities
+        at once with a binary search.
+        
         @param n: number of organisms to select
         @param population: a Population instance or a list of organisms
         '''
         if n < 1:
             return []
         
-        selected = [] # the organisms we return
-        current = 0.0 # the float for determining which org to copy
-        i = 0         # the index for selecting
-        increment = 1.0 / n
-        r = random.random() * increment
-        
-        scaled = self.scale(population)
-        if scaled:
+        cumulative = self.cumulative(population)
+        if len(cumulative):
             # we were able to scale the population. proceed to select from it.
-            while n > 0:
-                current += scaled[i]
-                while r < current:
-                    selected.append(population[i])
-                    r += increment
-                    n -= 1
-                    
-                    # stop if we have already filled our list
-                    if n <= 0:
-                        break
-                
-                i += 1
-                
-            return selected
+            arms  = (random.random() + numpy.arange(n)) / n
+            index = cumulative.searchsorted(arms, side='right')
+            index = index.clip(0, len(cumulative) - 1)
+            return [population[i] for i in index.tolist()]
         
         else:
             # no fitness variance in the population. resort to random selection.
             return self.random_selector.select(n, population)
+    
+    
+    def cumulative(self, population):
+        '''
+        Returns an array of the cumulative selection probabilities of the 
+        organisms, or an empty list if the population cannot be scaled.
+        
+        @param population: a Population instance or a list of organisms
+        '''
+        scaled = self.scale(population)
+        if not len(scaled):
+            return []
+        return numpy.cumsum(scaled)
         
     
     @virtual
     def scale(self, population): #@UnusedVariable
         '''
-        Determines the selection probability for each
-        organism. Returns a list of those probabilities.
+        Determines the selection probability for each organism.  Returns 
+        a sequence of those probabilities, or an empty list if there are none.
         
         @param population: a Population instance or a list of organisms        
         '''
@@ -20,6 +20,8 @@
 
 from genetics.selector import Selector
 from genetics.selectors.randomized import RandomSelector
+from genetics.util.randomness import numpy_random
+import numpy
 
 
 class TournamentSelector(Selector):
@@ -87,4 +89,91 @@ class TournamentSelector(Selector):
                     # ahead and move it on to the next round
                     new_list.append(list[i])
     
-            list = new_list
\ No newline at end of file
+            list = new_list
+
+
+class FitnessTournamentSelector(TournamentSelector):
+    '''
+    Fitness Tournament Selector
+    Runs all tournaments at once on the fitness values of the challenge,
+    so the Organism class does not need a __cmp__ method.
+    
+    Contestants are drawn without replacement within each tournament by 
+    default.  If probability is less than 1.0, the best contestant wins
+    with that probability, the second best with probability * (1 - probability),
+    and so on.
+    '''
+    def __init__(self, challenge, size, replacement=False, probability=1.0):
+        '''
+        Constructs a tournament instance with the tournament size
+        
+        @param challenge: the challenge instance for fitness evaluation
+        @param size: the number of organisms entered in the tournament
+        @param replacement: whether an organism can enter a tournament twice
+        @param probability: the probability that the best contestant wins
+        '''
+        self.replacement = replacement
+        self.probability = probability
+        super(FitnessTournamentSelector, self).__init__(challenge, size)
+    
+    
+    def select(self, n, population):
+        '''
+        Selects n organisms from the population by tournaments.  All
+        n x size contestants are drawn in one batch and the winners are
+        found with a single pass over their fitness values.
+        
+        @param n: number of organisms to select
+        @param population: a Population instance or a list of organisms
+        '''
+        if n < 1:
+            return []
+        
+        fitness = numpy.array(self.fitness_keys(population), dtype=float)
+        index   = self.contestants(n, len(fitness))
+        scores  = fitness[index]
+        rows    = numpy.arange(n)
+        
+        if self.probability >= 1.0:
+            winners = scores.argmax(axis=1)
+        else:
+            # the k-th best contestant wins with probability p * (1-p)^k
+            order   = numpy.argsort(-scores, axis=1, kind='mergesort')
+            place   = numpy_random().geometric(self.probability, n) - 1
+            winners = order[rows, place.clip(0, scores.shape[1] - 1)]
+        
+        return [population[i] for i in index[rows, winners].tolist()]
+    
+    
+    def contestants(self, n, population_size):
+        '''
+        Returns an n x size array of population indices, one row per 
+        tournament.  Unless self.replacement is set, the indices in a row
+        are distinct: small tournaments draw one column at a time and redraw
+        the entries that repeat an earlier column, and tournaments of more
+        than half the population take the smallest of random keys.
+        
+        @param n: number of tournaments
+        @param population_size: number of organisms to draw from
+        '''
+        size = min(self.size, population_size)
+        if self.replacement or size == 1:
+            return numpy_random().randint(0, population_size, (n, size))
+        
+        if size * 2 > population_size:
+            # most of the population enters, so partition random keys
+            keys = numpy_random().random_sample((n, population_size))
+            return keys.argpartition(size - 1, axis=1)[:, :size]
+        
+        # at most half the population enters, so redraws are rare
+        state = numpy_random()
+        index = numpy.empty((n, size), dtype=int)
+        for column in xrange(size):
+            drawn = index[:, column]
+            rows  = numpy.arange(n)
+            while len(rows):
+                drawn[rows] = state.randint(0, population_size, len(rows))
+                repeated = (index[rows, :column] == drawn[rows, None]).any(axis=1)
+                rows = rows[repeated]
+        
+        return index
@@ -27,10 +27,36 @@ Method Decorators:
     - comparable: ensure that two argumentss are the same type
     - tuple_crossover: check that two tuples are the same size
     - cached: cache the value returned the first time a method is called
-    - memoize: cache the return value of a method by its first argument
+    - memoize: cache the return value of a method by its first argument (bounded)
+    - chromosome_cached: cache the return value of a method on a chromosome
     
 Data Structures:
     - queue
+    - codebook: intern alleles as dense integer codes
+    - hall of fame: the best distinct organisms ever seen
+    
+Caching:
+    - Cache: LRU cache with size or byte limits and weak keys
+    - GenomeCache: bounded phenotypes by genome for each challenge
+    - registry: hit, miss and eviction counters and limits by cache name
+    
+Mating:
+    - MatingPlan: random pairs of parents and mutation decisions, drawn at once
+    
+Randomness:
+    - numpy_random: a numpy RandomState that follows random.seed
+    
+Distance:
+    - HammingDistance: differing bits of packed bit strings
+    - PositionDistance: displacement of alleles between permutations
+    - EuclideanDistance: straight line distance between real vectors
+    
+Pareto Dominance:
+    - non_dominated_sort: front number of each objective vector
+    - crowding_distance: spread of each objective vector within its front
+    
+Lineage:
+    - LineageRecorder: parents, operators and birth generations on disk
 
 Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
 '''
\ No newline at end of file
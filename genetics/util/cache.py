@@ -0,0 +1,589 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from collections import OrderedDict
+import sys, weakref
+
+
+class CacheStatistics(object):
+    '''
+    Hit, miss and eviction counters shared by every cache with the same name
+    '''
+    def __init__(self, name):
+        '''
+        Creates a new set of counters
+
+        @param name: name of the caches being counted
+        '''
+        self.name = name
+        self.reset()
+
+
+    def __repr__(self):
+        '''
+        Returns a string with the counters
+        '''
+        return '%s: hits=%s, misses=%s, evictions=%s' % \
+            (self.name, self.hits, self.misses, self.evictions)
+
+
+    def reset(self):
+        '''
+        Sets the counters back to 0
+        '''
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+
+    def hit_rate(self):
+        '''
+        Returns the fraction of lookups that were hits, or 0.0 if there have
+        been no lookups
+        '''
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return float(self.hits) / lookups
+
+
+
+class CacheRegistry(object):
+    '''
+    Keeps the counters of every named cache, and the limits for caches that
+    are created by decorators and therefore cannot be configured directly:
+
+        from genetics.util.cache import registry
+        registry.limit('_decoded_phenotypes', size=4)
+        ...
+        registry.report() # {'_decoded_phenotypes': {'hits': ..., ...}, ...}
+
+    Limits only apply to caches created after they are set.  The caches of
+    the decorators are looked up on every call, so they are only counted
+    while statistics are enabled:
+
+        registry.enable()
+    '''
+    def __init__(self):
+        '''
+        Creates an empty registry
+        '''
+        self.enabled     = False # count the caches of decorators?
+        self._statistics = {}
+        self._limits     = {}
+
+
+    def enable(self, enabled=True):
+        '''
+        Starts or stops counting the hits and misses of the caches of 
+        decorators (see genetics.util.decorators)
+
+        @param enabled: whether to count them
+        '''
+        self.enabled = enabled
+
+
+    def statistics(self, name):
+        '''
+        Returns the counters for a cache name, creating them if needed
+
+        @param name: name of the cache
+        '''
+        try:
+            return self._statistics[name]
+
+        except KeyError:
+            self._statistics[name] = CacheStatistics(name)
+            return self._statistics[name]
+
+
+    def limit(self, name, size=None, bytes=None):
+        '''
+        Sets the limits for new caches with a name.  Caches created with
+        their own limits keep them.
+
+        @param name: name of the cache
+        @param size: maximum number of entries, or None for no limit
+        @param bytes: maximum total size of the values, or None for no limit
+        '''
+        self._limits[name] = (size, bytes)
+
+
+    def limits(self, name):
+        '''
+        Returns (size, bytes) limits for a cache name
+
+        @param name: name of the cache
+        '''
+        return self._limits.get(name, (None, None))
+
+
+    def report(self):
+        '''
+        Returns {name: {'hits': ..., 'misses': ..., 'evictions': ...}, ...}
+        '''
+        return dict((name, {'hits': stats.hits, 'misses': stats.misses,
+                            'evictions': stats.evictions})
+                    for name, stats in self._statistics.items())
+
+
+    def reset(self):
+        '''
+        Sets all counters back to 0
+        '''
+        for stats in self._statistics.values():
+            stats.reset()
+
+
+registry = CacheRegistry()
+
+
+
+class Cache(object):
+    '''
+    A mapping that can be bounded by the number of entries and by the total
+    size of its values, evicting the least recently used entries first.
+    Lookups with [] and get() count as hits or misses, and evictions are
+    counted, in the statistics that the registry keeps for the cache name.
+
+    If weak is set, keys are held by weak reference, so an entry goes away
+    with its key.  This is meant for caches keyed by challenges.  A value
+    that refers to its own key keeps the key alive, so such caches should
+    be bounded instead.  The references do not refer back to the cache, so
+    a cache is freed as soon as it is no longer used, without waiting for 
+    the garbage collector.
+    
+    A cache that is not counted, such as one created by a decorator, leaves
+    counting its lookups to its owner.
+    '''
+    # organisms each have a cache, so keep instances small
+    __slots__ = ('name', 'size', 'bytes', 'weak', 'sizeof', 'statistics',
+                 'counted', '_lru', '_entries', '_sizes', '_used', '_expire',
+                 '__weakref__')
+    
+    def __init__(self, name, size=None, bytes=None, weak=False,
+                 sizeof=sys.getsizeof, counted=True):
+        '''
+        Creates an empty cache.  Limits that are not given are taken from
+        the registry.
+
+        @param name: name of the cache, for statistics and limits
+        @param size: maximum number of entries, or None for no limit
+        @param bytes: maximum total size of the values, or None for no limit
+        @param weak: whether to hold the keys by weak reference
+        @param sizeof: function for the size of a value in bytes
+        @param counted: whether to count hits and misses
+        '''
+        default_size, default_bytes = registry.limits(name)
+        if size is None:
+            size = default_size
+        if bytes is None:
+            bytes = default_bytes
+
+        self.name       = name
+        self.size       = size
+        self.bytes      = bytes
+        self.weak       = weak
+        self.sizeof     = sizeof
+        self.statistics = registry.statistics(name)
+        self.counted    = counted
+
+        # plain dicts are enough when nothing is ever evicted
+        self._lru     = bool(size or bytes)
+        self._entries = {}
+        self._sizes   = None
+        self._used    = 0
+        self._expire  = None
+        if self._lru:
+            self._entries = OrderedDict()
+        if bytes:
+            self._sizes = {}
+
+
+    def __len__(self):
+        '''
+        Returns the number of entries
+        '''
+        return len(self._entries)
+
+
+    def __contains__(self, key):
+        '''
+        Checks for a key without counting a lookup
+
+        @param key: key to look for
+        '''
+        return self._key(key) in self._entries
+
+
+    def __iter__(self):
+        '''
+        Iterates over the keys, from least to most recently used
+        '''
+        for key in self._entries.keys():
+            if self.weak:
+                key = key()
+                if key is None:
+                    continue
+            yield key
+
+
+    def __getitem__(self, key):
+        '''
+        Returns the value for a key, or raises a KeyError
+
+        @param key: key to look up
+        '''
+        if self.weak:
+            stored = weakref.ref(key)
+        else:
+            stored = key
+        
+        try:
+            value = self._entries[stored]
+
+        except KeyError:
+            if self.counted:
+                self.statistics.misses += 1
+            raise
+
+        if self.counted:
+            self.statistics.hits += 1
+        if self._lru:
+            # move the entry to the most recently used end
+            del self._entries[stored]
+            self._entries[self._key(key, store=True)] = value
+        return value
+
+
+    def __setitem__(self, key, value):
+        '''
+        Stores a value for a key and evicts entries if the cache is over its
+        limits.  The newest entry is never evicted.
+
+        @param key: key to store the value under
+        @param value: value to store
+        '''
+        key = self._key(key, store=True)
+        if key in self._entries:
+            self._discard(key)
+
+        self._entries[key] = value
+        if self.bytes:
+            self._sizes[key] = self.sizeof(value)
+            self._used += self._sizes[key]
+
+        while len(self._entries) > 1 and \
+            ((self.size and len(self._entries) > self.size) or
+             (self.bytes and self._used > self.bytes)):
+            self._discard(iter(self._entries).next())
+            self.statistics.evictions += 1
+
+
+    def __delitem__(self, key):
+        '''
+        Removes the entry for a key, or raises a KeyError
+
+        @param key: key to remove
+        '''
+        key = self._key(key)
+        if key not in self._entries:
+            raise KeyError(key)
+        self._discard(key)
+
+
+    def get(self, key, default=None):
+        '''
+        Returns the value for a key, or default if it is not in the cache
+
+        @param key: key to look up
+        @param default: value to return for a miss
+        '''
+        try:
+            return self[key]
+
+        except KeyError:
+            return default
+
+
+    def clear(self):
+        '''
+        Removes all entries
+        '''
+        self._entries.clear()
+        if self._sizes:
+            self._sizes.clear()
+        self._used = 0
+
+
+    def used(self):
+        '''
+        Returns the total size of the values in bytes, if the cache has a
+        byte limit
+        '''
+        return self._used
+
+
+    def _key(self, key, store=False):
+        '''
+        Internal method: returns the key as it is stored in the entries.
+        Weak references compare equal if their keys do, so a new reference
+        finds the stored one.
+
+        @param key: key as given by the caller
+        @param store: whether the key is being stored and needs a callback
+        '''
+        if not self.weak:
+            return key
+        if store:
+            if self._expire is None:
+                self._expire = _expirer(weakref.ref(self))
+            return weakref.ref(key, self._expire)
+        return weakref.ref(key)
+
+
+    def _discard(self, key):
+        '''
+        Internal method: removes a stored key and its size
+
+        @param key: key as it is stored in the entries
+        '''
+        del self._entries[key]
+        if self._sizes is not None:
+            self._used -= self._sizes.pop(key, 0)
+
+
+
+def _expirer(cache):
+    '''
+    Returns the callback for the weak keys of a cache, which removes the 
+    entry of a key that no longer exists.  It only holds the cache by weak 
+    reference, since a bound method would make a reference cycle of every 
+    cache with weak keys.
+
+    @param cache: weak reference to the cache
+    '''
+    def expire(reference):
+        owner = cache()
+        if owner is not None and reference in owner._entries:
+            owner._discard(reference)
+            owner.statistics.evictions += 1
+    return expire
+
+
+
+class GenomeCache(object):
+    '''
+    Phenotypes keyed by (challenge, genome key), in a bounded Cache for each
+    challenge.  Challenges are held by weak reference, so their phenotypes 
+    go away with them.  Populations with a genome_cache_size each have one
+    (see Organism.genome_cache).
+
+    The caches of all challenges count their hits, misses and evictions in
+    the registry statistics of the same name.
+    '''
+    def __init__(self, name, size=None):
+        '''
+        Creates an empty cache
+
+        @param name: name of the cache, for statistics and limits
+        @param size: maximum number of phenotypes for each challenge
+        '''
+        self.name        = name
+        self.size        = size
+        self.statistics  = registry.statistics(name)
+        self._challenges = Cache(name + '_challenges', weak=True)
+
+
+    def __len__(self):
+        '''
+        Returns the number of phenotypes of every challenge
+        '''
+        return sum([len(self._challenges.get(challenge)) 
+                    for challenge in list(self._challenges)])
+
+
+    def __contains__(self, key):
+        '''
+        Checks for a (challenge, genome key) without counting a lookup
+
+        @param key: key to look for
+        '''
+        challenge, genome = key
+        return challenge in self._challenges and \
+            genome in self._challenges.get(challenge)
+
+
+    def __getitem__(self, key):
+        '''
+        Returns the phenotype for a (challenge, genome key), or raises a 
+        KeyError
+
+        @param key: key to look up
+        '''
+        challenge, genome = key
+        phenotypes = self._challenges.get(challenge)
+        if phenotypes is None:
+            self.statistics.misses += 1
+            raise KeyError(key)
+        return phenotypes[genome]
+
+
+    def __setitem__(self, key, phenotype):
+        '''
+        Stores a phenotype for a (challenge, genome key)
+
+        @param key: key to store the phenotype under
+        @param phenotype: the phenotype
+        '''
+        challenge, genome = key
+        self.phenotypes(challenge)[genome] = phenotype
+
+
+    def get(self, key, default=None):
+        '''
+        Returns the phenotype for a key, or default if it is not in the cache
+
+        @param key: key to look up
+        @param default: value to return for a miss
+        '''
+        try:
+            return self[key]
+
+        except KeyError:
+            return default
+
+
+    def phenotypes(self, challenge):
+        '''
+        Returns the Cache of phenotypes by genome key for a challenge, 
+        creating it if needed
+
+        @param challenge: a challenge instance
+        '''
+        phenotypes = self._challenges.get(challenge)
+        if phenotypes is None:
+            phenotypes = Cache(self.name, size=self.size)
+            self._challenges[challenge] = phenotypes
+        return phenotypes
+
+
+    def clear(self):
+        '''
+        Removes all phenotypes
+        '''
+        self._challenges.clear()
+
+
+
+class WeakKeyDict(dict):
+    '''
+    A plain dict that holds its keys by weak reference, for the unbounded
+    caches that decorators keep on every organism.  There are no callbacks:
+    every dict keyed by the same object shares one weak reference to it, so
+    an entry costs no more than in a dict.  Entries whose keys no longer 
+    exist are dropped whenever a new entry is stored, and are not counted
+    or iterated.
+    '''
+    __slots__ = ()
+
+    def __len__(self):
+        '''
+        Returns the number of entries whose keys still exist
+        '''
+        self.purge()
+        return dict.__len__(self)
+
+
+    def __contains__(self, key):
+        '''
+        Checks for a key
+
+        @param key: key to look for
+        '''
+        return dict.__contains__(self, weakref.ref(key))
+
+
+    def __iter__(self):
+        '''
+        Iterates over the keys that still exist
+        '''
+        for reference in dict.keys(self):
+            key = reference()
+            if key is not None:
+                yield key
+
+
+    def __getitem__(self, key):
+        '''
+        Returns the value for a key, or raises a KeyError
+
+        @param key: key to look up
+        '''
+        return dict.__getitem__(self, weakref.ref(key))
+
+
+    def __setitem__(self, key, value):
+        '''
+        Stores a value for a key, and drops the entries of keys that no 
+        longer exist
+
+        @param key: key to store the value under
+        @param value: value to store
+        '''
+        if dict.__len__(self):
+            self.purge()
+        dict.__setitem__(self, weakref.ref(key), value)
+
+
+    def get(self, key, default=None):
+        '''
+        Returns the value for a key, or default if it is not in the dict
+
+        @param key: key to look up
+        @param default: value to return for a miss
+        '''
+        return dict.get(self, weakref.ref(key), default)
+
+
+    def purge(self):
+        '''
+        Drops the entries of keys that no longer exist
+        '''
+        for reference in dict.keys(self):
+            if reference() is None:
+                dict.__delitem__(self, reference)
+
+
+
+def memo_cache(name, size=None, bytes=None, weak=False):
+    '''
+    Returns a new cache for a memoized method: a WeakKeyDict if it holds
+    its keys by weak reference and has no limits, or else a Cache that 
+    leaves counting to the decorator
+
+    @param name: name of the cache, for statistics and limits
+    @param size: maximum number of entries, or None for the registry limit
+    @param bytes: maximum total size of the values, or None for the registry limit
+    @param weak: whether to hold the keys by weak reference
+    '''
+    if weak and not (size or bytes or registry.limits(name) != (None, None)):
+        return WeakKeyDict()
+    return Cache(name, size, bytes, weak, counted=False)
@@ -0,0 +1,184 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from numpy.lib.format import open_memmap
+import numpy, os, tempfile
+
+
+class Dataset(object):
+    '''
+    A directory of named arrays that are memory mapped read-only, so every
+    process that opens them shares one copy in the page cache instead of
+    loading its own.  Arrays are written once, ahead of a run:
+
+        Dataset.create('data/fit', x=x, y=y)
+
+        # or a piece at a time, for new arrays larger than memory
+        x = Dataset.allocate('data/fit', 'x', (10**9,), float)
+        x[:chunk] = ...
+        x.flush()
+
+    and read as zero-copy views by challenges:
+
+        class FitChallenge(Challenge):
+            dataset = Dataset('data/fit')
+
+            def fitness(self, organism):
+                x, y = self.dataset['x'], self.dataset['y']
+                ...
+
+    Each array is mapped the first time it is used in a process.  A pickled
+    dataset only holds its path, so sending a challenge to a worker process
+    does not copy the arrays, and the worker maps them itself.
+    '''
+    def __init__(self, path):
+        '''
+        Opens a dataset.  Arrays are not mapped until they are used.
+
+        @param path: directory of the dataset
+        '''
+        self.path    = path
+        self._arrays = {}
+
+
+    @classmethod
+    def create(cls, path, **arrays):
+        '''
+        Writes arrays to a dataset, replacing arrays with the same names, and
+        returns the dataset.  Each array is written to a temporary file that
+        is renamed over the old one, so processes that have the old array
+        mapped keep reading it, whole, until they close the dataset.
+
+        @param path: directory of the dataset
+        @param arrays: name=array for each array to write
+        '''
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        
+        for name, array in arrays.items():
+            handle, temporary = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', 
+                                                 dir=path)
+            os.close(handle)
+            try:
+                array  = numpy.asanyarray(array)
+                mapped = open_memmap(temporary, mode='w+', dtype=array.dtype,
+                                     shape=array.shape)
+                mapped[...] = array
+                mapped.flush()
+                del mapped
+                os.rename(temporary, os.path.join(path, name + '.npy'))
+            
+            finally:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+        return cls(path)
+
+
+    @classmethod
+    def allocate(cls, path, name, shape, dtype=float):
+        '''
+        Creates an array in a dataset and returns it mapped for writing, so
+        it can be filled a piece at a time.  Call flush() on it when done.
+        Raises a ValueError if the dataset already has an array with the 
+        name, since truncating a file that other processes have mapped 
+        crashes them; replace arrays with create() instead.
+
+        @param path: directory of the dataset
+        @param name: name of the array
+        @param shape: shape of the array
+        @param dtype: type of the array elements
+        '''
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        
+        filename = os.path.join(path, name + '.npy')
+        if os.path.exists(filename):
+            raise ValueError('%s already exists' % filename)
+        return open_memmap(filename, mode='w+', dtype=dtype, shape=shape)
+
+
+    def __getitem__(self, name):
+        '''
+        Returns a read-only view of an array, or raises a KeyError if the
+        dataset has no array with the name
+
+        @param name: name of the array
+        '''
+        try:
+            return self._arrays[name]
+
+        except KeyError:
+            if name not in self:
+                raise KeyError(name)
+            self._arrays[name] = numpy.load(self._file(name), mmap_mode='r')
+            return self._arrays[name]
+
+
+    def __contains__(self, name):
+        '''
+        Checks if the dataset has an array
+
+        @param name: name of the array
+        '''
+        return os.path.isfile(self._file(name))
+
+
+    def __getstate__(self):
+        '''
+        Returns the state to pickle: only the path, so arrays are mapped
+        again instead of copied
+        '''
+        return {'path': self.path}
+
+
+    def __setstate__(self, state):
+        '''
+        Restores a pickled dataset
+
+        @param state: the pickled state
+        '''
+        self.__init__(state['path'])
+
+
+    def names(self):
+        '''
+        Returns a sorted list of the names of the arrays
+        '''
+        if not os.path.isdir(self.path):
+            return []
+        return sorted([name[:-4] for name in os.listdir(self.path)
+                       if name.endswith('.npy')])
+
+
+    def close(self):
+        '''
+        Unmaps the arrays of this process.  They are mapped again when they
+        are used.
+        '''
+        self._arrays.clear()
+
+
+    def _file(self, name):
+        '''
+        Internal method: returns the file name of an array
+
+        @param name: name of the array
+        '''
+        return os.path.join(self.path, name + '.npy')
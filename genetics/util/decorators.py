@@ -18,7 +18,9 @@
 #
 # $Revision: 1.9 $
 
+from genetics.util.cache import WeakKeyDict, memo_cache, registry
 from threading import Lock
+import weakref
 
 
 def virtual(method):
@@ -108,6 +110,8 @@ def cached(name):
     Decorator for caching the return value of an instance level method in self.
     Assumes that there are no arguments passed to the method (not memoization).
     Pass in the name to use for storing the return value in self.__dict__.
+    While the genetics.util.cache.registry is enabled, hits and misses are
+    counted in it under name.
     
         @cached('cached_name')
         def _get_something(self):
@@ -116,14 +120,22 @@ def cached(name):
         
     @param name: name to cache the return value in on self
     '''
+    statistics = registry.statistics(name)
+    
     def decorator(method):
         def wrapper(self):
             try:
-              return self.__dict__[name]
+                value = self.__dict__[name]
           
             except KeyError:
+                if registry.enabled:
+                    statistics.misses += 1
                 self.__dict__[name] = method(self)
                 return self.__dict__[name]
+            
+            if registry.enabled:
+                statistics.hits += 1
+            return value
     
         # TODO: this doesn't work...
         wrapper.__doc__ = method.__doc__
@@ -132,32 +144,90 @@ def cached(name):
     return decorator
 
 
-def memoize(name):
+def memoize(name, size=None, bytes=None, weak=False):
     '''
     Memoizes a function by the first argument passed in (referred to as the key).
     Remaining *args and **kwargs are passed in on the first call, but are not
-    involved in the caching.  The cache is stored on self.name.
+    involved in the caching.  The cache is stored on self.name: a plain 
+    dict when keys are weak and there are no limits, or else a bounded 
+    genetics.util.cache.Cache (see genetics.util.cache.memo_cache).  While
+    the cache registry is enabled, hits and misses are counted in it under
+    name.
     
-        @memoize('cached_name')
+        @memoize('cached_name', size=10, weak=True)
         def _get_something(self, key):
             ...
             return 'something'
         
     @param name: name to cache the return values in on self
+    @param size: maximum number of entries, or None for the registry limit
+    @param bytes: maximum total size of the values, or None for the registry limit
+    @param weak: whether to hold the keys by weak reference
     '''
+    statistics = registry.statistics(name)
+    lookup, ref = dict.__getitem__, weakref.ref
+    
     def decorator(method):
         def wrapper(self, key, *args, **kwargs):
-            try:
-                return self.__dict__[name][key]
+            cache = self.__dict__.get(name)
+            if cache is None:
+                cache = self.__dict__[name] = memo_cache(name, size, bytes, weak)
+            else:
+                try:
+                    if type(cache) is WeakKeyDict:
+                        # look up the shared weak reference without a call
+                        value = lookup(cache, ref(key))
+                    else:
+                        value = cache[key]
+                
+                except KeyError:
+                    pass
+                
+                else:
+                    if registry.enabled:
+                        statistics.hits += 1
+                    return value
             
-            except KeyError:
-                if name not in self.__dict__:
-                    self.__dict__[name] = {}
-                self.__dict__[name][key] = method(self, key, *args, **kwargs)
-                return self.__dict__[name][key]
+            if registry.enabled:
+                statistics.misses += 1
+            value = method(self, key, *args, **kwargs)
+            cache[key] = value
+            return value
                 
         # TODO: this doesn't work...
         wrapper.__doc__ = method.__doc__
         return wrapper
 
-    return decorator
\ No newline at end of file
+    return decorator
+
+
+def chromosome_cached(name):
+    '''
+    Decorator for organism methods whose return value depends on only one
+    chromosome.  The value is cached on the chromosome, so children that 
+    share the chromosome with their parent reuse it instead of computing 
+    it again.  Pass in the name of the chromosome in the genotype.
+    
+        @chromosome_cached('route')
+        def route_length(self):
+            ...
+            return length
+        
+    @param name: name of the chromosome the method depends on
+    '''
+    def decorator(method):
+        def wrapper(self):
+            cache = self.__dict__[name].__dict__
+            try:
+                return cache['_chromosome_cached'][method]
+            
+            except KeyError:
+                if '_chromosome_cached' not in cache:
+                    cache['_chromosome_cached'] = {}
+                cache['_chromosome_cached'][method] = method(self)
+                return cache['_chromosome_cached'][method]
+        
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+    
+    return decorator
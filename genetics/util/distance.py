@@ -0,0 +1,184 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.util.decorators import virtual
+import numpy
+
+
+# number of bits set in each byte
+_POPCOUNT = numpy.array([bin(i).count('1') for i in xrange(256)], dtype=numpy.intp)
+
+
+class Distance(object):
+    '''
+    Abstract base class for measuring the distance between organisms by one
+    of their chromosomes.  The chromosomes of a list of organisms are encoded
+    once into an array with one row per organism, and distances are measured
+    from every row to a few reference rows at a time:
+
+        distance  = HammingDistance('bits')
+        rows      = distance.rows(organisms)
+        distances = distance.between(rows, rows[:10]) # len(rows) x 10
+
+    Measuring against a sample of references instead of the whole population
+    keeps the cost linear in the population size.
+    '''
+    def __init__(self, name, attribute='alleles'):
+        '''
+        Creates a new distance measure
+
+        @param name: name of the chromosome in the organism genotype
+        @param attribute: chromosome attribute that holds the alleles
+        '''
+        self.name = name
+        self.attribute = attribute
+
+
+    def rows(self, organisms):
+        '''
+        Returns an array with the encoded chromosome of each organism.
+
+        @param organisms: a Population instance or a list of organisms
+        '''
+        return self.encode([getattr(getattr(organism, self.name), self.attribute)
+                            for organism in organisms])
+
+
+    @virtual
+    def encode(self, alleles): #@UnusedVariable
+        '''
+        Returns an array with one row per sequence of alleles.
+
+        @param alleles: a list of allele sequences
+        '''
+        pass
+
+
+    @virtual
+    def between(self, rows, references): #@UnusedVariable
+        '''
+        Returns a (rows x references) array of distances.
+
+        @param rows: encoded chromosomes
+        @param references: encoded chromosomes to measure from
+        '''
+        pass
+
+
+    def nearest(self, rows, references):
+        '''
+        Returns the index of the nearest reference to each row.
+
+        @param rows: encoded chromosomes
+        @param references: encoded chromosomes to measure from
+        '''
+        return self.between(rows, references).argmin(axis=1)
+
+
+
+class HammingDistance(Distance):
+    '''
+    Counts the alleles that differ between two bit strings.  Bit strings are
+    packed eight bits to a byte, and differences are counted by looking up
+    the bits set in the exclusive or of each byte.
+
+    For a SubsetChromosome, measure the bitmap attribute:
+        HammingDistance('items', 'bitmap')
+    '''
+    def encode(self, alleles):
+        '''
+        Returns the bit strings packed into an array of bytes.
+
+        @param alleles: a list of boolean sequences
+        '''
+        return numpy.packbits(numpy.array(alleles, dtype=bool, ndmin=2), axis=1)
+
+
+    def between(self, rows, references):
+        '''
+        Returns a (rows x references) array of Hamming distances.
+
+        @param rows: packed bit strings
+        @param references: packed bit strings to measure from
+        '''
+        distances = numpy.empty((len(rows), len(references)), dtype=numpy.intp)
+        for j, reference in enumerate(references):
+            distances[:, j] = _POPCOUNT[rows ^ reference].sum(axis=1)
+        return distances
+
+
+
+class PositionDistance(Distance):
+    '''
+    Measures how far the alleles of one permutation are from their positions
+    in another: the sum over all alleles of the difference in position.  Each
+    permutation is encoded as the position of each allele, in sorted allele
+    order, so the alleles must be comparable.
+    '''
+    def encode(self, alleles):
+        '''
+        Returns the position of each allele in each permutation.
+
+        @param alleles: a list of permutations of the same alleles
+        '''
+        return numpy.array(alleles, ndmin=2).argsort(axis=1, kind='mergesort')
+
+
+    def between(self, rows, references):
+        '''
+        Returns a (rows x references) array of position distances.
+
+        @param rows: allele positions
+        @param references: allele positions to measure from
+        '''
+        distances = numpy.empty((len(rows), len(references)), dtype=numpy.intp)
+        for j, reference in enumerate(references):
+            distances[:, j] = numpy.abs(rows - reference).sum(axis=1)
+        return distances
+
+
+
+class EuclideanDistance(Distance):
+    '''
+    Measures the straight line distance between real vectors.  Use the allele
+    attribute for a chromosome with a single number:
+        EuclideanDistance('x', 'allele')
+    '''
+    def encode(self, alleles):
+        '''
+        Returns the vectors as an array of floats.
+
+        @param alleles: a list of vectors or numbers
+        '''
+        rows = numpy.array(alleles, dtype=float)
+        return rows.reshape(len(rows), -1)
+
+
+    def between(self, rows, references):
+        '''
+        Returns a (rows x references) array of Euclidean distances.
+
+        @param rows: vectors
+        @param references: vectors to measure from
+        '''
+        distances = numpy.empty((len(rows), len(references)))
+        for j, reference in enumerate(references):
+            distances[:, j] = ((rows - reference) ** 2).sum(axis=1)
+        return numpy.sqrt(distances)
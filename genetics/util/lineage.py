@@ -0,0 +1,208 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+import numpy, os, tempfile
+
+
+class LineageRecorder(object):
+    '''
+    Records the parents, the variation operator and the birth generation of
+    every organism without keeping the organisms themselves alive.  Records
+    are appended to a fixed-size NumPy buffer that is spilled to a file when
+    it fills up, so memory use does not grow with the number of births.
+    
+    To record the lineage of a population, set a recorder on its organism 
+    class before the population is created:
+    
+        MyOrganism.lineage = LineageRecorder('/tmp/my-run')
+    
+    Organism IDs are only unique within an organism class, so a recorder 
+    should only be used for one class.  Ancestry queries use binary search
+    as long as organisms are recorded in the order of their IDs, which is 
+    the case for a single-threaded population.
+    '''
+    # operator codes
+    CREATION  = 0
+    MUTATION  = 1
+    CROSSOVER = 2
+    
+    # record layout: parent2 is 0 if there is only one parent
+    dtype = numpy.dtype([('child',      numpy.int64), 
+                         ('parent1',    numpy.int64),
+                         ('parent2',    numpy.int64),
+                         ('operator',   numpy.uint8),
+                         ('generation', numpy.int32)])
+    
+    
+    def __init__(self, directory=None, buffer_size=2**16, overwrite=False):
+        '''
+        Creates a new recorder.  Records are spilled to a file called 
+        lineage.dat in the directory, which is created if needed.  Raises a
+        ValueError if the directory already has a lineage file, unless 
+        overwrite is set.
+        
+        @param directory: directory for the lineage file (default: a new
+               temporary directory)
+        @param buffer_size: number of records kept in memory
+        @param overwrite: replace an existing lineage file
+        '''
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='lineage-')
+        elif not os.path.isdir(directory):
+            os.makedirs(directory)
+        
+        self.path       = os.path.join(directory, 'lineage.dat')
+        if os.path.exists(self.path) and not overwrite:
+            raise ValueError('%s already exists, pass overwrite=True to '
+                             'replace it' % self.path)
+        
+        self.generation = 1
+        
+        self._buffer  = numpy.zeros(buffer_size, dtype=self.dtype)
+        self._count   = 0     # records in the buffer
+        self._spilled = 0     # records in the file
+        self._last    = 0     # last child ID recorded
+        self._sorted  = True  # have child IDs always increased?
+        self._disk    = None  # memory map of the file
+        
+        # start with an empty file
+        open(self.path, 'wb').close()
+        
+        
+    def __len__(self):
+        '''
+        Returns the total number of records
+        '''
+        return self._spilled + self._count
+    
+    
+    def record(self, child, parents=(), operator=CREATION):
+        '''
+        Records the birth of an organism in the current generation
+        
+        @param child: the new organism
+        @param parents: a sequence of zero, one or two parent organisms
+        @param operator: CREATION, MUTATION or CROSSOVER
+        '''
+        if self._count >= len(self._buffer):
+            self.flush()
+        
+        if child.id <= self._last:
+            self._sorted = False
+        self._last = child.id
+        
+        ids = [parent.id for parent in parents] + [0, 0]
+        self._buffer[self._count] = (child.id, ids[0], ids[1], operator, 
+                                     self.generation)
+        self._count += 1
+        
+    
+    def flush(self):
+        '''
+        Appends the records in the buffer to the lineage file
+        '''
+        if self._count:
+            f = open(self.path, 'ab')
+            try:
+                self._buffer[:self._count].tofile(f)
+            finally:
+                f.close()
+                
+            self._spilled += self._count
+            self._count = 0
+            self._disk  = None
+        
+        
+    def lookup(self, ids):
+        '''
+        Returns a record array of the births of the organisms with the given 
+        IDs.  Organisms that were not recorded are left out.
+        
+        @param ids: a sequence of organism IDs
+        '''
+        ids = numpy.unique(numpy.asarray(ids, dtype=numpy.int64))
+        found = [self._lookup(records, ids) for records in 
+                 (self._records_on_disk(), self._buffer[:self._count])]
+        return numpy.concatenate(found)
+    
+    
+    def parents(self, id):
+        '''
+        Returns a tuple of the IDs of an organism's parents.  Raises a 
+        KeyError if the organism was not recorded.
+        
+        @param id: organism ID
+        '''
+        records = self.lookup([id])
+        if not len(records):
+            raise KeyError(id)
+        return tuple([int(parent) for parent in 
+                      (records[0]['parent1'], records[0]['parent2']) if parent])
+        
+        
+    def ancestors(self, id, generations=None):
+        '''
+        Returns a set of the IDs of an organism's recorded ancestors.  Each
+        generation of ancestors is looked up in one batch.
+        
+        @param id: organism ID
+        @param generations: number of generations to go back (default: all)
+        '''
+        seen, frontier = set(), [id]
+        while len(frontier) and (generations is None or generations > 0):
+            records = self.lookup(frontier)
+            parents = numpy.concatenate((records['parent1'], records['parent2']))
+            frontier = [parent for parent in numpy.unique(parents).tolist()
+                        if parent and parent not in seen]
+            seen.update(frontier)
+            
+            if generations is not None:
+                generations -= 1
+        
+        return seen
+    
+    
+    def _records_on_disk(self):
+        '''
+        Internal method: returns a read-only memory map of the lineage file
+        '''
+        if not self._spilled:
+            return self._buffer[:0]
+        if self._disk is None:
+            self._disk = numpy.memmap(self.path, dtype=self.dtype, mode='r', 
+                shape=(self._spilled,))
+        return self._disk
+    
+    
+    def _lookup(self, records, ids):
+        '''
+        Internal method: returns the records for a sorted array of IDs
+        
+        @param records: a record array
+        @param ids: a sorted array of unique organism IDs
+        '''
+        children = records['child']
+        if not len(children):
+            return records[:0]
+        
+        if self._sorted:
+            index = children.searchsorted(ids).clip(0, len(children) - 1)
+            return records[index[children[index] == ids]]
+        return records[numpy.in1d(children, ids)]
@@ -0,0 +1,78 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.util.randomness import numpy_random
+import numpy
+
+
+class MatingPlan(object):
+    '''
+    Pairs up a mating pool at random and decides in advance which children
+    are mutated.  The pool is shuffled once and adjacent parents are paired,
+    so planning takes linear time.  If the pool has an odd size, one parent
+    is left out.  Plans are drawn from numpy_random, so random.seed 
+    reproduces them.
+
+    A plan can be iterated over for each pair of parents and the mutation
+    decisions for their children:
+
+        for parent1, parent2, mutations in MatingPlan(parents, 0.5):
+            ...
+
+    Operators that work on a whole generation at once can use the arrays
+    directly instead:
+        - first:     index in parents of the first parent of each pair
+        - second:    index in parents of the second parent of each pair
+        - mutations: (pairs x children) boolean array of mutation decisions
+    '''
+    def __init__(self, parents, mutation=0.0, children=2):
+        '''
+        Creates a new mating plan
+
+        @param parents: a list of organisms in the mating pool
+        @param mutation: probability of mutating each child
+        @param children: number of children of each pair
+        '''
+        self.parents = list(parents)
+        pairs = len(self.parents) // 2
+
+        state = numpy_random()
+        order = state.permutation(len(self.parents))
+        self.first     = order[0:2*pairs:2]
+        self.second    = order[1:2*pairs:2]
+        self.mutations = state.random_sample((pairs, children)) < mutation
+
+
+    def __len__(self):
+        '''
+        Returns the number of pairs
+        '''
+        return len(self.first)
+
+
+    def __iter__(self):
+        '''
+        Iterates over (parent1, parent2, mutations) for each pair, where
+        mutations is a list with a boolean for each child
+        '''
+        parents = self.parents
+        for i, j, mutations in zip(self.first.tolist(), self.second.tolist(),
+                                   self.mutations.tolist()):
+            yield parents[i], parents[j], mutations
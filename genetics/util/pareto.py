@@ -0,0 +1,179 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+'''
+Pareto dominance for multi-objective challenges.  Objectives are given as
+an array with one row per organism and one column per objective, and every
+objective is maximized.  One organism dominates another if it is at least
+as good in every objective and better in at least one.
+'''
+
+import bisect, numpy
+
+
+def non_dominated_sort(objectives):
+    '''
+    Returns an array with the front number of each row of objectives.  Front
+    0 is not dominated by any row, front 1 is only dominated by rows in front
+    0, and so on.
+
+    Rows are visited in descending lexicographic order, so no row can be
+    dominated by a row visited after it, and each row is placed with a binary
+    search over the fronts found so far.  This takes O(n log n) time for two
+    objectives and compares each row with only a few fronts for more.
+
+    @param objectives: an (organisms x objectives) array
+    '''
+    objectives = _matrix(objectives)
+    size, width = objectives.shape
+    fronts = numpy.zeros(size, dtype=int)
+    if not size:
+        return fronts
+
+    if width == 1:
+        # fronts are the distinct values in descending order
+        fronts[:] = numpy.unique(-objectives[:, 0], return_inverse=True)[1]
+        return fronts
+
+    order = numpy.lexsort(-objectives.T[::-1])
+    if width == 2:
+        _sort_two(objectives, order, fronts)
+    else:
+        _sort_many(objectives, order, fronts)
+    return fronts
+
+
+def crowding_distance(objectives, fronts):
+    '''
+    Returns an array with the crowding distance of each row of objectives
+    within its front: the sum over the objectives of the distance between
+    its neighbors, relative to the range of the front.  The rows at either
+    end of a front in any objective are infinitely far from the others.
+
+    All fronts are handled at once with one sort per objective.
+
+    @param objectives: an (organisms x objectives) array
+    @param fronts: the front number of each row
+    '''
+    objectives = _matrix(objectives)
+    fronts     = numpy.asarray(fronts)
+    size       = len(fronts)
+    distance   = numpy.zeros(size)
+    if not size:
+        return distance
+
+    for column in objectives.T:
+        # sort by front, then by this objective within each front
+        order  = numpy.lexsort((column, fronts))
+        values = column[order]
+        group  = fronts[order]
+        change = group[1:] != group[:-1]
+        starts = numpy.concatenate(([True], change))
+        ends   = numpy.concatenate((change, [True]))
+
+        # the range of each front, repeated for its members
+        first = numpy.flatnonzero(starts)
+        span  = numpy.repeat(values[ends] - values[starts],
+                             numpy.diff(numpy.append(first, size)))
+        span[span == 0] = 1.0
+
+        gap = numpy.empty(size)
+        gap[1:-1] = values[2:] - values[:-2]
+        gap /= span
+        gap[starts | ends] = numpy.inf
+        distance[order] += gap
+
+    return distance
+
+
+def _matrix(objectives):
+    '''
+    Internal function: returns objectives as a two-dimensional float array.
+
+    @param objectives: a sequence of objective vectors or single values
+    '''
+    objectives = numpy.asarray(objectives, dtype=float)
+    if objectives.ndim == 1:
+        objectives = objectives.reshape(-1, 1)
+    return objectives
+
+
+def _sort_two(objectives, order, fronts):
+    '''
+    Internal function: sorts two objectives by sweeping rows in order.  Each
+    front is represented by its last row, which has its largest second
+    objective, and the last rows get worse from one front to the next.
+
+    @param objectives: an (organisms x 2) array
+    @param order: rows in descending lexicographic order
+    @param fronts: array to put the front numbers in
+    '''
+    last = [] # (-second, -first) of the last row of each front
+    for i, first, second in zip(order.tolist(), objectives[order, 0].tolist(),
+                                objectives[order, 1].tolist()):
+        key   = (-second, -first)
+        front = bisect.bisect_left(last, key)
+        if front == len(last):
+            last.append(key)
+        else:
+            last[front] = key
+        fronts[i] = front
+
+
+def _sort_many(objectives, order, fronts):
+    '''
+    Internal function: sorts three or more objectives by binary search over
+    the fronts.  If a row is dominated by a row in one front, it is dominated
+    by a row in every front before it.  Members of each front are kept in a
+    growing array so dominance can be checked against them at once.  Repeated
+    rows are next to each other in order and share a front.
+
+    @param objectives: an (organisms x objectives) array
+    @param order: rows in descending lexicographic order
+    @param fronts: array to put the front numbers in
+    '''
+    ordered = objectives[order]
+    repeated = numpy.concatenate(([False], (ordered[1:] == ordered[:-1]).all(axis=1)))
+    
+    members, counts, low = [], [], 0
+    for i, row, same in zip(order.tolist(), ordered, repeated.tolist()):
+        if same:
+            # a repeated row is in the same front as the row before it
+            fronts[i] = low
+            continue
+        
+        # once repeats are skipped, a member at least as good as the row dominates it
+        low, high = 0, len(members)
+        while low < high:
+            middle = (low + high) // 2
+            if (members[middle][:counts[middle]] >= row).all(axis=1).any():
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(members):
+            members.append(numpy.empty((16, len(row))))
+            counts.append(0)
+        elif counts[low] == len(members[low]):
+            members[low] = numpy.concatenate((members[low], numpy.empty_like(members[low])))
+
+        members[low][counts[low]] = row
+        counts[low] += 1
+        fronts[i] = low
@@ -0,0 +1,38 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+import numpy, random
+
+_state = numpy.random.RandomState()
+
+
+def numpy_random():
+    '''
+    Returns a numpy RandomState for drawing arrays of random numbers.  It is
+    seeded from the random module on every call, so random.seed reproduces
+    the numpy draws of the package as well as the others:
+
+        random.seed(42)
+        mask = numpy_random().random_sample(size) < 0.5
+
+    Seeding costs a couple of microseconds, so draw whole arrays at once.
+    '''
+    _state.seed(random.getrandbits(32))
+    return _state
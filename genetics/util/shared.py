@@ -0,0 +1,280 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.util.cache import registry
+import hashlib, multiprocessing, numbers, numpy, struct
+
+
+def key_hash(key):
+    '''
+    Returns a nonzero 64 bit hash of a key that is the same in every process
+    and every run, unlike hash(), which may depend on object addresses and 
+    hash randomization.  Keys are encoded by content (see key_encoding), so 
+    they may only be built from None, numbers, strings, tuples, lists, sets,
+    classes and objects with a content_key(), as genome keys are.  Raises a
+    TypeError for any other key.
+
+    @param key: the key to hash
+    '''
+    value = struct.unpack('<q', hashlib.md5(key_encoding(key)).digest()[:8])[0]
+    return value or 1
+
+
+def key_encoding(key):
+    '''
+    Returns a byte string that describes a key by its content alone.  Every
+    value is tagged with its kind, strings and sequences with their lengths,
+    and the members of a set are sorted by their encodings.  Raises a 
+    TypeError for a key that cannot be encoded.
+
+    @param key: the key to encode
+    '''
+    if key is None:
+        return 'N'
+    if isinstance(key, (bool, numpy.bool_)):
+        return 'B%d' % bool(key)
+    if isinstance(key, numbers.Integral):
+        return 'I%d;' % key
+    if isinstance(key, numbers.Real):
+        return 'F%r;' % float(key)
+    if isinstance(key, str):
+        return 'S%d:%s' % (len(key), key)
+    if isinstance(key, unicode):
+        return 'U' + key_encoding(key.encode('utf-8'))
+    if isinstance(key, (tuple, list)):
+        return 'T%d:%s' % (len(key), ''.join([key_encoding(item) for item in key]))
+    if isinstance(key, (set, frozenset)):
+        return 'Z%d:%s' % (len(key), ''.join(sorted([key_encoding(item) for item in key])))
+    if isinstance(key, type):
+        return 'C' + key_encoding('%s.%s' % (key.__module__, key.__name__))
+    if hasattr(key, 'content_key'):
+        return 'K' + key_encoding(type(key)) + key_encoding(key.content_key())
+    raise TypeError('cannot encode a key of %s by its content' % type(key))
+
+
+
+class SharedCache(object):
+    '''
+    A fixed size hash table of numbers in shared memory, for fitness or other
+    numeric phenotypes that worker processes on one host should only compute
+    once between them.  Create the cache before starting the workers, which
+    inherit it:
+
+        challenge.shared_phenotypes = SharedCache('fitness', size=2**16)
+        workers = [multiprocessing.Process(...) for i in xrange(4)]
+
+    Keys are stored as 64 bit hashes (see key_hash).  Values are a number,
+    or a tuple of width numbers, and come back as ints or floats like they
+    went in.  Other values, such as phenotypes that are not numbers or have
+    the wrong width, are not stored.  The table is split
+    into stripes with a lock each, and a key is only ever stored in the
+    first few slots of its stripe after its home slot, so memory is bounded
+    and a full neighbourhood evicts the entry in the home slot.  Writers
+    take the stripe lock, while readers check the key before and after
+    reading the value instead, so lookups never wait.
+
+    Hits, misses and evictions are counted in the registry statistics of
+    each process separately.
+    '''
+    def __init__(self, name, size=65536, width=1, stripes=16, probes=8):
+        '''
+        Creates an empty cache in shared memory
+
+        @param name: name of the cache, for statistics
+        @param size: number of slots in the table
+        @param width: number of floats in each value
+        @param stripes: number of independently locked parts of the table
+        @param probes: number of slots a key may be stored in
+        '''
+        self.name       = name
+        self.width      = width
+        self.stripes    = stripes
+        self.slots      = max(size // stripes, 1)
+        self.probes     = min(probes, self.slots)
+        self.statistics = registry.statistics(name)
+
+        size = self.slots * stripes
+        self._locks  = [multiprocessing.Lock() for i in xrange(stripes)] #@UnusedVariable
+        self._keys   = numpy.frombuffer(multiprocessing.RawArray('b', 8 * size),
+                                        dtype=numpy.int64)
+        self._values = numpy.frombuffer(multiprocessing.RawArray('b', 8 * size * width),
+                                        dtype=float).reshape(size, width)
+        self._ints   = numpy.frombuffer(multiprocessing.RawArray('b', size * width),
+                                        dtype=bool).reshape(size, width)
+
+
+    def __len__(self):
+        '''
+        Returns the number of entries
+        '''
+        return int(numpy.count_nonzero(self._keys))
+
+
+    def __contains__(self, key):
+        '''
+        Checks for a key without counting a lookup
+
+        @param key: key to look for
+        '''
+        return self._find(key_hash(key)) is not None
+
+
+    def __getitem__(self, key):
+        '''
+        Returns the value for a key, or raises a KeyError
+
+        @param key: key to look up
+        '''
+        value = self._find(key_hash(key))
+        if value is None:
+            self.statistics.misses += 1
+            raise KeyError(key)
+
+        self.statistics.hits += 1
+        return value
+
+
+    def __setitem__(self, key, value):
+        '''
+        Stores a value for a key, evicting the entry in the home slot of the
+        key if all of the slots it may be stored in are taken.  Values that
+        are not a number, or a tuple of width numbers, are left out.
+
+        @param key: key to store the value under
+        @param value: a number, or a tuple of width numbers
+        '''
+        hashed = key_hash(key)
+        ints   = self._kinds(value)
+        if ints is None:
+            return
+
+        stripe, slots = self._slots(hashed)
+        keys = self._keys
+        with self._locks[stripe]:
+            slot = None
+            for candidate in slots:
+                if keys[candidate] == hashed or keys[candidate] == 0:
+                    slot = candidate
+                    break
+
+            if slot is None:
+                slot = slots[0]
+                self.statistics.evictions += 1
+
+            # readers see an empty slot while the value is being written
+            keys[slot] = 0
+            self._values[slot] = value
+            self._ints[slot]   = ints
+            keys[slot] = hashed
+
+
+    def get(self, key, default=None):
+        '''
+        Returns the value for a key, or default if it is not in the cache
+
+        @param key: key to look up
+        @param default: value to return for a miss
+        '''
+        try:
+            return self[key]
+
+        except KeyError:
+            return default
+
+
+    def clear(self):
+        '''
+        Removes all entries
+        '''
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            self._keys[:] = 0
+
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+
+    def _slots(self, hashed):
+        '''
+        Internal method: returns the stripe of a hashed key and the slots it
+        may be stored in, starting with its home slot
+
+        @param hashed: the hashed key
+        '''
+        stripe = hashed % self.stripes
+        home   = (hashed // self.stripes) % self.slots
+        start  = stripe * self.slots
+        return stripe, [start + (home + i) % self.slots for i in xrange(self.probes)]
+
+
+    def _find(self, hashed):
+        '''
+        Internal method: returns the value stored for a hashed key, or None
+
+        @param hashed: the hashed key
+        '''
+        keys = self._keys
+        for slot in self._slots(hashed)[1]:
+            if keys[slot] != hashed:
+                continue
+
+            value = self._values[slot].tolist()
+            ints  = self._ints[slot].tolist()
+            if keys[slot] != hashed:
+                # overwritten while reading
+                return None
+            
+            value = [int(number) if is_int else number 
+                     for number, is_int in zip(value, ints)]
+            if self.width == 1:
+                return value[0]
+            return tuple(value)
+
+        return None
+
+
+    def _kinds(self, value):
+        '''
+        Internal method: returns a list that tells for each number of a 
+        value whether it is an int, or None if the value does not fit in a
+        slot
+
+        @param value: a number, or a tuple of width numbers
+        '''
+        if self.width == 1:
+            value = (value,)
+        if not isinstance(value, tuple) or len(value) != self.width:
+            return None
+        
+        ints = []
+        for number in value:
+            if isinstance(number, (bool, numpy.bool_)) or \
+                not isinstance(number, numbers.Real):
+                return None
+            if isinstance(number, numbers.Integral):
+                # floats only hold integers exactly up to 2**53
+                if abs(number) > 2**53:
+                    return None
+                ints.append(True)
+            else:
+                ints.append(False)
+        return ints
@@ -37,6 +37,16 @@ class FitnessStatistics(object):
         self.challenge  = challenge
         
     
+    @cached('__fitness')
+    def fitness(self):
+        '''
+        Returns a list of the fitness of each organism in the population.  
+        Fitness is only computed once per organism, for the whole population
+        at once (see Challenge.fitness_batch).
+        '''
+        return self.challenge.fitness_batch(list(self.population))
+    
+    
     @cached('__mean')
     def mean(self):
         '''
@@ -46,7 +56,7 @@ class FitnessStatistics(object):
         if num < 1:
             return 0.0
         
-        total = sum([self.challenge.fitness(x) for x in self.population])
+        total = sum(self.fitness())
         return total / float(num)
         
     
@@ -60,5 +70,5 @@ class FitnessStatistics(object):
             return 0.0
     
         mean = self.mean()
-        variance = sum([(self.challenge.fitness(x) - mean) ** 2 for x in self.population])
+        variance = sum([(x - mean) ** 2 for x in self.fitness()])
         return math.sqrt((1/num) * variance)
\ No newline at end of file
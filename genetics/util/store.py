@@ -0,0 +1,274 @@
+# Python genetic programming & evolutionary computing modules
+# Copyright (C) 2006  Ryan J. O'Neil <ryanjoneil ~ at ~ gmail.com>
+# http://python-genetic.sourceforge.net/
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# $Revision: 1.1 $
+
+from genetics.util.cache import Cache, registry
+from genetics.util.shared import key_hash
+import atexit, cPickle, Queue, sqlite3, threading
+
+
+class PhenotypeStore(object):
+    '''
+    Keeps decoded phenotypes in an SQLite database, so that restarts and
+    reruns of a challenge do not decode the same genomes again.  Entries are
+    keyed by the challenge name and the hash of a genome (see key_hash and
+    Organism.genome_key), and phenotypes must be picklable:
+
+        challenge.phenotype_store = PhenotypeStore('runs.db', 'tsp', version=3)
+
+    Each challenge name has a version.  Opening a store with a different
+    version than the one in the database drops every stored phenotype for
+    that name, so change the version whenever fitness changes meaning.
+    invalidate() drops them explicitly.  Stores written with another way of
+    hashing keys are dropped the same way.
+
+    Populations load the stored phenotypes of each generation's children
+    with one query (see prefetch), and the most recently used local_size
+    phenotypes are kept in memory.  New phenotypes are written by a
+    background thread; flush() waits for them, and close() is called at
+    exit.  Open a store in each process instead of sharing one.  Phenotypes
+    that cannot be pickled are only kept in memory, and nothing is stored 
+    after close().
+    '''
+    # largest number of parameters in one query
+    batch = 500
+    
+    # changes whenever key_hash does, so stored keys stay meaningful
+    hashing = 2
+
+    def __init__(self, path, name, version=None, local_size=10000):
+        '''
+        Opens a store, creating the database if needed
+
+        @param path: file name of the database
+        @param name: name of the challenge the phenotypes belong to
+        @param version: version of the challenge
+        @param local_size: number of phenotypes to keep in memory
+        '''
+        self.path       = path
+        self.name       = name
+        self.version    = repr((self.hashing, version))
+        self.statistics = registry.statistics('phenotype_store')
+
+        self._local   = Cache('phenotype_store_local', size=local_size)
+        self._missing = set()
+        self._writes  = Queue.Queue()
+        self._db      = self._connect()
+
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS versions ('
+                             'name TEXT PRIMARY KEY, version TEXT)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS phenotypes ('
+                             'name TEXT, genome INTEGER, phenotype BLOB, '
+                             'PRIMARY KEY (name, genome))')
+
+            stored = self._db.execute('SELECT version FROM versions WHERE name = ?',
+                                      (name,)).fetchone()
+            if stored is None or stored[0] != self.version:
+                self._db.execute('DELETE FROM phenotypes WHERE name = ?', (name,))
+                self._db.execute('INSERT OR REPLACE INTO versions VALUES (?, ?)',
+                                 (name, self.version))
+
+        self._writer = threading.Thread(target=self._write)
+        self._writer.daemon = True
+        self._writer.start()
+        atexit.register(self.close)
+
+
+    def __contains__(self, key):
+        '''
+        Checks for a key in memory or in the database without counting a
+        lookup
+
+        @param key: key to look for
+        '''
+        return self._lookup(key_hash(key)) is not None
+
+
+    def __getitem__(self, key):
+        '''
+        Returns the phenotype stored for a key, or raises a KeyError
+
+        @param key: key to look up
+        '''
+        found = self._lookup(key_hash(key))
+        if found is None:
+            self.statistics.misses += 1
+            raise KeyError(key)
+
+        self.statistics.hits += 1
+        return found[0]
+
+
+    def __setitem__(self, key, phenotype):
+        '''
+        Stores a phenotype for a key.  The phenotype is available at once,
+        and is written to the database in the background, unless it cannot
+        be pickled.  Does nothing once the store is closed.
+
+        @param key: key to store the phenotype under
+        @param phenotype: a picklable phenotype
+        '''
+        if self._db is None:
+            return
+        
+        hashed = key_hash(key)
+        self._local[hashed] = phenotype
+        self._missing.discard(hashed)
+        try:
+            pickled = cPickle.dumps(phenotype, cPickle.HIGHEST_PROTOCOL)
+        
+        except (cPickle.PicklingError, TypeError):
+            return
+        self._writes.put((hashed, pickled))
+
+
+    def get(self, key, default=None):
+        '''
+        Returns the phenotype for a key, or default if it is not stored
+
+        @param key: key to look up
+        @param default: value to return for a miss
+        '''
+        try:
+            return self[key]
+
+        except KeyError:
+            return default
+
+
+    def prefetch(self, organisms):
+        '''
+        Loads the stored phenotypes of a list of organisms into memory with
+        as few queries as possible, and remembers which are not stored so
+        that looking them up does not query the database again.
+
+        @param organisms: a list of organisms
+        '''
+        hashed = set([key_hash(organism.genome_key()) for organism in organisms])
+        hashed.difference_update(self._local)
+        self._missing = hashed
+        self._load(list(hashed))
+
+
+    def invalidate(self):
+        '''
+        Drops every stored phenotype of the challenge
+        '''
+        self.flush()
+        self._local.clear()
+        self._missing = set()
+        with self._db:
+            self._db.execute('DELETE FROM phenotypes WHERE name = ?', (self.name,))
+
+
+    def flush(self):
+        '''
+        Waits until every stored phenotype has been written
+        '''
+        if self._db is not None:
+            self._writes.join()
+
+
+    def close(self):
+        '''
+        Writes the remaining phenotypes and closes the database
+        '''
+        if self._db is None:
+            return
+
+        self._writes.put(None)
+        self._writer.join()
+        self._db.close()
+        self._db = None
+
+
+    def _connect(self):
+        '''
+        Internal method: returns a new connection to the database
+        '''
+        db = sqlite3.connect(self.path, timeout=60)
+        db.execute('PRAGMA journal_mode=WAL')
+        return db
+
+
+    def _lookup(self, hashed):
+        '''
+        Internal method: returns a tuple with the phenotype for a hashed key,
+        or None if it is not stored.  Once the store is closed, only the
+        phenotypes in memory are found.
+
+        @param hashed: the hashed key
+        '''
+        if hashed not in self._local and hashed not in self._missing:
+            self._load([hashed])
+        if hashed not in self._local:
+            return None
+        return (self._local.get(hashed),)
+
+
+    def _load(self, hashed):
+        '''
+        Internal method: loads the stored phenotypes for a list of hashed
+        keys into memory, unless the store is closed
+
+        @param hashed: a list of hashed keys
+        '''
+        if self._db is None:
+            return
+        
+        for i in xrange(0, len(hashed), self.batch):
+            keys = hashed[i:i + self.batch]
+            rows = self._db.execute(
+                'SELECT genome, phenotype FROM phenotypes WHERE name = ? '
+                'AND genome IN (%s)' % ','.join('?' * len(keys)),
+                [self.name] + keys)
+
+            for genome, phenotype in rows:
+                self._local[genome] = cPickle.loads(str(phenotype))
+                self._missing.discard(genome)
+
+
+    def _write(self):
+        '''
+        Internal method: writes queued phenotypes in batches until close()
+        '''
+        db = self._connect()
+        done = False
+        while not done:
+            rows = [self._writes.get()]
+            while len(rows) < self.batch:
+                try:
+                    rows.append(self._writes.get_nowait())
+                except Queue.Empty:
+                    break
+
+            if None in rows:
+                done = True
+                rows = [row for row in rows if row is not None]
+
+            if rows:
+                with db:
+                    db.executemany('INSERT OR REPLACE INTO phenotypes VALUES (?, ?, ?)',
+                                   [(self.name, genome, sqlite3.Binary(phenotype))
+                                    for genome, phenotype in rows])
+            for i in xrange(len(rows) + done): #@UnusedVariable
+                self._writes.task_done()
+
+        db.close()
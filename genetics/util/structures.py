@@ -18,6 +18,8 @@
 #
 # $Revision: 1.3 $
 
+import bisect, heapq, itertools
+
 
 class Queue(object):
     '''
@@ -54,4 +56,411 @@ class Queue(object):
         '''
         Determines if the queue is empty
         '''
-        return len(self._items) <= 0
\ No newline at end of file
+        return len(self._items) <= 0    
+    
+    
+class Codebook(object):
+    '''
+    Interns alleles as dense integer codes 0, 1, 2, ...  Chromosomes with a
+    codebook hold codes instead of alleles, so their variation operators
+    compare and look up small integers instead of hashing arbitrary objects.
+    Codes are only decoded back to alleles when they are needed:
+    
+        cities = Codebook([(0, 0), (3, 4), (6, 8)])
+        cities.encode([(3, 4), (0, 0)])  =>  [1, 0]
+        cities.decode([1, 0])            =>  ((3, 4), (0, 0))
+    '''
+    def __init__(self, alleles=()):
+        '''
+        Initializes a codebook
+        
+        @param alleles: initial alleles, coded in order
+        '''
+        self._alleles = [] # code   -> allele
+        self._codes   = {} # allele -> code
+        for allele in alleles:
+            self.add(allele)
+            
+            
+    def __len__(self):
+        '''
+        Returns the number of codes in the codebook
+        '''
+        return len(self._alleles)
+    
+    
+    def __contains__(self, allele):
+        '''
+        Determines if an allele has a code
+        
+        @param allele: an allele
+        '''
+        return allele in self._codes
+    
+    
+    def __iter__(self):
+        '''
+        Iterates over the alleles in code order
+        '''
+        return iter(self._alleles)
+    
+    
+    def __repr__(self):
+        '''
+        String representation of a codebook
+        '''
+        return '%s: %s' % (type(self), self._alleles)
+    
+    
+    def add(self, allele):
+        '''
+        Returns the code for an allele, assigning it a new one if needed
+        
+        @param allele: an allele
+        '''
+        try:
+            return self._codes[allele]
+        
+        except KeyError:
+            code = self._codes[allele] = len(self._alleles)
+            self._alleles.append(allele)
+            return code
+    
+    
+    def code(self, allele):
+        '''
+        Returns the code for an allele.  Raises a ValueError if it has none.
+        
+        @param allele: an allele
+        '''
+        try:
+            return self._codes[allele]
+        except KeyError:
+            raise ValueError('%s is not in the codebook' % (allele,))
+    
+    
+    def allele(self, code):
+        '''
+        Returns the allele for a code
+        
+        @param code: a code
+        '''
+        return self._alleles[code]
+    
+    
+    def encode(self, alleles):
+        '''
+        Returns a list of the codes for a sequence of alleles.  Raises a
+        ValueError if one of them has no code.
+        
+        @param alleles: a sequence of alleles
+        '''
+        codes = self._codes
+        try:
+            return [codes[allele] for allele in alleles]
+        except KeyError, e:
+            raise ValueError('%s is not in the codebook' % e)
+        
+        
+    def decode(self, codes):
+        '''
+        Returns a tuple of the alleles for a sequence of codes
+        
+        @param codes: a sequence of codes
+        '''
+        alleles = self._alleles
+        return tuple([alleles[code] for code in codes])
+    
+    
+    
+class FitnessIndex(object):
+    '''
+    Keeps items ordered by a key, such as the fitness of organisms, so that
+    the best items can be read without sorting.  Adding or removing an item
+    is a binary search plus a list insertion, and adding or keeping a batch
+    of items is a merge.  Items with equal keys are ordered by when they 
+    were added, earliest first.
+    
+        index = FitnessIndex(challenge.fitness, population)
+        index.best()     =>  [most fit organism]
+        index.truncate(10)
+    '''
+    def __init__(self, key, items=()):
+        '''
+        Initializes an index
+        
+        @param key: function returning the key of an item
+        @param items: initial items
+        '''
+        self.key      = key
+        self._entries = [] # ascending (key, -sequence, item) 
+        self._by_id   = {} # id(item) -> entries, more than one for duplicates
+        self._counter = itertools.count()
+        self.extend(items)
+        
+        
+    def __len__(self):
+        '''
+        Returns the number of items in the index
+        '''
+        return len(self._entries)
+    
+    
+    def __contains__(self, item):
+        '''
+        Determines if an item is in the index
+        
+        @param item: an item
+        '''
+        return id(item) in self._by_id
+    
+    
+    def add(self, item, key=None):
+        '''
+        Adds an item to the index
+        
+        @param item: an item
+        @param key: the key of the item, if it is already known
+        '''
+        if key is None:
+            key = self.key(item)
+        entry = (key, -self._counter.next(), item)
+        bisect.insort(self._entries, entry)
+        self._by_id.setdefault(id(item), []).append(entry)
+        
+    
+    def extend(self, items, keys=None):
+        '''
+        Adds a sequence of items to the index.  The new entries are sorted 
+        and merged into the index at once, rather than inserted one by one.
+        
+        @param items: a sequence of items
+        @param keys: the keys of the items, if they are already known
+        '''
+        if keys is None:
+            keys = [self.key(item) for item in items]
+        
+        batch = []
+        for item, key in zip(items, keys):
+            entry = (key, -self._counter.next(), item)
+            self._by_id.setdefault(id(item), []).append(entry)
+            batch.append(entry)
+        self._merge(batch)
+        
+        
+    def retain(self, items):
+        '''
+        Keeps only the given items in the index, each as many times as it
+        occurs in items, and returns a list of the removed items.  Items 
+        that were not in the index, or occur more often than they were
+        added, are added.  This costs a pass over the index rather than
+        building it again.
+        
+        @param items: a sequence of items
+        '''
+        counts, wanted = {}, {}
+        for item in items:
+            counts[id(item)] = counts.get(id(item), 0) + 1
+            wanted[id(item)] = item
+        
+        dropped, batch = set(), []
+        for item_id, entries in self._by_id.items():
+            count = counts.get(item_id, 0)
+            if count < len(entries):
+                # the earliest copies are kept
+                dropped.update(id(entry) for entry in entries[count:])
+                del entries[count:]
+                if not entries:
+                    del self._by_id[item_id]
+        
+        for item_id, count in counts.iteritems():
+            entries = self._by_id.setdefault(item_id, [])
+            if count > len(entries):
+                item = wanted[item_id]
+                key  = entries[0][0] if entries else self.key(item)
+                for i in xrange(count - len(entries)):
+                    entry = (key, -self._counter.next(), item)
+                    entries.append(entry)
+                    batch.append(entry)
+        
+        removed = []
+        if dropped:
+            kept = []
+            for entry in self._entries:
+                if id(entry) in dropped:
+                    removed.append(entry[2])
+                else:
+                    kept.append(entry)
+            self._entries = kept
+        self._merge(batch)
+        return removed
+            
+            
+    def remove(self, item):
+        '''
+        Removes an item from the index, or one copy of it if it was added
+        more than once.  Raises a ValueError if it is not in the index.
+        
+        @param item: an item
+        '''
+        entries = self._by_id.get(id(item))
+        if not entries:
+            raise ValueError('%s is not in the index' % (item,))
+        entry = entries.pop()
+        if not entries:
+            del self._by_id[id(item)]
+        del self._entries[bisect.bisect_left(self._entries, entry)]
+        
+        
+    def best(self, n=1):
+        '''
+        Returns a list of the n items with the highest keys, highest first
+        
+        @param n: number of items
+        '''
+        return [entry[2] for entry in self._entries[:-n-1:-1]]
+    
+    
+    def truncate(self, n):
+        '''
+        Removes all but the n items with the highest keys and returns a list
+        of the removed items
+        
+        @param n: number of items to keep
+        '''
+        cut = max(0, len(self._entries) - n)
+        removed = self._entries[:cut]
+        del self._entries[:cut]
+        for entry in removed:
+            entries = self._by_id[id(entry[2])]
+            entries.remove(entry)
+            if not entries:
+                del self._by_id[id(entry[2])]
+        return [entry[2] for entry in removed]
+    
+    
+    def _merge(self, batch):
+        '''
+        Internal method: merges new entries into the index.  The sorted 
+        entries and the sorted batch are two runs, which the list sort 
+        merges in linear time.
+        
+        @param batch: a list of entries
+        '''
+        batch.sort()
+        if len(batch) == 1:
+            bisect.insort(self._entries, batch[0])
+        elif batch:
+            self._entries.extend(batch)
+            self._entries.sort()
+    
+    
+    
+class HallOfFame(object):
+    '''
+    Keeps the n best distinct organisms ever added, by a key such as the
+    fitness of organisms.  Organisms with the same genome (see 
+    Organism.genome_key) are only kept once.  The archive is a min-heap, so 
+    adding an organism costs O(log n) and the worst archived organism is 
+    the first to go.  Of organisms with equal keys, the earliest are kept.
+    
+        archive = HallOfFame(challenge.fitness, 10)
+        archive.extend(population)
+        archive.best()   =>  [most fit organism ever added]
+    '''
+    def __init__(self, key, size, items=()):
+        '''
+        Initializes an archive
+        
+        @param key: function returning the key of an organism
+        @param size: number of organisms to keep
+        @param items: initial organisms
+        '''
+        self.key      = key
+        self.size     = size
+        self._heap    = [] # (key, -sequence, genome, organism), worst first
+        self._genomes = set()
+        self._counter = itertools.count()
+        self.extend(items)
+        
+        
+    def __len__(self):
+        '''
+        Returns the number of organisms in the archive
+        '''
+        return len(self._heap)
+    
+    
+    def __contains__(self, organism):
+        '''
+        Determines if an organism with the same genome is in the archive
+        
+        @param organism: an organism
+        '''
+        return organism.genome_key() in self._genomes
+    
+    
+    def add(self, organism, key=None):
+        '''
+        Adds an organism if it is better than the worst in the archive and 
+        its genome is not archived yet.  Returns True if it was added.
+        
+        @param organism: an organism
+        @param key: the key of the organism, if it is already known
+        '''
+        if self.size < 1:
+            return False
+        
+        genome = organism.genome_key()
+        if genome in self._genomes:
+            return False
+        
+        if key is None:
+            key = self.key(organism)
+        entry = (key, -self._counter.next(), genome, organism)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif entry[0] > self._heap[0][0]:
+            self._genomes.discard(heapq.heapreplace(self._heap, entry)[2])
+        else:
+            return False
+        
+        self._genomes.add(genome)
+        return True
+    
+    
+    def extend(self, organisms, keys=None):
+        '''
+        Adds a sequence of organisms to the archive
+        
+        @param organisms: a sequence of organisms
+        @param keys: the keys of the organisms, if they are already known
+        '''
+        if keys is None:
+            for organism in organisms:
+                self.add(organism)
+        else:
+            for organism, key in zip(organisms, keys):
+                self.add(organism, key)
+            
+            
+    def best(self, n=None):
+        '''
+        Returns a list of the n organisms with the highest keys, highest 
+        first, or all of them if n is None
+        
+        @param n: number of organisms
+        '''
+        if n is None:
+            n = len(self._heap)
+        return [entry[3] for entry in heapq.nlargest(n, self._heap)]
+    
+    
+    def worst(self):
+        '''
+        Returns the key an organism has to beat to get into a full archive,
+        or None if the archive is not full
+        '''
+        if len(self._heap) < self.size:
+            return None
+        return self._heap[0][0]
\ No newline at end of file
@@ -1,8 +1,12 @@
 # $Revision: 1.6 $
 
 from genetics.chromosomes.discrete import DiscreteChromosome
+from genetics.chromosomes.integer import IntegerChromosome
+from genetics.chromosomes.permutation import PermutationChromosome
 from genetics.organism import Chromosome
+from genetics.util.structures import Codebook
 from sets import Set
+import random
 
 
 class EmptyChromosome(Chromosome):
@@ -17,4 +21,54 @@ class OneToTenDiscreteChromosome(DiscreteChromosome):
     '''
     A chromosome that can have only values 1 to 10
     '''
-    values = Set(range(1, 11))
\ No newline at end of file
+    values = Set(range(1, 11))
+
+
+class ColorDiscreteChromosome(DiscreteChromosome):
+    '''
+    A chromosome that holds the code of a color
+    '''
+    codebook = Codebook(('red', 'green', 'blue'))
+
+
+class CreepChromosome(IntegerChromosome):
+    '''
+    An integer chromosome that starts at 0 and always creeps upward
+    '''
+    lower_bound = 1
+    
+    def __init__(self, allele=0, *args, **kwargs):
+        super(CreepChromosome, self).__init__(allele, *args, **kwargs)
+        
+    def crossover(self, other):
+        return type(self)(other.allele + 1), type(self)(self.allele + 1)
+        
+    mutate = IntegerChromosome.mutate_creep
+
+
+class DigitChromosome(IntegerChromosome):
+    '''
+    An integer chromosome that starts as a random digit
+    '''
+    def __init__(self, allele=None, *args, **kwargs):
+        if allele is None:
+            allele = random.randint(0, 9)
+        super(DigitChromosome, self).__init__(allele, *args, **kwargs)
+        
+    def crossover(self, other):
+        return type(self)(other.allele), type(self)(self.allele)
+        
+    mutate = IntegerChromosome.mutate_creep
+
+
+class ShuffledChromosome(PermutationChromosome):
+    '''
+    A permutation chromosome that starts as a random order of 0 to 7
+    '''
+    def __init__(self, alleles=None, *args, **kwargs):
+        if alleles is None:
+            alleles = range(8)
+            random.shuffle(alleles)
+        super(ShuffledChromosome, self).__init__(alleles, *args, **kwargs)
+        
+    mutate = PermutationChromosome.mutate_swap
@@ -2,7 +2,10 @@
 
 from genetics.challenge import Challenge
 from genetics.organism import Organism
-from genetics.util.decorators import comparable
+from genetics.util.decorators import chromosome_cached, comparable
+from pyunit.base.chromosomes import (CreepChromosome, DigitChromosome, 
+                                     ShuffledChromosome)
+import random
 
 
 class AgeFitnessOrganism(Organism):
@@ -16,4 +19,69 @@ class AgeFitnessOrganism(Organism):
     def fitness(self):
         return self.age
     
-    phenotypes = {Challenge: fitness}
\ No newline at end of file
+    phenotypes = {Challenge: fitness}
+
+
+class TwoChromosomeOrganism(Organism):
+    '''
+    An organism where only the first chromosome is ever varied
+    '''
+    genotype        = {'first': CreepChromosome, 'second': CreepChromosome}
+    mutation_rates  = {'second': 0.0}
+    crossover_rates = {'second': 0.0}
+    
+    decodes = 0
+    
+    @chromosome_cached('second')
+    def decode_second(self):
+        type(self).decodes += 1
+        return self.second.allele
+
+
+class RandomFitnessOrganism(Organism):
+    '''
+    An organism with no genotype and a random, fixed fitness
+    '''
+    def __init__(self, *args, **kwargs):
+        self.value = random.random()
+        super(RandomFitnessOrganism, self).__init__(*args, **kwargs)
+        
+    def fitness(self):
+        return self.value
+    
+    phenotypes = {Challenge: fitness}
+
+
+class DigitOrganism(Organism):
+    '''
+    An organism whose fitness is the value of its digit chromosome
+    '''
+    genotype = {'digit': DigitChromosome}
+    
+    def fitness(self):
+        return self.digit.allele
+    
+    phenotypes = {Challenge: fitness}
+
+
+class WeightedOrderOrganism(Organism):
+    '''
+    An organism whose fitness is the sum of each allele times its position,
+    with a delta decoder for swaps
+    '''
+    genotype = {'order': ShuffledChromosome}
+    decodes  = 0
+    deltas   = 0
+    
+    def weighted_sum(self):
+        type(self).decodes += 1
+        return sum([i * allele for i, allele in enumerate(self.order.alleles)])
+    
+    def weighted_delta(self, parent_sum, move):
+        type(self).deltas += 1
+        name, kind, i, j = move #@UnusedVariable
+        alleles = self.order.alleles
+        return parent_sum + (j - i) * (alleles[j] - alleles[i])
+    
+    phenotypes       = {Challenge: weighted_sum}
+    delta_phenotypes = {Challenge: weighted_delta}
@@ -2,6 +2,7 @@
 
 from genetics.challenge import Challenge
 from genetics.population import Population
+from genetics.selectors.fitness import FitnessSelector
 from genetics.selectors.randomized import RandomSelector
 
 class SmallPopulation(Population):
@@ -18,4 +19,45 @@ class SmallPopulation(Population):
     survivor_selector = RandomSelector(Challenge)
     
     # Mutation rate
-    mutation = 0.5
\ No newline at end of file
+    mutation = 0.5
+
+
+challenge = Challenge()
+
+class IndexedPopulation(Population):
+    '''
+    A population of size 10 that keeps its organisms ordered by fitness
+    '''
+    size = 10
+    
+    # Mating pool selector
+    mating_pool_selector = RandomSelector(challenge)
+    mating_pool_size     = 4
+    
+    # Survivor selector
+    survivor_selector = FitnessSelector(challenge)
+    ranked_by         = challenge
+    
+    # Mutation rate
+    mutation = 0.5
+
+
+class ArchivedPopulation(Population):
+    '''
+    A population of size 10 that keeps the 3 best organisms ever seen and
+    puts 2 of them back each generation
+    '''
+    size = 10
+    
+    # Mating pool selector
+    mating_pool_selector = RandomSelector(challenge)
+    mating_pool_size     = 4
+    
+    # Survivor selector
+    survivor_selector = RandomSelector(challenge)
+    archived_by       = challenge
+    archive_size      = 3
+    elites            = 2
+    
+    # Mutation rate
+    mutation = 0.5
@@ -2,7 +2,15 @@
 
 from genetics.challenge import Challenge
 from genetics.organism import Organism
-import unittest
+from genetics.selectors.fitness import FitnessSelector
+from genetics.selectors.randomized import RandomSelector
+from genetics.selectors.tournament import FitnessTournamentSelector
+from genetics.util.cache import GenomeCache
+from pyunit.base.chromosomes import DigitChromosome
+from pyunit.base.organisms import DigitOrganism, RandomFitnessOrganism
+from pyunit.base.populations import (ArchivedPopulation, IndexedPopulation, 
+    challenge)
+import cPickle, unittest
 
 
 class ChallengeErrorsTest(unittest.TestCase):
@@ -22,6 +30,339 @@ class ChallengeErrorsTest(unittest.TestCase):
     def testCmp(self):
         self.assertRaises(NotImplementedError, self.challenge.cmp, self.organism, self.organism)
 
+
+class TableChallenge(Challenge):
+    '''
+    A challenge that prepares a table of squares
+    '''
+    prepared = 0
+    
+    def prepare(self):
+        type(self).prepared += 1
+        return [i * i for i in xrange(10)]
+
+
+class ChallengeArtifactsTest(unittest.TestCase):
+    '''
+    Tests preparing artifacts once per challenge
+    '''
+    def setUp(self):
+        TableChallenge.prepared = 0
+        self.challenge = TableChallenge()
+        
+    def testDefault(self):
+        self.assertEqual(Challenge().artifacts(), None)
+        
+    def testPrepareOnce(self):
+        self.assertEqual(self.challenge.artifacts()[3], 9)
+        self.assertTrue(self.challenge.artifacts() is self.challenge.artifacts())
+        self.assertEqual(TableChallenge.prepared, 1)
+        
+        self.challenge.discard_artifacts()
+        self.challenge.artifacts()
+        self.assertEqual(TableChallenge.prepared, 2)
+        
+    def testPickle(self):
+        self.challenge.artifacts()
+        self.challenge.canonical_phenotypes()
+        self.challenge.phenotype_store = object()
+        
+        # artifacts are sent along, phenotype caches are not
+        copy = cPickle.loads(cPickle.dumps(self.challenge, cPickle.HIGHEST_PROTOCOL))
+        self.assertEqual(copy.artifacts(), self.challenge.artifacts())
+        self.assertEqual(TableChallenge.prepared, 1)
+        self.assertEqual(copy.phenotype_store, None)
+        self.assertEqual(len(copy.canonical_phenotypes()), 0)
+
+
+class PopulationIndexTest(unittest.TestCase):
+    '''
+    Tests populations that keep an index of organisms by fitness
+    '''
+    def setUp(self):
+        self.population = IndexedPopulation(RandomFitnessOrganism)
+        self.selector   = FitnessSelector(challenge)
+        
+    def assertIndexed(self):
+        population = self.population
+        self.assertEqual(len(population.index), population.size)
+        self.assertEqual(population.best(challenge, 3), 
+                         self.selector.select(3, list(population)))
+        
+    def testBest(self):
+        self.assertIndexed()
+        self.assertTrue(self.population.best(challenge) is 
+                        self.selector.select(1, list(self.population))[0])
+        
+    def testTruncation(self):
+        for i in xrange(5): #@UnusedVariable
+            self.population.cycle()
+            self.assertIndexed()
+            
+    def testOtherSurvivorSelector(self):
+        self.population.survivor_selector = RandomSelector(challenge)
+        for i in xrange(5): #@UnusedVariable
+            self.population.cycle()
+            self.assertIndexed()
+            
+    def testDuplicateSurvivors(self):
+        # tournaments may pick the same organism more than once
+        self.population.survivor_selector = \
+            FitnessTournamentSelector(challenge, 3, replacement=True)
+        for i in xrange(5): #@UnusedVariable
+            self.population.cycle()
+            self.assertIndexed()
+            
+    def testAge(self):
+        # survivors age by one generation per cycle without being touched
+        self.population.cycle()
+        ages = sorted([org.age for org in self.population])
+        self.assertTrue(ages[0] >= 1)
+        self.assertTrue(ages[-1] <= 2)
+        
+        oldest = [org for org in self.population if org.age == 2]
+        self.population.cycle()
+        for org in oldest:
+            self.assertEqual(org.age, 3)
+            
+    def testSeparateClocks(self):
+        # populations of the same organism class age independently
+        other = IndexedPopulation(RandomFitnessOrganism)
+        for i in xrange(3): #@UnusedVariable
+            self.population.cycle()
+            other.cycle()
+        
+        self.assertEqual(self.population.generation, 4)
+        for population in (self.population, other):
+            self.assertTrue(max([org.age for org in population]) <= 4)
+            self.assertTrue(min([org.age for org in population]) >= 1)
+        
+        # an organism keeps its age when it moves to another population
+        migrant = self.population[0]
+        age = migrant.age
+        island = IndexedPopulation(RandomFitnessOrganism)
+        migrant.join(island)
+        self.assertEqual(migrant.age, age)
+        island.cycle()
+        self.assertEqual(migrant.age, age + 1)
+
+
+class PopulationArchiveTest(unittest.TestCase):
+    '''
+    Tests populations that keep a hall of fame
+    '''
+    def setUp(self):
+        self.population = ArchivedPopulation(DigitOrganism)
+        
+    def testArchive(self):
+        best = self.population.best(challenge)
+        for i in xrange(10): #@UnusedVariable
+            self.population.cycle()
+            
+            # the archive never loses the best organism seen so far
+            top = self.population.archive.best(1)[0]
+            self.assertTrue(challenge.fitness(top) >= challenge.fitness(best))
+            best = top
+            
+            # and the best archived organisms are among the survivors
+            genomes = set([org.genome_key() for org in self.population])
+            self.assertTrue(top.genome_key() in genomes)
+            self.assertEqual(len(self.population.organisms), self.population.size)
+            
+    def testSolve(self):
+        first = self.population.archive.best(1)[0]
+        self.assertTrue(self.population.solve(challenge, 2) is first)
+
+
+class ParityChallenge(Challenge):
+    '''
+    A challenge where only the parity of a digit matters
+    '''
+    canonical_cache_size = 2
+    
+    def canonical(self, organism):
+        return organism.digit.allele % 2
+    
+    def fitness(self, organism):
+        return organism.decode(self) % 2
+
+
+class CountingDigitOrganism(DigitOrganism):
+    '''
+    A digit organism that counts how often it is decoded
+    '''
+    decodes = 0
+    pure_phenotypes = True
+    
+    def fitness(self):
+        type(self).decodes += 1
+        return self.digit.allele
+    
+    phenotypes = {Challenge: fitness, ParityChallenge: fitness}
+
+
+class GenomeCachePopulation(ArchivedPopulation):
+    '''
+    A population that shares phenotypes between equal genomes
+    '''
+    genome_cache_size = 5
+
+
+class GenomeCacheTest(unittest.TestCase):
+    '''
+    Tests sharing phenotypes between organisms with the same genome
+    '''
+    def tearDown(self):
+        CountingDigitOrganism.genome_cache = None
+        CountingDigitOrganism.decodes = 0
+        
+    def testSharing(self):
+        CountingDigitOrganism.genome_cache = GenomeCache('_test_genomes', size=2)
+        organisms = [CountingDigitOrganism(genotype={'digit': DigitChromosome(digit)})
+                     for digit in (3, 3, 4, 3, 5, 3)]
+        self.assertEqual([challenge.fitness(org) for org in organisms], [3, 3, 4, 3, 5, 3])
+        self.assertEqual(CountingDigitOrganism.decodes, 3)
+        self.assertEqual(len(CountingDigitOrganism.genome_cache), 2)
+        self.assertAlmostEqual(CountingDigitOrganism.genome_cache.statistics.hit_rate(), 0.5)
+    
+    def testPopulation(self):
+        population = GenomeCachePopulation(CountingDigitOrganism)
+        self.assertEqual(CountingDigitOrganism.genome_cache, None)
+        self.assertEqual(population.genome_cache.size, 5)
+        for i in xrange(5): #@UnusedVariable
+            population.cycle()
+        
+        # digits repeat, so there are fewer decodes than organisms
+        self.assertTrue(CountingDigitOrganism.decodes < CountingDigitOrganism.id)
+        
+        # each population has its own cache
+        other = GenomeCachePopulation(CountingDigitOrganism)
+        self.assertTrue(other.genome_cache is not population.genome_cache)
+        
+    def testWeakChallenges(self):
+        parity = ParityChallenge()
+        population = GenomeCachePopulation(CountingDigitOrganism)
+        parity.fitness_batch(list(population))
+        self.assertTrue(len(population.genome_cache) > 0)
+        
+        del parity
+        self.assertEqual(len(population.genome_cache), len(
+            population.genome_cache.phenotypes(challenge)))
+        
+    def testImpure(self):
+        # decoders of a digit organism are not declared pure
+        self.assertRaises(ValueError, GenomeCachePopulation, DigitOrganism)
+
+
+class CanonicalCacheTest(unittest.TestCase):
+    '''
+    Tests sharing phenotypes between organisms with the same canonical key
+    '''
+    def tearDown(self):
+        CountingDigitOrganism.genome_cache = None
+        CountingDigitOrganism.decodes = 0
+    
+    def organisms(self, *digits):
+        return [CountingDigitOrganism(genotype={'digit': DigitChromosome(digit)})
+                for digit in digits]
+    
+    def testSharing(self):
+        parity = ParityChallenge()
+        organisms = self.organisms(3, 5, 4, 7, 6)
+        self.assertEqual([parity.fitness(org) for org in organisms], [1, 1, 0, 1, 0])
+        self.assertEqual(CountingDigitOrganism.decodes, 2)
+        self.assertEqual(len(parity.canonical_phenotypes()), 2)
+        
+        # phenotypes are not shared with challenges without canonical keys
+        self.assertEqual([challenge.fitness(org) for org in organisms], [3, 5, 4, 7, 6])
+        self.assertEqual(CountingDigitOrganism.decodes, 7)
+    
+    def testGenomeCache(self):
+        parity = ParityChallenge()
+        CountingDigitOrganism.genome_cache = GenomeCache('_test_canonical_genomes', size=4)
+        first, second = self.organisms(3, 5)
+        parity.fitness(first)
+        parity.fitness(second)
+        self.assertEqual(CountingDigitOrganism.decodes, 1)
+        
+        # the canonical hit is copied into the genome cache
+        key = (parity, second.genome_key())
+        self.assertEqual(CountingDigitOrganism.genome_cache[key], 3)
+        
+    def testChallengeClass(self):
+        # decoders keyed by a challenge class can be called with the class
+        organism, = self.organisms(3)
+        self.assertEqual(organism.decode(ParityChallenge), 3)
+        self.assertEqual(len(ParityChallenge().canonical_phenotypes()), 0)
+
+
+class BatchDigitOrganism(DigitOrganism):
+    '''
+    A digit organism that is decoded a list at a time
+    '''
+    batches = []
+    pure_phenotypes = True
+    
+    def decode_digits(organisms):
+        BatchDigitOrganism.batches.append(len(organisms))
+        return [organism.digit.allele for organism in organisms]
+    
+    batch_phenotypes = {Challenge: decode_digits}
+
+
+class BatchFitnessTest(unittest.TestCase):
+    '''
+    Tests rating lists of organisms at once
+    '''
+    def setUp(self):
+        BatchDigitOrganism.batches = []
+        self.challenge = Challenge()
+    
+    def tearDown(self):
+        BatchDigitOrganism.genome_cache = None
+    
+    def organisms(self, *digits):
+        return [BatchDigitOrganism(genotype={'digit': DigitChromosome(digit)})
+                for digit in digits]
+    
+    def testBatch(self):
+        organisms = self.organisms(3, 1, 4)
+        self.assertEqual(self.challenge.fitness_batch(organisms), [3, 1, 4])
+        self.assertEqual(BatchDigitOrganism.batches, [3])
+        
+        # decoded organisms are left out of the next batch
+        organisms += self.organisms(1, 5)
+        self.assertEqual(self.challenge.fitness_batch(organisms), [3, 1, 4, 1, 5])
+        self.assertEqual(BatchDigitOrganism.batches, [3, 2])
+        self.assertEqual(self.challenge.fitness_batch(organisms[:2]), [3, 1])
+        self.assertEqual(BatchDigitOrganism.batches, [3, 2])
+    
+    def testSharedCaches(self):
+        BatchDigitOrganism.genome_cache = GenomeCache('_test_batch_genomes')
+        self.challenge.fitness_batch(self.organisms(2, 7))
+        self.assertEqual(self.challenge.fitness_batch(self.organisms(7, 2, 8)), [7, 2, 8])
+        self.assertEqual(BatchDigitOrganism.batches, [2, 1])
+    
+    def testFallback(self):
+        organisms = [DigitOrganism(genotype={'digit': DigitChromosome(digit)})
+                     for digit in (6, 2)]
+        self.assertEqual(DigitOrganism.decode_batch(challenge, organisms), [6, 2])
+        self.assertEqual(challenge.fitness_batch(organisms), [6, 2])
+    
+    def testMixedTypes(self):
+        # the batch organisms are decoded together even behind other types
+        organisms = [DigitOrganism(genotype={'digit': DigitChromosome(6)})] + \
+            self.organisms(3, 1) + \
+            [DigitOrganism(genotype={'digit': DigitChromosome(2)})] + self.organisms(4)
+        self.assertEqual(self.challenge.fitness_batch(organisms), [6, 3, 1, 2, 4])
+        self.assertEqual(BatchDigitOrganism.batches, [3])
+        
+    def testSelector(self):
+        organisms = self.organisms(4, 9, 1, 6)
+        selector = FitnessSelector(self.challenge)
+        self.assertEqual([org.digit.allele for org in selector.select(2, organisms)], [9, 6])
+        self.assertEqual(BatchDigitOrganism.batches, [4])
+        
         
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -26,6 +26,20 @@ class AgeSelectorTest(unittest.TestCase):
         self.assertEqual(len(orgs), 2)
         self.assertEqual(orgs, orgs2)
 
+    def testBirthGenerations(self):
+        # one organism per age, oldest first
+        for age, org in enumerate(self.population):
+            org.age = 10 - age
+        
+        orgs = self.selector.select(3, self.population)
+        self.assertEqual(orgs, list(self.population)[:-4:-1])
+        self.assertEqual([org.age for org in orgs], [1, 2, 3])
+        
+        # ties keep the order of the population
+        self.population[0].age = 1
+        orgs = self.selector.select(2, self.population)
+        self.assertEqual(orgs, [self.population[0], self.population[9]])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
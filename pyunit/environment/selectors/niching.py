@@ -0,0 +1,92 @@
+# $Revision: 1.1 $
+
+from genetics.challenge import Challenge
+from genetics.population import Population
+from genetics.selectors.fitness import FitnessSelector
+from genetics.selectors.niching import SharingSelector
+from genetics.selectors.randomized import RandomSelector
+from genetics.util.distance import HammingDistance
+from pyunit.util.distance import BitsOrganism
+import unittest
+
+
+class OnesOrganism(BitsOrganism):
+    '''
+    A bit string organism whose fitness is its number of set bits
+    '''
+    def ones(self):
+        return float(sum(self.bits.alleles))
+    
+    phenotypes = {Challenge: ones}
+
+
+class SharingSelectorTest(unittest.TestCase):
+    def setUp(self):
+        self.challenge = Challenge()
+        
+        # a crowded peak of nine copies and one lonely, slightly worse organism
+        self.crowded = [OnesOrganism([1] * 8 + [0] * 2) for i in xrange(9)] #@UnusedVariable
+        self.lonely  = OnesOrganism([0] * 3 + [1] * 7)
+        self.population = self.crowded + [self.lonely]
+        self.distance   = HammingDistance('bits')
+
+    def testNicheCounts(self):
+        selector = SharingSelector(self.challenge, self.distance, radius=4, sample=10)
+        counts = selector.niche_counts(self.population)
+        self.assertEqual(counts.tolist(), [9.0] * 9 + [1.0])
+        
+    def testSharing(self):
+        self.assertTrue(FitnessSelector(self.challenge).select(1, self.population)[0] 
+                        is not self.lonely)
+        
+        selector = SharingSelector(self.challenge, self.distance, radius=4)
+        self.assertTrue(selector.select(1, self.population)[0] is self.lonely)
+        
+    def testSampledRadius(self):
+        selector = SharingSelector(self.challenge, self.distance, sample=3)
+        self.assertEqual(len(selector.fitness_keys(self.population)), 10)
+        self.assertEqual(selector.fitness_keys([]), [])
+        self.assertEqual(selector.sampled_radius(selector.distance.between(
+            self.distance.rows(self.crowded), self.distance.rows(self.crowded))), 1.0)
+
+
+
+class CrowdingPopulation(Population):
+    '''
+    A population ranked by fitness whose children all land on the crowded 
+    peak, and whose survivors are selected by shared fitness
+    '''
+    challenge = Challenge()
+    
+    size = 10
+    mating_pool_selector = RandomSelector(challenge)
+    mating_pool_size     = 2
+    survivor_selector    = SharingSelector(challenge, HammingDistance('bits'), radius=4)
+    ranked_by            = challenge
+    
+    def vary(self):
+        self.organisms.extend([OnesOrganism([1] * 8 + [0] * 2) for i in xrange(5)]) #@UnusedVariable
+
+
+class SharingPopulationTest(unittest.TestCase):
+    def setUp(self):
+        self.lonely = OnesOrganism([0] * 3 + [1] * 7)
+        organisms = [OnesOrganism([1] * 8 + [0] * 2) for i in xrange(9)] #@UnusedVariable
+        self.population = CrowdingPopulation(OnesOrganism, organisms + [self.lonely])
+        
+    def testSurvivors(self):
+        # truncating by fitness would drop the least fit, lonely organism
+        for i in xrange(3): #@UnusedVariable
+            self.population.cycle()
+            self.assertTrue(id(self.lonely) in map(id, self.population.organisms))
+            
+        index = self.population.index
+        self.assertEqual(len(index), self.population.size)
+        self.assertEqual(sorted(map(id, index.best(self.population.size))),
+                         sorted(map(id, self.population.organisms)))
+        self.assertTrue(self.population.best(CrowdingPopulation.challenge) 
+                        is not self.lonely)
+
+
+if __name__ == '__main__':
+    unittest.main()
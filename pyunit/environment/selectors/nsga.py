@@ -0,0 +1,66 @@
+# $Revision: 1.1 $
+
+from genetics.challenge import MultiObjectiveChallenge
+from genetics.organism import Organism
+from genetics.selectors.nsga import NSGASelector
+import unittest
+
+
+class WeightedChallenge(MultiObjectiveChallenge):
+    '''
+    A multi-objective challenge whose fitness is the sum of its objectives
+    '''
+    def fitness(self, organism):
+        return sum(self.objectives(organism))
+
+
+class TradeOffOrganism(Organism):
+    '''
+    An organism with two fixed objectives
+    '''
+    def __init__(self, first=0, second=0, *args, **kwargs):
+        self.values = (first, second)
+        super(TradeOffOrganism, self).__init__(*args, **kwargs)
+        
+    def objectives(self):
+        return self.values
+    
+    phenotypes = {MultiObjectiveChallenge: objectives, WeightedChallenge: objectives}
+
+
+class NSGASelectorTest(unittest.TestCase):
+    def setUp(self):
+        self.challenge  = MultiObjectiveChallenge()
+        self.population = [TradeOffOrganism(*values) for values in 
+            [(0, 0), (0, 4), (1, 3), (2, 2), (3, 1), (4, 0), (1, 1)]]
+        
+    def testFitness(self):
+        self.assertEqual(self.challenge.fitness(self.population[2]), (1, 3))
+    
+    def testSurvivors(self):
+        selector = NSGASelector(self.challenge)
+        
+        # the ends of the first front are infinitely far apart
+        selected = selector.select(2, self.population)
+        self.assertEqual(selected, [self.population[1], self.population[5]])
+        
+        # the first front before anything else, the last organism last
+        selected = selector.select(7, self.population)
+        self.assertEqual(set(selected[:5]), set(self.population[1:6]))
+        self.assertEqual(selected[5:], [self.population[6], self.population[0]])
+        
+    def testOverriddenFitness(self):
+        # fronts are found on the objectives, not on fitness
+        selected = NSGASelector(WeightedChallenge()).select(2, self.population)
+        self.assertEqual(selected, [self.population[1], self.population[5]])
+        
+    def testTournament(self):
+        selector = NSGASelector(self.challenge, tournament=7)
+        selected = selector.select(20, self.population)
+        self.assertEqual(len(selected), 20)
+        self.assertTrue(id(self.population[0]) not in set(map(id, selected)))
+        self.assertEqual(selector.select(0, self.population), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,12 +40,17 @@ class SamplingSelectorTest(unittest.TestCase):
         self.assertEqual(len(selector.scale(self.population)), self.population.size)
         self.assertEqual(len(selector.select(2, self.population)), 2)
         
+        # universal sampling never picks fewer than the expected count, rounded down
+        expected = int(10 * selector.scale(self.population)[r])
+        self.assertTrue(selector.select(10, self.population).count(org) >= expected)
+        
     def testLinearRanking(self):
         selector = LinearRankingSelector(self.challenge)
         self.assertEqual(len(selector.scale(self.population)), self.population.size)
         self.assertEqual(len(selector.select(2, self.population)), 2)
         self.assertTrue(selector.pressure in selector._cache)
         self.assertTrue(self.population.size in selector._cache[selector.pressure])
+        self.assertTrue((selector.pressure, self.population.size) in selector._cumulative)
         
     def testExponentialRanking(self):
         selector = ExponentialRankingSelector(self.challenge)
@@ -1,7 +1,8 @@
 # $Revision: 1.3 $
 
 from genetics.challenge import Challenge
-from genetics.selectors.tournament import TournamentSelector
+from genetics.selectors.tournament import (TournamentSelector,
+    FitnessTournamentSelector)
 from pyunit.base.organisms import AgeFitnessOrganism
 from pyunit.base.populations import SmallPopulation
 import random, unittest
@@ -35,5 +36,52 @@ class TournamentSelectorTest(unittest.TestCase):
         self.assertEqual(self.selector.compete(list), 100)
 
 
+class FitnessTournamentSelectorTest(unittest.TestCase):
+    def setUp(self):
+        self.population = SmallPopulation(AgeFitnessOrganism)
+        self.challenge  = Challenge()
+        
+        # make one organism more fit
+        self.org = self.population[random.randint(0, 9)]
+        self.org.age = 10
+    
+    def testWithoutReplacement(self):
+        # every tournament includes the whole population
+        selector = FitnessTournamentSelector(self.challenge, 10)
+        orgs = selector.select(5, self.population)
+        self.assertEqual(len(orgs), 5)
+        self.assertEqual(orgs, [self.org] * 5)
+
+    def testContestants(self):
+        selector = FitnessTournamentSelector(self.challenge, 3)
+        index = selector.contestants(100, 10)
+        self.assertEqual(index.shape, (100, 3))
+        for row in index.tolist():
+            self.assertEqual(len(set(row)), 3)
+        
+        # most of the population enters
+        selector = FitnessTournamentSelector(self.challenge, 7)
+        for row in selector.contestants(100, 10).tolist():
+            self.assertEqual(len(set(row)), 7)
+        
+        selector = FitnessTournamentSelector(self.challenge, 20)
+        index = selector.contestants(4, 10)
+        self.assertEqual(index.shape, (4, 10))
+        for row in index.tolist():
+            self.assertEqual(sorted(row), range(10))
+
+    def testWithReplacement(self):
+        selector = FitnessTournamentSelector(self.challenge, 3, replacement=True)
+        self.assertEqual(len(selector.select(20, self.population)), 20)
+        self.assertEqual(selector.contestants(4, 10).shape, (4, 3))
+    
+    def testProbabilistic(self):
+        # weaker organisms sometimes win a full-population tournament
+        selector = FitnessTournamentSelector(self.challenge, 10, probability=0.5)
+        orgs = selector.select(200, self.population)
+        self.assertTrue(self.org in orgs)
+        self.assertTrue(len(set(orgs)) > 1)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,8 +1,10 @@
 # $Revision: 1.5 $
 
+from genetics.challenge import Challenge
 from genetics.organism import Chromosome
 from pyunit.base.chromosomes import EmptyChromosome
-import unittest
+from pyunit.base.organisms import TwoChromosomeOrganism, WeightedOrderOrganism
+import gc, unittest
 
 
 class ChromosomeTest(unittest.TestCase):
@@ -30,9 +32,74 @@ class ChromosomeTest(unittest.TestCase):
 
 class OrganismTest(unittest.TestCase):
     '''
-    TODO: Tests the Organism base class
+    Tests the Organism base class
     '''
-    pass
+    def setUp(self):
+        self.organism1 = TwoChromosomeOrganism()
+        self.organism2 = TwoChromosomeOrganism()
+        
+    def testMutationRates(self):
+        child = self.organism1.mutate()
+        self.assertTrue(child.first is not self.organism1.first)
+        self.assertTrue(child.second is self.organism1.second)
+        
+    def testCrossoverRates(self):
+        child1, child2 = self.organism1.crossover(self.organism2)
+        self.assertEqual(child1.first.allele, 1)
+        self.assertTrue(child1.second is self.organism1.second)
+        self.assertTrue(child2.second is self.organism2.second)
+        
+    def testChromosomeCached(self):
+        decodes = TwoChromosomeOrganism.decodes
+        self.organism1.decode_second()
+        self.organism1.mutate().decode_second()
+        self.assertEqual(TwoChromosomeOrganism.decodes, decodes + 1)
+
+
+class DeltaDecodeTest(unittest.TestCase):
+    '''
+    Tests decoding children from the phenotypes of their parents
+    '''
+    def setUp(self):
+        self.challenge = Challenge()
+        WeightedOrderOrganism.decodes = WeightedOrderOrganism.deltas = 0
+        
+    def testMove(self):
+        parent = WeightedOrderOrganism()
+        child  = parent.mutate()
+        name, kind, i, j = child.move
+        self.assertEqual((name, kind), ('order', 'swap'))
+        
+        alleles = list(parent.order.alleles)
+        alleles[i], alleles[j] = alleles[j], alleles[i]
+        self.assertEqual(tuple(alleles), child.order.alleles)
+        
+    def testDelta(self):
+        organism = WeightedOrderOrganism()
+        self.challenge.fitness(organism)
+        for k in xrange(20): #@UnusedVariable
+            child = organism.mutate()
+            self.assertEqual(self.challenge.fitness(child), child.weighted_sum())
+            organism = child
+        
+        # only the first organism is decoded in full, and once per check
+        self.assertEqual(WeightedOrderOrganism.deltas, 20)
+        self.assertEqual(WeightedOrderOrganism.decodes, 21)
+        
+    def testUndecodedParent(self):
+        parent = WeightedOrderOrganism()
+        child  = parent.mutate()
+        self.challenge.fitness(child)
+        self.assertEqual((WeightedOrderOrganism.deltas, WeightedOrderOrganism.decodes), (0, 1))
+        
+    def testDeadParent(self):
+        parent = WeightedOrderOrganism()
+        self.challenge.fitness(parent)
+        child  = parent.mutate()
+        del parent
+        gc.collect()
+        self.challenge.fitness(child)
+        self.assertEqual(WeightedOrderOrganism.deltas, 0)
 
             
 if __name__ == '__main__':
@@ -1,7 +1,8 @@
 # $Revision: 1.2 $
 
 from genetics.chromosomes.discrete import DiscreteChromosome
-from pyunit.base.chromosomes import OneToTenDiscreteChromosome
+from pyunit.base.chromosomes import (OneToTenDiscreteChromosome, 
+    ColorDiscreteChromosome)
 import unittest
 
 
@@ -22,6 +23,13 @@ class DiscreteChromsomeTest(unittest.TestCase):
     def testInvariant(self):
         x = 'not in values'
         self.assertEqual(DiscreteChromosome(x, invariant=True).allele, x)
+        
+    def testCodebook(self):
+        red = ColorDiscreteChromosome.from_value('red')
+        self.assertEqual(red.allele, 0)
+        self.assertEqual(red.decode(), 'red')
+        self.assertRaises(ValueError, ColorDiscreteChromosome, 3)
+        self.assertTrue(red.mutate_reset().decode() in ColorDiscreteChromosome.codebook)
     
     
 if __name__ == '__main__':
@@ -1,9 +1,17 @@
 # $Revision: 1.9 $
 
 from genetics.chromosomes.permutation import PermutationChromosome
+from genetics.util.structures import Codebook
 import unittest
 
 
+class LetterPermutation(PermutationChromosome):
+    '''
+    A permutation of letters stored as codes
+    '''
+    codebook = Codebook('abcdefgh')
+
+
 class EmptyPermutationTest(unittest.TestCase):
     '''
     Tests empty permutation chromosomes
@@ -110,5 +118,31 @@ class MultiplePermutationTest(unittest.TestCase):
         self.assertEqual(p1._build_pmx_permutation(p1, p2, 1, 2), [0,5,6])
         
         
+class CodedPermutationTest(unittest.TestCase):
+    '''
+    Tests permutations with a codebook
+    '''
+    def setUp(self):
+        self.permutation1 = LetterPermutation.from_values('abcdefgh')
+        self.permutation2 = LetterPermutation.from_values('hgfedcba')
+        
+    def testDecode(self):
+        self.assertEqual(self.permutation1.alleles, (0, 1, 2, 3, 4, 5, 6, 7))
+        self.assertEqual(''.join(self.permutation2.decode()), 'hgfedcba')
+        
+    def testTables(self):
+        self.assertEqual(self.permutation2._index_by_value(), [7, 6, 5, 4, 3, 2, 1, 0])
+        self.assertEqual(self.permutation1._edge_table()[0], [7, 1])
+        self.assertEqual(self.permutation1._double_edge_table(self.permutation2)[0], [7, 1])
+        
+    def testCrossovers(self):
+        for crossover in (self.permutation1.crossover_cycle,
+                          self.permutation1.crossover_edge,
+                          self.permutation1.crossover_order,
+                          self.permutation1.crossover_pmx):
+            for child in crossover(self.permutation2):
+                self.assertEqual(sorted(child.decode()), list('abcdefgh'))
+        
+        
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+# $Revision: 1.1 $
+
+from genetics.chromosomes.subset import SubsetChromosome, SparseSubsetChromosome
+import random, unittest
+
+
+class TenItemSubset(SubsetChromosome):
+    '''
+    A subset of 10 items where item i costs i and is worth 2i
+    '''
+    size   = 10
+    costs  = range(10)
+    values = range(0, 20, 2)
+
+
+class TenItemSparseSubset(SparseSubsetChromosome):
+    '''
+    The same as TenItemSubset, but sparse
+    '''
+    size   = 10
+    costs  = range(10)
+    values = range(0, 20, 2)
+
+
+class SubsetChromosomeTest(unittest.TestCase):
+    subset = TenItemSubset
+    
+    def setUp(self):
+        self.subset1 = self.subset((1, 4, 7))
+        self.subset2 = self.subset([7, 4, 1])
+        self.subset3 = self.subset((1, 5, 9))
+        self.empty   = self.subset()
+        self.full    = self.subset(range(10))
+    
+    def testCmp(self):
+        self.assertEqual(self.subset1, self.subset2)
+        self.assertNotEqual(self.subset1, self.subset3)
+        
+    def testRange(self):
+        self.assertRaises(ValueError, self.subset, (10,))
+        self.assertRaises(ValueError, self.subset, (-1,))
+        
+    def testTotals(self):
+        self.assertEqual(self.subset1.count, 3)
+        self.assertEqual(self.subset1.cost, 12)
+        self.assertEqual(self.subset1.value, 24)
+        self.assertEqual(self.empty.cost, 0)
+        
+    def testContains(self):
+        self.assertTrue(4 in self.subset1)
+        self.assertTrue(5 not in self.subset1)
+    
+    def assertTotals(self, subset):
+        expected = self.subset(subset.members())
+        self.assertEqual(subset.count, expected.count)
+        self.assertEqual(subset.cost, expected.cost)
+        self.assertEqual(subset.value, expected.value)
+        
+    def testMutateAdd(self):
+        child = self.subset1.mutate_add()
+        self.assertEqual(child.count, 4)
+        self.assertTotals(child)
+        self.assertEqual(self.full.mutate_add(), self.full)
+        
+    def testMutateRemove(self):
+        child = self.subset1.mutate_remove()
+        self.assertEqual(child.count, 2)
+        self.assertTotals(child)
+        self.assertEqual(self.empty.mutate_remove(), self.empty)
+        
+    def testMutateSwap(self):
+        child = self.subset1.mutate_swap()
+        self.assertEqual(child.count, 3)
+        self.assertNotEqual(child, self.subset1)
+        self.assertTotals(child)
+        self.assertEqual(self.full.mutate_swap(), self.full)
+        
+    def testCrossoverIntersection(self):
+        child1, child2 = self.subset1.crossover_intersection(self.subset3)
+        self.assertTrue(1 in child1 and 1 in child2)
+        self.assertEqual(child1.count + child2.count, 6)
+        self.assertEqual(child1.cost + child2.cost, 
+                         self.subset1.cost + self.subset3.cost)
+        self.assertRaises(TypeError, self.subset1.crossover_intersection, self)
+        
+    def testSeeded(self):
+        # random.seed reproduces crossovers
+        children = []
+        for i in xrange(2): #@UnusedVariable
+            random.seed(11)
+            children.append([child.members() for child in 
+                             self.subset1.crossover_intersection(self.subset3)])
+        self.assertEqual(children[0], children[1])
+        
+    def testUnchangedChild(self):
+        child = self.full.mutate_add()
+        self.assertEqual(child.count, 10)
+        self.assertTotals(child)
+        self.assertTrue(child.content_key() is self.full.content_key() or
+                        child.bitmap is self.full.bitmap)
+        
+        
+class SparseSubsetChromosomeTest(SubsetChromosomeTest):
+    subset = TenItemSparseSubset
+    
+    
+if __name__ == '__main__':
+    unittest.main()
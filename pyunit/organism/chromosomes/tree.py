@@ -0,0 +1,87 @@
+# $Revision: 1.1 $
+
+from genetics.chromosomes.tree import TreeChromosome, SubtreeCache, protected_divide
+import numpy, unittest
+
+
+class XYTree(TreeChromosome):
+    '''
+    A tree over two variables with small random trees
+    '''
+    terminals = ('x', 'y')
+    depth     = 3
+    max_depth = 5
+
+
+class TreeChromosomeTest(unittest.TestCase):
+    def setUp(self):
+        self.tree1 = XYTree(('add', 'x', ('mul', 'y', 2.0)))
+        self.tree2 = XYTree(('add', 'x', ('mul', 'y', 2.0)))
+        self.tree3 = XYTree(('sub', ('div', 'x', 'y'), 'y'))
+        
+    def testCmp(self):
+        self.assertEqual(self.tree1, self.tree2)
+        self.assertNotEqual(self.tree1, self.tree3)
+        
+    def testSource(self):
+        self.assertEqual(self.tree1.source(), 'add(x, mul(y, 2.0))')
+        self.assertEqual(self.tree1.nodes(), 5)
+        
+    def testEvaluate(self):
+        self.assertEqual(self.tree1.evaluate(x=1.0, y=3.0), 7.0)
+        self.assertEqual(self.tree3.evaluate({'x': 1.0, 'y': 0.0}), 1.0)
+        
+        xs, ys = numpy.arange(5.0), numpy.ones(5)
+        self.assertTrue(numpy.array_equal(self.tree1.evaluate(x=xs, y=ys), xs + 2))
+        
+    def testProtectedDivide(self):
+        self.assertTrue(numpy.array_equal(protected_divide((1, 4), (0, 2)), (1, 2)))
+        
+    def testRandom(self):
+        for i in xrange(50): #@UnusedVariable
+            tree = XYTree()
+            self.assertTrue(tree._depth(tree.tree) <= XYTree.depth)
+            tree.evaluate(x=1.0, y=2.0)
+            
+    def testMutate(self):
+        for i in xrange(50): #@UnusedVariable
+            for child in self.tree1.mutate_point(), self.tree1.mutate_subtree():
+                self.assertTrue(child._depth(child.tree) <= XYTree.max_depth)
+                child.evaluate(x=1.0, y=2.0)
+        
+        # point mutation keeps the shape of the tree
+        self.assertEqual(self.tree1.mutate_point().nodes(), 5)
+        
+    def testCrossover(self):
+        for i in xrange(50): #@UnusedVariable
+            child1, child2 = self.tree1.crossover_subtree(self.tree3)
+            self.assertEqual(child1.nodes() + child2.nodes(), 10)
+            self.assertTrue(child1._depth(child1.tree) <= XYTree.max_depth)
+        self.assertRaises(TypeError, self.tree1.crossover_subtree, self)
+        
+        
+class SubtreeCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.xs, self.ys = numpy.arange(10.0), numpy.arange(10.0, 20.0)
+        self.cache = SubtreeCache(XYTree, {'x': self.xs, 'y': self.ys})
+        
+    def testEvaluate(self):
+        tree = XYTree(('add', 'x', ('mul', 'y', 2.0)))
+        self.assertTrue(numpy.array_equal(self.cache.evaluate(tree), 
+                                          tree.evaluate(x=self.xs, y=self.ys)))
+        
+    def testSharedSubtrees(self):
+        self.cache.evaluate(XYTree(('add', 'x', ('mul', 'y', 2.0))))
+        misses = self.cache.misses
+        
+        # mul(y, 2.0) is a new object but the same structure
+        self.cache.evaluate(XYTree(('sub', ('mul', 'y', 2.0), 'x')))
+        self.assertEqual(self.cache.misses, misses + 1)
+        self.assertEqual(len(self.cache), 6)
+        
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        
+        
+if __name__ == '__main__':
+    unittest.main()
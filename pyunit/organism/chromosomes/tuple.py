@@ -135,6 +135,24 @@ class MultipleTupleTest(unittest.TestCase):
         self.assertEqual(len(p), 3)
         self.assertTrue(4 in p and 5 in p and 6 in p)
         
+    def testMoves(self):
+        parent = TupleChromosome(alleles=range(10))
+        for mutate in (parent.mutate_swap, parent.mutate_insert, parent.mutate_invert):
+            for k in xrange(20): #@UnusedVariable
+                child = mutate()
+                kind, i, j = child.move
+                alleles = list(parent.alleles)
+                if kind == 'swap':
+                    alleles[i], alleles[j] = alleles[j], alleles[i]
+                elif kind == 'insert':
+                    alleles.insert(j, alleles.pop(i))
+                else:
+                    alleles[i:j+1] = reversed(alleles[i:j+1])
+                self.assertEqual(tuple(alleles), child.alleles)
+        
+        self.assertEqual(parent.mutate_scramble().move, None)
+        self.assertEqual(self.tuple2a.mutate_insert().move, None)
+        
     def testCrossOverCut(self):
         p1, p2 = self.tuple2a.crossover_one_point(self.tuple2b)
         self.assertEqual(len(p1.alleles), p1.size, 2)
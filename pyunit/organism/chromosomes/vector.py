@@ -0,0 +1,110 @@
+# $Revision: 1.1 $
+
+from genetics.chromosomes.vector import (IntegerVectorChromosome,
+    CategoricalVectorChromosome)
+import numpy, unittest
+
+
+class BoundedIntegerVector(IntegerVectorChromosome):
+    '''
+    An integer vector with different bounds for each gene
+    '''
+    lower_bound = (0, -5, 10)
+    upper_bound = (3,  5, 10)
+
+
+class ColorSizeVector(CategoricalVectorChromosome):
+    '''
+    A categorical vector with a color gene and a size gene
+    '''
+    values = (('red', 'green', 'blue'), ('small', 'large'))
+
+
+class IntegerVectorChromosomeTest(unittest.TestCase):
+    def setUp(self):
+        self.vector1 = IntegerVectorChromosome((1, 2, 3))
+        self.vector2 = IntegerVectorChromosome([1.0, 2.0, 3.0])
+        self.vector3 = IntegerVectorChromosome((4, 5, 6))
+        self.bounded = BoundedIntegerVector((0, 0, 10))
+        
+    def testCmp(self):
+        self.assertEqual(self.vector1, self.vector2)
+        self.assertTrue(self.vector1 < self.vector3)
+        
+    def testReadOnly(self):
+        self.assertRaises(ValueError, self.vector1.alleles.__setitem__, 0, 5)
+        
+    def testZeroCopy(self):
+        child = IntegerVectorChromosome(self.vector1.alleles, invariant=True)
+        self.assertTrue(child.alleles is self.vector1.alleles)
+        
+    def testBounds(self):
+        self.assertRaises(ValueError, BoundedIntegerVector, (4, 0, 10))
+        self.assertRaises(ValueError, BoundedIntegerVector, (0, -6, 10))
+        self.assertRaises(ValueError, BoundedIntegerVector, (0, 0, 9))
+        
+    def testMutateCreep(self):
+        child = self.vector1.mutate_creep()
+        self.assertEqual(child.size, 3)
+        self.assertTrue((abs(child.alleles - self.vector1.alleles) <= 1).all())
+        
+        for i in xrange(100): #@UnusedVariable
+            alleles = self.bounded.mutate_creep().alleles
+            self.assertTrue((alleles >= BoundedIntegerVector.lower_bound).all())
+            self.assertTrue((alleles <= BoundedIntegerVector.upper_bound).all())
+            
+    def testMutateReset(self):
+        self.assertRaises(ValueError, self.vector1.mutate_reset)
+        for i in xrange(100): #@UnusedVariable
+            alleles = self.bounded.mutate_reset().alleles
+            self.assertTrue((alleles >= BoundedIntegerVector.lower_bound).all())
+            self.assertTrue((alleles <= BoundedIntegerVector.upper_bound).all())
+            
+    def testCrossover(self):
+        for crossover in (self.vector1.crossover_one_point, 
+                          self.vector1.crossover_two_point,
+                          self.vector1.crossover_uniform):
+            p1, p2 = crossover(self.vector3)
+            self.assertEqual(p1.size, 3)
+            self.assertTrue(numpy.array_equal(p1.alleles + p2.alleles, (5, 7, 9)))
+            
+    def testCrossoverDifferentLengths(self):
+        other = IntegerVectorChromosome((1, 2))
+        self.assertRaises(ValueError, self.vector1.crossover_uniform, other)
+        self.assertRaises(TypeError, self.vector1.crossover_uniform, self)
+        
+
+class CategoricalVectorChromosomeTest(unittest.TestCase):
+    def setUp(self):
+        self.vector1 = ColorSizeVector((2, 0))
+        self.vector2 = ColorSizeVector.from_values(('blue', 'small'))
+        self.vector3 = ColorSizeVector.from_values(('red', 'large'))
+        
+    def testCmp(self):
+        self.assertEqual(self.vector1, self.vector2)
+        self.assertNotEqual(self.vector1, self.vector3)
+        
+    def testCodes(self):
+        self.assertEqual(self.vector1.alleles.dtype, numpy.uint8)
+        self.assertRaises(ValueError, ColorSizeVector, (3, 0))
+        self.assertRaises(ValueError, ColorSizeVector, (0, 0, 0))
+        self.assertRaises(ValueError, ColorSizeVector.from_values, ('red', 'huge'))
+        
+    def testDecode(self):
+        self.assertEqual(self.vector1.decode(), ('blue', 'small'))
+        self.assertEqual(self.vector3.decode(), ('red', 'large'))
+        
+    def testMutateReset(self):
+        for i in xrange(100): #@UnusedVariable
+            color, size = self.vector1.mutate_reset().decode()
+            self.assertTrue(color in ColorSizeVector.values[0])
+            self.assertTrue(size in ColorSizeVector.values[1])
+            
+    def testCrossover(self):
+        p1, p2 = self.vector1.crossover_uniform(self.vector3)
+        self.assertEqual(type(p1), ColorSizeVector)
+        self.assertEqual(sorted([p1.decode()[0], p2.decode()[0]]), ['blue', 'red'])
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,8 @@
 from pyunit.environment.base import * #@UnusedWildImport
 from pyunit.environment.selectors.age import * #@UnusedWildImport
 from pyunit.environment.selectors.fitness import * #@UnusedWildImport
+from pyunit.environment.selectors.niching import * #@UnusedWildImport
+from pyunit.environment.selectors.nsga import * #@UnusedWildImport
 from pyunit.environment.selectors.randomized import * #@UnusedWildImport
 from pyunit.environment.selectors.sampled import * #@UnusedWildImport
 from pyunit.environment.selectors.tournament import * #@UnusedWildImport
@@ -12,7 +14,18 @@ from pyunit.organism.chromosomes.discrete import * #@UnusedWildImport
 from pyunit.organism.chromosomes.float import * #@UnusedWildImport
 from pyunit.organism.chromosomes.integer import * #@UnusedWildImport
 from pyunit.organism.chromosomes.permutation import * #@UnusedWildImport
+from pyunit.organism.chromosomes.subset import * #@UnusedWildImport
+from pyunit.organism.chromosomes.tree import * #@UnusedWildImport
 from pyunit.organism.chromosomes.tuple import * #@UnusedWildImport
+from pyunit.organism.chromosomes.vector import * #@UnusedWildImport
+from pyunit.util.cache import * #@UnusedWildImport
+from pyunit.util.dataset import * #@UnusedWildImport
+from pyunit.util.distance import * #@UnusedWildImport
+from pyunit.util.lineage import * #@UnusedWildImport
+from pyunit.util.mating import * #@UnusedWildImport
+from pyunit.util.pareto import * #@UnusedWildImport
+from pyunit.util.shared import * #@UnusedWildImport
+from pyunit.util.store import * #@UnusedWildImport
 from pyunit.util.structures import * #@UnusedWildImport
 import unittest #@Reimport
 
@@ -0,0 +1,130 @@
+# $Revision: 1.1 $
+
+from genetics.challenge import Challenge
+from genetics.util.cache import Cache, registry
+from genetics.util.decorators import cached, memoize
+from pyunit.base.organisms import AgeFitnessOrganism
+import gc, unittest
+
+
+class Memoized(object):
+    '''
+    An object with bounded and weak memoized methods
+    '''
+    calls = 0
+    
+    @memoize('_test_bounded', size=2)
+    def bounded(self, key):
+        type(self).calls += 1
+        return key * 2
+    
+    @cached('_test_cached')
+    def constant(self):
+        return 42
+
+
+class CacheTest(unittest.TestCase):
+    '''
+    Tests bounded caches and their statistics
+    '''
+    def setUp(self):
+        registry.reset()
+        
+    def tearDown(self):
+        registry.enable(False)
+        
+    def testLRU(self):
+        cache = Cache('_test_lru', size=2)
+        cache['a'], cache['b'] = 1, 2
+        self.assertEqual(cache['a'], 1)
+        
+        # b is the least recently used now
+        cache['c'] = 3
+        self.assertEqual(sorted(cache), ['a', 'c'])
+        self.assertEqual(cache.get('b'), None)
+        
+        stats = registry.report()['_test_lru']
+        self.assertEqual(stats, {'hits': 1, 'misses': 1, 'evictions': 1})
+        self.assertAlmostEqual(cache.statistics.hit_rate(), 0.5)
+        
+    def testBytes(self):
+        cache = Cache('_test_bytes', bytes=10, sizeof=len)
+        cache[1] = 'x' * 6
+        cache[2] = 'y' * 6
+        self.assertEqual(list(cache), [2])
+        self.assertEqual(cache.used(), 6)
+        
+        # the newest entry is kept even if it is too big
+        cache[3] = 'z' * 20
+        self.assertEqual(list(cache), [3])
+        del cache[3]
+        self.assertEqual((len(cache), cache.used()), (0, 0))
+        
+    def testWeak(self):
+        cache = Cache('_test_weak', weak=True)
+        challenge = Challenge()
+        cache[challenge] = 'phenotype'
+        self.assertTrue(challenge in cache)
+        self.assertEqual(cache[challenge], 'phenotype')
+        
+        del challenge
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.statistics.evictions, 1)
+        
+    def testRegistryLimits(self):
+        registry.limit('_test_limited', size=1)
+        cache = Cache('_test_limited')
+        cache[1], cache[2] = 1, 2
+        self.assertEqual(list(cache), [2])
+        self.assertEqual(Cache('_test_limited', size=3).size, 3)
+        
+    def testDecorators(self):
+        registry.enable()
+        memoized = Memoized()
+        for key in (1, 2, 1, 3, 1):
+            self.assertEqual(memoized.bounded(key), key * 2)
+        self.assertEqual(len(memoized._test_bounded), 2)
+        self.assertEqual(Memoized.calls, 3)
+        
+        memoized.constant()
+        memoized.constant()
+        report = registry.report()
+        self.assertEqual(report['_test_bounded']['evictions'], 1)
+        self.assertEqual(report['_test_cached'], {'hits': 1, 'misses': 1, 'evictions': 0})
+        
+        # decorators are not counted unless statistics are enabled
+        registry.enable(False)
+        memoized.constant()
+        memoized.bounded(3)
+        self.assertEqual(registry.report()['_test_cached']['hits'], 1)
+        self.assertEqual(registry.report()['_test_bounded']['hits'], 2)
+        
+    def testPhenotypes(self):
+        organism  = AgeFitnessOrganism()
+        challenge = Challenge()
+        self.assertEqual(challenge.fitness(organism), 1)
+        self.assertEqual(len(organism._decoded_phenotypes), 1)
+        
+        del challenge
+        gc.collect()
+        self.assertEqual(len(organism._decoded_phenotypes), 0)
+        
+    def testNoCycles(self):
+        # decode caches are freed without the garbage collector
+        challenge = Challenge()
+        organisms = [AgeFitnessOrganism() for i in xrange(10)] #@UnusedVariable
+        for organism in organisms:
+            challenge.fitness(organism)
+        
+        gc.collect()
+        gc.disable()
+        try:
+            del organisms, organism
+            self.assertEqual(gc.collect(), 0)
+        finally:
+            gc.enable()
+
+
+if __name__ == '__main__':
+    unittest.main()
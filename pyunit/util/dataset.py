@@ -0,0 +1,72 @@
+# $Revision: 1.1 $
+
+from genetics.util.dataset import Dataset
+import cPickle, multiprocessing, numpy, shutil, tempfile, unittest
+
+
+def total(dataset, name, results):
+    results.put(float(dataset[name].sum()))
+
+
+class DatasetTest(unittest.TestCase):
+    '''
+    Tests memory mapped datasets
+    '''
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.dataset = Dataset.create(self.path, x=numpy.arange(10.0),
+                                      y=numpy.ones((3, 4), dtype=numpy.int32))
+        
+    def tearDown(self):
+        self.dataset.close()
+        shutil.rmtree(self.path)
+        
+    def testArrays(self):
+        self.assertEqual(self.dataset.names(), ['x', 'y'])
+        self.assertEqual(self.dataset['x'].tolist(), range(10))
+        self.assertEqual((self.dataset['y'].shape, self.dataset['y'].dtype),
+                         ((3, 4), numpy.int32))
+        self.assertTrue(isinstance(self.dataset['x'], numpy.memmap))
+        self.assertTrue(self.dataset['x'] is self.dataset['x'])
+        self.assertTrue('z' not in self.dataset)
+        self.assertRaises(KeyError, self.dataset.__getitem__, 'z')
+        
+    def testReadOnly(self):
+        x = self.dataset['x']
+        self.assertRaises((ValueError, RuntimeError), x.__setitem__, 0, 5.0)
+        
+    def testAllocate(self):
+        z = Dataset.allocate(self.path, 'z', (2, 2), numpy.int64)
+        z[0] = 7
+        z.flush()
+        del z
+        self.assertEqual(self.dataset['z'].tolist(), [[7, 7], [0, 0]])
+        self.assertRaises(ValueError, Dataset.allocate, self.path, 'x', (2,))
+        
+    def testReplace(self):
+        # a mapped array is left whole when it is replaced
+        x = self.dataset['x']
+        Dataset.create(self.path, x=numpy.zeros(3))
+        self.assertEqual(x.tolist(), range(10))
+        self.assertEqual(Dataset(self.path)['x'].tolist(), [0.0] * 3)
+        self.assertEqual(self.dataset.names(), ['x', 'y'])
+        
+    def testPickle(self):
+        self.dataset['x']
+        pickled = cPickle.dumps(self.dataset, cPickle.HIGHEST_PROTOCOL)
+        self.assertTrue(len(pickled) < 200)
+        self.assertEqual(cPickle.loads(pickled)['x'].sum(), 45.0)
+        
+    def testProcesses(self):
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=total, args=(self.dataset, name, results))
+                   for name in ('x', 'y')]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(sorted([results.get(), results.get()]), [12.0, 45.0])
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# $Revision: 1.1 $
+
+from genetics.chromosomes.bitstring import BitStringChromosome
+from genetics.chromosomes.permutation import PermutationChromosome
+from genetics.organism import Organism
+from genetics.util.distance import (EuclideanDistance, HammingDistance, 
+    PositionDistance)
+import unittest
+
+
+class BitsOrganism(Organism):
+    '''
+    An organism with a bit string chromosome
+    '''
+    def __init__(self, bits=(), *args, **kwargs):
+        genotype = {'bits': BitStringChromosome(bits)}
+        super(BitsOrganism, self).__init__(genotype, *args, **kwargs)
+
+
+class DistanceTest(unittest.TestCase):
+    '''
+    Tests distances between encoded chromosomes
+    '''
+    def testHamming(self):
+        distance  = HammingDistance('bits')
+        organisms = [BitsOrganism(bits) for bits in 
+            [[0] * 10, [1] * 10, [1, 0] * 5, [0] * 9 + [1]]]
+        rows = distance.rows(organisms)
+        self.assertEqual(rows.shape, (4, 2))
+        self.assertEqual(distance.between(rows, rows[:2]).tolist(),
+                         [[0, 10], [10, 0], [5, 5], [1, 9]])
+        self.assertEqual(distance.nearest(rows, rows[1:3]).tolist(), [1, 0, 1, 1])
+        
+    def testPosition(self):
+        distance = PositionDistance('order')
+        rows = distance.encode([('a', 'b', 'c', 'd'), ('b', 'a', 'c', 'd'),
+                                ('d', 'c', 'b', 'a')])
+        self.assertEqual(rows[1].tolist(), [1, 0, 2, 3])
+        self.assertEqual(distance.between(rows, rows[:1]).ravel().tolist(), [0, 2, 8])
+        
+        permutation = PermutationChromosome(('c', 'a', 'b'))
+        rows = distance.encode([permutation.alleles])
+        self.assertEqual(rows.tolist(), [[1, 2, 0]])
+        
+    def testEuclidean(self):
+        distance = EuclideanDistance('x', 'allele')
+        rows = distance.encode([0.0, 3.0, -4.0])
+        self.assertEqual(rows.shape, (3, 1))
+        self.assertEqual(distance.between(rows, rows[:2]).tolist(),
+                         [[0.0, 3.0], [3.0, 0.0], [4.0, 7.0]])
+        
+        rows = distance.encode([(0, 0), (3, 4)])
+        self.assertEqual(distance.between(rows, rows[:1]).ravel().tolist(), [0.0, 5.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# $Revision: 1.1 $
+
+from genetics.challenge import Challenge
+from genetics.util.lineage import LineageRecorder
+from pyunit.base.organisms import AgeFitnessOrganism
+from pyunit.base.populations import SmallPopulation
+import shutil, tempfile, unittest
+
+
+class LineageOrganism(AgeFitnessOrganism):
+    '''
+    An organism class for recording lineage
+    '''
+    pass
+
+
+class LineageRecorderTest(unittest.TestCase):
+    '''
+    Tests recording and querying lineage
+    '''
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.lineage = LineageRecorder(self.directory, buffer_size=4)
+        LineageOrganism.lineage = self.lineage
+        
+    def tearDown(self):
+        LineageOrganism.lineage = None
+        shutil.rmtree(self.directory)
+        
+    def testRecord(self):
+        parent1, parent2 = LineageOrganism(), LineageOrganism()
+        child = parent1.mutate()
+        self.assertEqual(self.lineage.parents(child.id), (parent1.id,))
+        
+        for child in parent1.crossover(parent2):
+            self.assertEqual(self.lineage.parents(child.id), (parent1.id, parent2.id))
+        
+        self.assertEqual(len(self.lineage), 3)
+        self.assertRaises(KeyError, self.lineage.parents, parent1.id)
+        
+    def testOverwrite(self):
+        LineageOrganism()
+        self.lineage.flush()
+        self.assertRaises(ValueError, LineageRecorder, self.directory)
+        self.assertEqual(len(LineageRecorder(self.directory, overwrite=True)), 0)
+        
+    def testSpill(self):
+        organism = LineageOrganism()
+        family = [organism]
+        for i in xrange(10): #@UnusedVariable
+            family.append(family[-1].mutate())
+        
+        # most of the records are on disk now
+        self.assertEqual(len(self.lineage), 10)
+        self.assertTrue(self.lineage._spilled >= 8)
+        self.assertEqual(self.lineage.parents(family[-1].id), (family[-2].id,))
+        
+        ancestors = set([o.id for o in family[:-1]])
+        self.assertEqual(self.lineage.ancestors(family[-1].id), ancestors)
+        self.assertEqual(self.lineage.ancestors(family[-1].id, generations=2),
+                         set([family[-2].id, family[-3].id]))
+    
+    def testPopulation(self):
+        population = SmallPopulation(LineageOrganism)
+        self.assertEqual(len(self.lineage), population.size)
+        
+        population.cycle()
+        records = self.lineage.lookup([o.id for o in population])
+        self.assertEqual(len(records), population.size)
+        self.assertTrue(set(records['generation'].tolist()) <= set([1, 2]))
+        
+        # records are stamped by the clock organisms age by, across solves
+        for i in xrange(2): #@UnusedVariable
+            population.solve(Challenge(), 3)
+        self.assertEqual(population.age, population.generation)
+        self.assertEqual(population.generation, 6)
+        records = self.lineage.lookup([o.id for o in population])
+        self.assertEqual(sorted(records['generation'].tolist()),
+                         sorted([o.born for o in population]))
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# $Revision: 1.1 $
+
+from genetics.util.mating import MatingPlan
+import random, unittest
+
+
+class MatingPlanTest(unittest.TestCase):
+    '''
+    Tests pairing parents and drawing mutation decisions
+    '''
+    def testPairs(self):
+        parents = range(11)
+        plan = MatingPlan(parents)
+        self.assertEqual(len(plan), 5)
+        
+        # each parent is used at most once and one is left out
+        mated = plan.first.tolist() + plan.second.tolist()
+        self.assertEqual(len(set(mated)), 10)
+        self.assertEqual([(p1, p2) for p1, p2, mutations in plan], #@UnusedVariable
+                         zip(plan.first.tolist(), plan.second.tolist()))
+        
+    def testMutations(self):
+        plan = MatingPlan(range(10), 0.0)
+        self.assertEqual(plan.mutations.shape, (5, 2))
+        self.assertFalse(plan.mutations.any())
+        
+        plan = MatingPlan(range(10), 1.0, children=3)
+        for p1, p2, mutations in plan: #@UnusedVariable
+            self.assertEqual(mutations, [True] * 3)
+            
+    def testSeeded(self):
+        # random.seed reproduces plans without seeding numpy
+        plans = []
+        for i in xrange(2): #@UnusedVariable
+            random.seed(5)
+            plan = MatingPlan(range(20), 0.5)
+            plans.append((plan.first.tolist(), plan.second.tolist(),
+                          plan.mutations.tolist()))
+        self.assertEqual(plans[0], plans[1])
+            
+    def testEmpty(self):
+        self.assertEqual(list(MatingPlan([])), [])
+        self.assertEqual(list(MatingPlan([1])), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# $Revision: 1.1 $
+
+from genetics.util.pareto import crowding_distance, non_dominated_sort
+import numpy, random, unittest
+
+
+def brute_force_fronts(objectives):
+    '''
+    Peels fronts off by comparing every pair of objective vectors
+    '''
+    fronts, remaining, front = {}, set(range(len(objectives))), 0
+    while remaining:
+        current = [i for i in remaining if not [j for j in remaining 
+            if (objectives[j] >= objectives[i]).all() and 
+               (objectives[j] > objectives[i]).any()]]
+        for i in current:
+            fronts[i] = front
+        remaining -= set(current)
+        front += 1
+    return [fronts[i] for i in xrange(len(objectives))]
+
+
+class NonDominatedSortTest(unittest.TestCase):
+    '''
+    Tests sorting objective vectors into Pareto fronts
+    '''
+    def testTwoObjectives(self):
+        objectives = [(1, 5), (2, 4), (2, 2), (1, 1), (3, 1), (2, 4)]
+        self.assertEqual(non_dominated_sort(objectives).tolist(), 
+                         [0, 0, 1, 2, 0, 0])
+    
+    def testOneObjective(self):
+        self.assertEqual(non_dominated_sort([3, 1, 3, 2]).tolist(), [0, 2, 0, 1])
+    
+    def testEmpty(self):
+        self.assertEqual(len(non_dominated_sort(numpy.empty((0, 3)))), 0)
+    
+    def testBruteForce(self):
+        for width in (2, 3, 4):
+            for i in xrange(5): #@UnusedVariable
+                objectives = numpy.array([[random.randint(0, 4) for j in xrange(width)] #@UnusedVariable
+                                          for k in xrange(25)]) #@UnusedVariable
+                self.assertEqual(non_dominated_sort(objectives).tolist(),
+                                 brute_force_fronts(objectives))
+
+
+class CrowdingDistanceTest(unittest.TestCase):
+    '''
+    Tests crowding distances within fronts
+    '''
+    def testDistance(self):
+        objectives = [(0, 4), (1, 3), (3, 1), (4, 0), (0, 0)]
+        fronts     = non_dominated_sort(objectives)
+        distance   = crowding_distance(objectives, fronts)
+        
+        self.assertEqual(fronts.tolist(), [0, 0, 0, 0, 1])
+        self.assertEqual(distance[[0, 3, 4]].tolist(), [numpy.inf] * 3)
+        self.assertAlmostEqual(distance[1], 1.5)
+        self.assertAlmostEqual(distance[2], 1.5)
+    
+    def testFlatObjective(self):
+        objectives = [(0, 1), (1, 1), (2, 1)]
+        distance = crowding_distance(objectives, [0, 0, 0])
+        self.assertAlmostEqual(distance[1], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# $Revision: 1.1 $
+
+from genetics.challenge import Challenge
+from genetics.util.cache import registry
+from genetics.util.shared import SharedCache, key_hash
+from pyunit.base.chromosomes import DigitChromosome
+from pyunit.base.organisms import DigitOrganism
+import multiprocessing, unittest
+
+
+def fill(cache, keys):
+    for key in keys:
+        cache[key] = key * 2
+
+
+class SharedCacheTest(unittest.TestCase):
+    '''
+    Tests the fixed size cache shared between processes
+    '''
+    def setUp(self):
+        registry.reset()
+        
+    def testValues(self):
+        cache = SharedCache('_test_shared', size=64)
+        cache['a'] = 3
+        cache[('b', 1)] = 1.5
+        self.assertEqual((cache['a'], cache[('b', 1)]), (3.0, 1.5))
+        self.assertEqual(cache.get('c', 'missing'), 'missing')
+        self.assertTrue('a' in cache and 'c' not in cache)
+        
+        cache['a'] = 4
+        self.assertEqual((cache['a'], len(cache)), (4.0, 2))
+        self.assertEqual(registry.report()['_test_shared'],
+                         {'hits': 3, 'misses': 1, 'evictions': 0})
+        
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        
+    def testWidth(self):
+        cache = SharedCache('_test_shared', size=16, width=2)
+        cache['a'] = (1, 2.5)
+        self.assertEqual(cache['a'], (1, 2.5))
+        self.assertTrue(isinstance(cache['a'][0], int))
+        
+    def testMismatch(self):
+        # values that do not fit a slot are not stored, and do not raise
+        cache = SharedCache('_test_shared', size=16, width=2)
+        for value in (1.0, (1.0, 2.0, 3.0), ('a', 'b'), [1.0, 2.0], 
+                      (True, 1.0), (2**60, 1.0)):
+            cache['a'] = value
+            self.assertTrue('a' not in cache)
+        
+    def testTypes(self):
+        cache = SharedCache('_test_shared', size=16)
+        cache['int'], cache['float'] = 3, 3.0
+        self.assertTrue(isinstance(cache['int'], int))
+        self.assertTrue(isinstance(cache['float'], float))
+        
+    def testBounded(self):
+        cache = SharedCache('_test_shared', size=8, stripes=2, probes=2)
+        fill(cache, range(100))
+        self.assertEqual(len(cache), 8)
+        self.assertEqual(cache.statistics.evictions, 92)
+        
+        # whatever survived has the right value
+        for key in range(100):
+            self.assertTrue(cache.get(key) in (None, key * 2.0))
+        
+    def testHash(self):
+        self.assertEqual(key_hash(('a', 1)), key_hash(('a', 1)))
+        self.assertNotEqual(key_hash(('a', 1)), key_hash(('a', 2)))
+        self.assertNotEqual(key_hash(None), 0)
+        self.assertEqual(key_hash(('a', 1)), -6560681175012735594)
+        
+        # keys are hashed by content, whatever the order of their sets
+        self.assertEqual(key_hash(frozenset(range(100))), 
+                         key_hash(frozenset(range(99, -1, -1))))
+        self.assertNotEqual(key_hash(1), key_hash('1'))
+        self.assertNotEqual(key_hash(('a', 'b')), key_hash(('ab',)))
+        
+        genome = DigitOrganism(genotype={'digit': DigitChromosome(7)}).genome_key()
+        self.assertEqual(key_hash(genome), key_hash((DigitOrganism, 7)))
+        self.assertRaises(TypeError, key_hash, object())
+        self.assertRaises(TypeError, key_hash, (1, {}))
+        
+    def testProcesses(self):
+        cache   = SharedCache('_test_shared', size=1024)
+        workers = [multiprocessing.Process(target=fill, args=(cache, range(i, 100, 4)))
+                   for i in xrange(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            
+        self.assertEqual([cache[key] for key in xrange(100)], range(0, 200, 2))
+        
+    def testPhenotypes(self):
+        challenge = Challenge()
+        challenge.shared_phenotypes = SharedCache('_test_shared', size=64)
+        organism = DigitOrganism(genotype={'digit': DigitChromosome(7)})
+        self.assertEqual(challenge.fitness(organism), 7)
+        
+        # another organism with the same genome finds the shared phenotype
+        other = DigitOrganism(genotype={'digit': DigitChromosome(7)})
+        self.assertTrue(other.genome_key() in challenge.shared_phenotypes)
+        self.assertEqual(challenge.fitness(other), 7.0)
+        self.assertEqual(challenge.shared_phenotypes.statistics.hits, 1)
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# $Revision: 1.1 $
+
+from genetics.challenge import Challenge
+from genetics.util.cache import registry
+from genetics.util.store import PhenotypeStore
+from pyunit.base.chromosomes import DigitChromosome
+from pyunit.base.organisms import DigitOrganism
+import os, shutil, tempfile, unittest
+
+
+class PhenotypeStoreTest(unittest.TestCase):
+    '''
+    Tests keeping phenotypes in a database between runs
+    '''
+    def setUp(self):
+        registry.reset()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'phenotypes.db')
+        
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        
+    def organisms(self, *digits):
+        return [DigitOrganism(genotype={'digit': DigitChromosome(digit)})
+                for digit in digits]
+        
+    def testReopen(self):
+        store = PhenotypeStore(self.path, 'digits', version=1)
+        store['a'] = (1, 'x')
+        self.assertEqual(store['a'], (1, 'x'))
+        store.close()
+        
+        store = PhenotypeStore(self.path, 'digits', version=1)
+        self.assertEqual(store['a'], (1, 'x'))
+        self.assertEqual(store.get('b'), None)
+        self.assertEqual(registry.report()['phenotype_store'],
+                         {'hits': 2, 'misses': 1, 'evictions': 0})
+        store.close()
+        
+    def testVersions(self):
+        store = PhenotypeStore(self.path, 'digits', version=1)
+        other = PhenotypeStore(self.path, 'others', version=1)
+        store['a'] = other['a'] = 1
+        store.close()
+        other.close()
+        
+        # a new version drops only its own challenge's phenotypes
+        store = PhenotypeStore(self.path, 'digits', version=2)
+        other = PhenotypeStore(self.path, 'others', version=1)
+        self.assertTrue('a' not in store)
+        self.assertTrue('a' in other)
+        
+        other.invalidate()
+        self.assertTrue('a' not in other)
+        store.close()
+        other.close()
+        
+    def testPrefetch(self):
+        store = PhenotypeStore(self.path, 'digits')
+        first, second = self.organisms(3, 4)
+        store[first.genome_key()] = 3
+        store.close()
+        
+        store = PhenotypeStore(self.path, 'digits')
+        store.prefetch([first, second])
+        
+        # both lookups are answered without the database
+        store._load = None
+        self.assertEqual(store[first.genome_key()], 3)
+        self.assertRaises(KeyError, store.__getitem__, second.genome_key())
+        store.close()
+        
+    def testClosed(self):
+        store = PhenotypeStore(self.path, 'digits')
+        store['a'] = 1
+        store.close()
+        
+        # nothing is stored or waited for after close
+        store['b'] = 2
+        store.flush()
+        store.prefetch(self.organisms(1))
+        self.assertEqual((store.get('a'), store.get('b')), (1, None))
+        
+    def testUnpicklable(self):
+        store = PhenotypeStore(self.path, 'digits')
+        store['a'] = lambda: 1
+        store['b'] = 2
+        self.assertEqual(store['a'](), 1)
+        store.close()
+        
+        store = PhenotypeStore(self.path, 'digits')
+        self.assertEqual((store.get('a'), store.get('b')), (None, 2))
+        store.close()
+        
+    def testPhenotypes(self):
+        challenge = Challenge()
+        challenge.phenotype_store = PhenotypeStore(self.path, 'digits')
+        self.assertEqual(challenge.fitness(self.organisms(5)[0]), 5)
+        challenge.phenotype_store.close()
+        
+        challenge.phenotype_store = PhenotypeStore(self.path, 'digits')
+        self.assertEqual(challenge.fitness(self.organisms(5)[0]), 5)
+        self.assertEqual(challenge.phenotype_store.statistics.hits, 1)
+        challenge.phenotype_store.close()
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 # $Revision: 1.1 $
 
-from genetics.util.structures import Queue
+from genetics.util.structures import Codebook, FitnessIndex, HallOfFame, Queue
+from pyunit.base.chromosomes import DigitChromosome
+from pyunit.base.organisms import DigitOrganism
+from pyunit.base.populations import challenge
 import unittest
 
 
@@ -19,6 +22,116 @@ class QueueTest(unittest.TestCase):
         self.assertEqual(q.dequeue(), 2)
         self.assertTrue(q.empty())
         
+        
+class CodebookTest(unittest.TestCase):
+    '''
+    Tests interning alleles as codes
+    '''
+    def setUp(self):
+        self.codebook = Codebook([(0, 0), (3, 4), (6, 8)])
+        
+    def testCodes(self):
+        self.assertEqual(len(self.codebook), 3)
+        self.assertEqual(self.codebook.code((3, 4)), 1)
+        self.assertEqual(self.codebook.allele(2), (6, 8))
+        self.assertEqual(self.codebook.add((3, 4)), 1)
+        self.assertEqual(self.codebook.add((9, 9)), 3)
+        self.assertTrue((9, 9) in self.codebook)
+        self.assertRaises(ValueError, self.codebook.code, (1, 1))
+        
+    def testEncodeDecode(self):
+        self.assertEqual(self.codebook.encode([(6, 8), (0, 0)]), [2, 0])
+        self.assertEqual(self.codebook.decode([2, 0]), ((6, 8), (0, 0)))
+        self.assertRaises(ValueError, self.codebook.encode, [(1, 1)])
+        
+        
+        
+class FitnessIndexTest(unittest.TestCase):
+    '''
+    Tests keeping items ordered by key
+    '''
+    def setUp(self):
+        self.index = FitnessIndex(abs, [3, -7, 1, 5])
+        
+    def testBest(self):
+        self.assertEqual(self.index.best(), [-7])
+        self.assertEqual(self.index.best(3), [-7, 5, 3])
+        self.assertEqual(self.index.best(10), [-7, 5, 3, 1])
+        
+    def testTies(self):
+        self.index.add(-5)
+        self.assertEqual(self.index.best(3), [-7, 5, -5])
+        
+    def testRemove(self):
+        self.index.remove(5)
+        self.assertEqual(self.index.best(2), [-7, 3])
+        self.assertTrue(5 not in self.index)
+        self.assertRaises(ValueError, self.index.remove, 5)
+        
+    def testTruncate(self):
+        self.assertEqual(sorted(self.index.truncate(2)), [1, 3])
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.best(2), [-7, 5])
+        
+    def testDuplicates(self):
+        self.index.add(5)
+        self.assertEqual(self.index.best(3), [-7, 5, 5])
+        self.index.remove(5)
+        self.assertTrue(5 in self.index)
+        self.index.add(5)
+        self.assertEqual(sorted(self.index.truncate(1)), [1, 3, 5, 5])
+        self.assertTrue(5 not in self.index)
+        
+    def testExtend(self):
+        self.index.extend([-3, 6, 0], [3, 6, 0])
+        self.assertEqual(self.index.best(10), [-7, 6, 5, 3, -3, 1, 0])
+        self.index.extend([2])
+        self.assertEqual(self.index.best(10), [-7, 6, 5, 3, -3, 2, 1, 0])
+        
+    def testRetain(self):
+        # items are matched by identity
+        seven = self.index.best()[0]
+        self.assertEqual(sorted(self.index.retain([5, seven, 5, 2])), [1, 3])
+        self.assertEqual(self.index.best(10), [-7, 5, 5, 2])
+        self.assertEqual(sorted(self.index.retain([seven, 2])), [5, 5])
+        self.assertEqual(self.index.best(10), [-7, 2])
+        self.assertTrue(5 not in self.index)
+        self.assertEqual(self.index.truncate(1), [2])
+
+
+
+class HallOfFameTest(unittest.TestCase):
+    '''
+    Tests archiving the best distinct organisms
+    '''
+    def setUp(self):
+        self.organisms = [DigitOrganism(genotype={'digit': DigitChromosome(digit)})
+                          for digit in (4, 9, 2, 7, 9, 5)]
+        self.archive = HallOfFame(challenge.fitness, 3, self.organisms)
+        
+    def testBest(self):
+        self.assertEqual(len(self.archive), 3)
+        self.assertEqual(self.archive.best(), 
+                         [self.organisms[1], self.organisms[3], self.organisms[5]])
+        self.assertEqual(self.archive.best(1), [self.organisms[1]])
+        self.assertEqual(self.archive.worst(), 5)
+        
+    def testDistinct(self):
+        # the second 9 has the same genome as the first
+        self.assertTrue(self.organisms[4] in self.archive)
+        self.assertFalse(self.archive.add(self.organisms[4]))
+        self.assertEqual(len(self.archive), 3)
+        
+    def testAdd(self):
+        better = DigitOrganism(genotype={'digit': DigitChromosome(8)})
+        worse  = DigitOrganism(genotype={'digit': DigitChromosome(5)})
+        self.assertFalse(self.archive.add(worse))
+        self.assertTrue(self.archive.add(better))
+        self.assertEqual(self.archive.best(), 
+                         [self.organisms[1], better, self.organisms[3]])
+        self.assertFalse(self.organisms[5] in self.archive)
+        self.assertEqual(HallOfFame(challenge.fitness, 3).worst(), None)
+            
             
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file